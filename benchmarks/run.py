@@ -0,0 +1,340 @@
+"""Banc d'essai du pipeline et des chemins chauds de l'analyse.
+
+Sur un jeu synthétique (`benchmarks.synthetic`) à l'échelle voulue, mesure :
+- chaque acte de `run_pipeline` (ingestion Parquet, activité, sélection,
+  historiques, statistiques), puis le pipeline complet et sa relance à vide ;
+- `compute_descriptive_stats`, `correlation_matrix`,
+  `MarkowitzModel.optimize` / `efficient_frontier` sur plusieurs tailles ;
+- le backtest vectorisé de `BACKTEST_PORTFOLIOS` portefeuilles aléatoires et
+  la réoptimisation mensuelle glissante (walk-forward) ;
+- la chaîne de callbacks du dashboard pour un changement de sélection
+  (prix, panneaux, solution, frontière, backtest).
+
+Chaque mesure est répétée (`--repeat`) : on garde le minimum et la médiane.
+Les résultats sont ajoutés à `benchmarks/history.jsonl` (une ligne JSON par
+exécution, avec commit git et paramètres ; fichier local, ignoré par git) et
+comparés à la dernière exécution de mêmes paramètres, pour repérer les
+régressions.
+
+Commande : `python -m benchmarks.run --symbols 1000 --years 10`
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+HERE = Path(__file__).parent
+HISTORY_FILE = HERE / "history.jsonl"
+REGRESSION_THRESHOLD = 1.2  # ×1.2 sur la médiane → signalé
+PORTFOLIO_SIZES = (5, 20, 50)
+BACKTEST_PORTFOLIOS = 1000
+BACKTEST_ASSETS = 50
+WALK_FORWARD_WINDOW = 126
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Banc d'essai pipeline + analyse + dashboard.")
+    parser.add_argument("--symbols", type=int, default=1000, help="Tickers synthétiques.")
+    parser.add_argument("--years", type=int, default=10, help="Années d'historique.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=None,
+        help="Racine des données du banc (défaut : dossier temporaire par échelle).",
+    )
+    parser.add_argument("--workers", type=int, default=0, help="Processus (0 = tous les cœurs).")
+    parser.add_argument("--max-symbols", type=int, default=200, help="Tickers sélectionnés.")
+    parser.add_argument("--repeat", type=int, default=3, help="Répétitions par mesure.")
+    parser.add_argument("--label", default="", help="Étiquette libre (branche, machine…).")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE)
+    parser.add_argument("--skip-dashboard", action="store_true", help="Ne pas mesurer le dashboard.")
+    return parser.parse_args()
+
+
+class Timer:
+    """Collecte des durées (ms) par nom de mesure."""
+
+    def __init__(self, repeat: int) -> None:
+        self.repeat = repeat
+        self.samples: Dict[str, List[float]] = {}
+
+    def once(self, name: str, func: Callable, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        print(f"  {name:<40} {self.samples[name][-1]:>10.1f} ms", flush=True)
+        return result
+
+    def measure(self, name: str, func: Callable, *args, setup: Optional[Callable] = None, **kwargs):
+        result = None
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            result = self.once(name, func, *args, **kwargs)
+        return result
+
+    def results(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "min_ms": round(min(values), 3),
+                "median_ms": round(statistics.median(values), 3),
+                "runs": len(values),
+            }
+            for name, values in self.samples.items()
+        }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=HERE.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_pipeline(timer: Timer, pipeline_args: List[str]) -> None:
+    from src import data_loading, raw_store
+    from src.manifest import SummaryCache
+
+    args = data_loading.parse_args(pipeline_args)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    def clear_store() -> None:
+        for path in raw_store.DATA_STORE.rglob("*.parquet"):
+            path.unlink()
+
+    print("Pipeline, acte par acte")
+    timer.measure("pipeline.ingest", raw_store.ingest_raw, workers=workers, setup=clear_store)
+    for _ in range(timer.repeat):
+        frames = data_loading.FrameCache(
+            args.start_date,
+            args.top_per_bucket,
+            args.min_trading_days,
+            max_bytes=args.frame_cache_mb << 20,
+        )
+        try:
+            enriched = timer.once(
+                "pipeline.activity",
+                data_loading.attach_activity_stats,
+                data_loading.load_metadata(),
+                args.end_date,
+                workers=workers,
+                cache=SummaryCache(),
+                frames=frames,
+            )
+            selection = timer.once(
+                "pipeline.selection",
+                data_loading.select_top_tickers,
+                enriched,
+                top_per_bucket=args.top_per_bucket,
+                min_trading_days=args.min_trading_days,
+                max_symbols=args.max_symbols,
+            )
+            matrix, attributes = timer.once(
+                "pipeline.history.build",
+                data_loading.build_price_matrix,
+                selection,
+                args.start_date,
+                args.end_date,
+                frames=frames,
+            )
+        finally:
+            frames.close()
+        tables = timer.once(
+            "pipeline.history.tables", data_loading.price_and_return_tables, matrix, attributes
+        )
+        timer.once(
+            "pipeline.history.export",
+            data_loading.export_prices_and_returns,
+            *tables,
+            matrix=matrix,
+        )
+        timer.once("pipeline.statistics", data_loading.export_statistics)
+
+    print("Pipeline complet")
+    forced = data_loading.parse_args([*pipeline_args, "--force"])
+    timer.measure("pipeline.full_force", data_loading.run_pipeline, forced)
+    # Relance sans changement : tout doit être sauté grâce au manifeste.
+    timer.measure("pipeline.full_unchanged", data_loading.run_pipeline, args)
+
+
+def bench_analysis(timer: Timer) -> None:
+    import numpy as np
+    import pandas as pd
+
+    from src import analysis
+
+    print("Analyse")
+    symbols = analysis.load_returns_wide().columns.tolist()
+    timer.measure(
+        "analysis.stats.cold",
+        analysis.compute_descriptive_stats,
+        setup=analysis.load_stats_index.cache_clear,
+    )
+    timer.measure("analysis.stats.warm", analysis.compute_descriptive_stats, symbols[:20])
+    timer.measure("analysis.correlation.all", analysis.correlation_matrix)
+    for size in PORTFOLIO_SIZES:
+        subset = symbols[:size]
+        if len(subset) < size:
+            break
+        model = timer.measure(f"analysis.model.n{size}", analysis.MarkowitzModel.from_symbols, subset)
+        timer.measure(f"analysis.optimize.n{size}", model.optimize, max_weight=0.35)
+        timer.measure(
+            f"analysis.frontier.n{size}", model.efficient_frontier, num_points=25, max_weight=0.35
+        )
+
+    rng = np.random.default_rng(0)
+    columns = symbols[:BACKTEST_ASSETS]
+    weights = pd.DataFrame(
+        rng.dirichlet(np.ones(len(columns)), BACKTEST_PORTFOLIOS), columns=columns
+    )
+    timer.measure(
+        f"analysis.backtest.p{BACKTEST_PORTFOLIOS}",
+        analysis.backtest_portfolios,
+        weights,
+        rebalance="monthly",
+        transaction_cost=0.001,
+    )
+    timer.measure(
+        "analysis.walk_forward.n20",
+        analysis.walk_forward_backtest,
+        symbols[:20],
+        window=WALK_FORWARD_WINDOW,
+    )
+
+
+def bench_dashboard(timer: Timer) -> None:
+    from src import analysis
+
+    print("Dashboard")
+    app = timer.once("dashboard.import", __import__, "src.dashboard.app", fromlist=["app"])
+    symbols = analysis.load_returns_wide().columns[:5].tolist()
+
+    def callback(func: Callable) -> Callable:
+        return getattr(func, "__wrapped__", func)  # fonction nue, sans contexte Dash
+
+    def selection_change() -> None:
+        selection = callback(app.update_selection)(symbols)
+        app.build_price_figure(selection["symbols"], "normalized", None)
+        callback(app.update_selection_panels)(selection)
+        request = callback(app.update_solution)(
+            selection, "target", app.DEFAULT_TARGET_RETURN, app.DEFAULT_MAX_WEIGHT, 0
+        )
+        if request["error"]:
+            raise RuntimeError(f"Optimisation du dashboard impossible : {request['error']}")
+        callback(app.update_portfolio_panels)(request)
+        callback(app.update_frontier)(request)
+        callback(app.update_backtest)(request)
+
+    # À froid (caches d'optimisation vides), puis servi depuis les caches.
+    timer.measure(
+        "dashboard.selection_change.cold",
+        selection_change,
+        setup=analysis.OPTIMIZATION_CACHE.clear,
+    )
+    timer.measure("dashboard.selection_change.warm", selection_change)
+    timer.measure("dashboard.price_figure", app.build_price_figure, symbols, "normalized", None)
+
+
+def previous_record(history: Path, params: Dict[str, object]) -> Optional[dict]:
+    if not history.exists():
+        return None
+    previous = None
+    for line in history.read_text().splitlines():
+        record = json.loads(line)
+        if record.get("params") == params:
+            previous = record
+    return previous
+
+
+def report(results: Dict[str, Dict[str, float]], previous: Optional[dict]) -> None:
+    before = previous["results"] if previous else {}
+    print(f"\n{'mesure':<40} {'min ms':>10} {'médiane ms':>12} {'Δ médiane':>10}")
+    for name, values in results.items():
+        delta, flag = "", ""
+        if name in before and before[name]["median_ms"] > 0:
+            ratio = values["median_ms"] / before[name]["median_ms"]
+            delta = f"{(ratio - 1) * 100:+.1f}%"
+            flag = "  ← régression" if ratio > REGRESSION_THRESHOLD else ""
+        print(f"{name:<40} {values['min_ms']:>10.1f} {values['median_ms']:>12.1f} {delta:>10}{flag}")
+    if previous:
+        print(f"\n(comparé à {previous['commit']} du {previous['timestamp']})")
+
+
+def main() -> None:
+    args = parse_args()
+    data_dir = args.data_dir or Path(tempfile.gettempdir()) / (
+        f"trabbids-bench-{args.symbols}x{args.years}-s{args.seed}"
+    )
+    # Avant tout import de `src` : les chemins sont figés à l'import de `src.paths`.
+    os.environ["TRABBIDS_DATA"] = str(data_dir)
+    sys.path.insert(0, str(HERE.parent))
+
+    from benchmarks import synthetic
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    timer = Timer(args.repeat)
+    print(f"Données : {data_dir}")
+    timer.once("synthetic.generate", synthetic.generate, data_dir, args.symbols, args.years, args.seed, workers)
+
+    end_year = synthetic.END_DATE.year
+    pipeline_args = [
+        "--start-date",
+        f"{end_year - args.years}-01-01",
+        "--end-date",
+        synthetic.END_DATE.strftime("%Y-%m-%d"),
+        "--workers",
+        str(workers),
+        "--max-symbols",
+        str(args.max_symbols),
+        "--top-per-bucket",
+        str(args.max_symbols),
+    ]
+    bench_pipeline(timer, pipeline_args)
+    bench_analysis(timer)
+    if not args.skip_dashboard:
+        bench_dashboard(timer)
+
+    params = {
+        "symbols": args.symbols,
+        "years": args.years,
+        "seed": args.seed,
+        "max_symbols": args.max_symbols,
+        "workers": workers,
+    }
+    results = timer.results()
+    results.pop("synthetic.generate", None)  # dépend du cache disque, pas du code
+    previous = previous_record(args.history, params)
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "label": args.label,
+        "params": params,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    with args.history.open("a") as handle:
+        handle.write(json.dumps(record) + "\n")
+    report(results, previous)
+
+
+if __name__ == "__main__":
+    main()
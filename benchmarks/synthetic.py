@@ -0,0 +1,151 @@
+"""Jeu de données synthétique au format de `data/raw` (Kaggle), à l'échelle voulue.
+
+Produit dans `<out>/raw/` :
+- `symbols_valid_meta.csv` avec les mêmes colonnes que l'original ;
+- un CSV `Date,Open,High,Low,Close,Adj Close,Volume` par ticker, dans
+  `stocks/` ou `etfs/`.
+
+Les cas qui compliquent le pipeline réel sont reproduits : titres cotés
+tardivement, séances manquantes, `Adj Close`/`Volume` vides, fichiers absents,
+tickers de test ou en difficulté financière.
+
+Commande : `python -m benchmarks.synthetic --symbols 1000 --years 10 --out /tmp/bench-data`
+puis `TRABBIDS_DATA=/tmp/bench-data python -m src.data_loading`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+END_DATE = pd.Timestamp("2020-04-01")
+BUCKETS = [("Q", "Q"), ("Q", "G"), ("Q", "S"), ("N", None), ("A", None), ("P", None), ("Z", None)]
+ETF_SHARE = 0.15
+LATE_LISTING_SHARE = 0.3  # titres introduits en cours de période
+MISSING_FILE_SHARE = 0.01
+SPEC_FILE = "synthetic.json"
+
+
+def symbol_name(index: int) -> str:
+    """Tickers de 4 lettres (AAAA, AAAB, …), comme ceux du NASDAQ."""
+    letters = []
+    for _ in range(4):
+        index, rest = divmod(index, 26)
+        letters.append(chr(ord("A") + rest))
+    return "".join(reversed(letters))
+
+
+def build_metadata(symbols: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    names = [symbol_name(i) for i in range(symbols)]
+    buckets = [BUCKETS[i % len(BUCKETS)] for i in range(symbols)]
+    return pd.DataFrame(
+        {
+            "Nasdaq Traded": "Y",
+            "Symbol": names,
+            "Security Name": [f"{name} Synthetic Corp." for name in names],
+            "Listing Exchange": [exchange for exchange, _ in buckets],
+            "Market Category": [category for _, category in buckets],
+            "ETF": np.where(rng.random(symbols) < ETF_SHARE, "Y", "N"),
+            "Round Lot Size": 100.0,
+            "Test Issue": np.where(rng.random(symbols) < 0.005, "Y", "N"),
+            "Financial Status": np.where(rng.random(symbols) < 0.02, "D", "N"),
+            "CQS Symbol": names,
+            "NASDAQ Symbol": names,
+            "NextShares": "N",
+        }
+    )
+
+
+def price_frame(dates: pd.DatetimeIndex, rng: np.random.Generator) -> pd.DataFrame:
+    n = len(dates)
+    drift = rng.normal(0.0003, 0.0003)
+    volatility = rng.uniform(0.01, 0.04)
+    close = rng.uniform(5, 200) * np.exp(np.cumsum(rng.normal(drift, volatility, n)))
+    spread = np.abs(rng.normal(0, volatility / 2, n))
+    adj_close = close * rng.uniform(0.7, 1.0)
+    volume = np.round(rng.lognormal(rng.uniform(9, 15), 1.0, n))
+    adj_close[rng.random(n) < 0.001] = np.nan
+    volume[rng.random(n) < 0.001] = np.nan
+    return pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close * (1 + rng.normal(0, volatility / 4, n)),
+            "High": close * (1 + spread),
+            "Low": close * (1 - spread),
+            "Close": close,
+            "Adj Close": adj_close,
+            "Volume": volume,
+        }
+    )
+
+
+def write_symbol(task: Tuple[Path, str, int, int, int]) -> None:
+    path, symbol, start_year, years, seed = task
+    rng = np.random.default_rng([seed, int.from_bytes(symbol.encode(), "big")])
+    first_year = start_year
+    if rng.random() < LATE_LISTING_SHARE:
+        first_year = int(rng.integers(start_year, END_DATE.year))
+    dates = pd.bdate_range(pd.Timestamp(first_year, 1, 1), END_DATE)
+    dates = dates[rng.random(len(dates)) > 0.005]  # séances manquantes
+    price_frame(dates, rng).to_csv(path, index=False)
+
+
+def generate(out: Path, symbols: int, years: int, seed: int = 0, workers: int = 1) -> Path:
+    """Écrit le jeu dans `out/raw` (réutilisé tel quel s'il a déjà ces paramètres)."""
+    raw = out / "raw"
+    spec: Dict[str, int] = {"symbols": symbols, "years": years, "seed": seed}
+    spec_path = out / SPEC_FILE
+    if spec_path.exists() and json.loads(spec_path.read_text()) == spec:
+        return raw
+    for folder in ("stocks", "etfs"):
+        (raw / folder).mkdir(parents=True, exist_ok=True)
+
+    meta = build_metadata(symbols, seed)
+    meta.to_csv(raw / "symbols_valid_meta.csv", index=False)
+    rng = np.random.default_rng(seed)
+    start_year = END_DATE.year - years
+    tasks: List[Tuple[Path, str, int, int, int]] = []
+    for symbol, etf in zip(meta["Symbol"], meta["ETF"]):
+        if rng.random() < MISSING_FILE_SHARE:
+            continue
+        folder = "etfs" if etf == "Y" else "stocks"
+        tasks.append((raw / folder / f"{symbol}.csv", symbol, start_year, years, seed))
+
+    if workers <= 1:
+        for task in tasks:
+            write_symbol(task)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(write_symbol, tasks, chunksize=max(1, len(tasks) // (workers * 16))))
+    spec_path.write_text(json.dumps(spec))
+    return raw
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Génère un data/raw synthétique.")
+    parser.add_argument("--out", type=Path, required=True, help="Dossier racine (contiendra raw/).")
+    parser.add_argument("--symbols", type=int, default=1000, help="Nombre de tickers.")
+    parser.add_argument("--years", type=int, default=10, help="Années d'historique.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="Processus (0 = tous les cœurs).")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    raw = generate(args.out, args.symbols, args.years, args.seed, workers)
+    print(f"Jeu synthétique prêt : {raw}")
+
+
+if __name__ == "__main__":
+    main()
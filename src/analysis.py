@@ -10,27 +10,79 @@ Chaque fonction est volontairement “friendly” : on explicite ce qui est calc
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from functools import lru_cache
-from typing import Iterable, List, Sequence
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Sequence, Tuple
 
-import cvxpy as cp
 import numpy as np
 import pandas as pd
 
+from . import (
+    backtest,
+    frontier,
+    matrix_store,
+    metrics,
+    pairwise,
+    risk_model,
+    rolling,
+    walk_forward,
+)
 from .paths import DATA_PROCESSED
 
+if TYPE_CHECKING:  # cvxpy (≈ 1 s d'import) n'est chargé qu'au premier recours au solveur
+    import cvxpy as cp
+
+PRICE_FIELDS = ("Adj Close", "Normalized", "Volume")
+# Colonnes descriptives des prix, lues dans la sélection plutôt que répétées par ligne.
+PRICE_ATTRIBUTES = {
+    "SecurityName": "Security Name",
+    "MarketCategory": "Market Category",
+    "ListingExchange": "Listing Exchange",
+}
+OPTIMIZATION_CACHE_ENTRIES = 256
+# Au-delà, covariance facteurs + diagonale (src.risk_model) au lieu de l'empirique.
+SAMPLE_COVARIANCE_MAX = 50
+OPTIMIZATION_CACHE_MB = 64
+DEFAULT_SOLVER = "CLARABEL"  # nom cvxpy du solveur de secours
+COVARIANCE_RIDGE = 1e-8  # ajouté à la diagonale de la covariance empirique
+TARGET_TOLERANCE = 1e-12  # marge (rendement journalier) au-delà du maximum atteignable
+# Fichiers qui signent la version des données (le manifeste est réécrit à
+# chaque étape du pipeline terminée)
+DATA_VERSION_FILES = ("manifest.json", "returns_wide.parquet")
+
+
 @lru_cache(maxsize=None)
 def load_prices() -> pd.DataFrame:
     """Chargement paresseux des prix normalisés.
 
     Les caches évitent de relire plusieurs centaines de Mo à chaque Callback Dash.
+    Format compact : `Symbol` catégoriel, prix en float32, sans les colonnes
+    descriptives (voir `with_symbol_attributes`).
     """
     df = pd.read_parquet(DATA_PROCESSED / "prices.parquet")
     df["Date"] = pd.to_datetime(df["Date"])
+    df = df.drop(columns=[c for c in PRICE_ATTRIBUTES if c in df.columns])  # ancien format
+    df["Symbol"] = df["Symbol"].astype("category")
     return df.sort_values(["Symbol", "Date"]).reset_index(drop=True)
 
 
+def with_symbol_attributes(prices: pd.DataFrame) -> pd.DataFrame:
+    """Ajoute nom, catégorie de marché et place de cotation de chaque ligne.
+
+    Jointure sur la sélection, une valeur par ticker : sur un `Symbol`
+    catégoriel, les colonnes ajoutées restent catégorielles.
+    """
+    selection = load_selection().drop_duplicates("Symbol").set_index("Symbol")
+    out = prices.copy()
+    for column, source in PRICE_ATTRIBUTES.items():
+        out[column] = out["Symbol"].map(selection[source])
+    return out
+
+
 @lru_cache(maxsize=None)
 def load_returns_long() -> pd.DataFrame:
     df = pd.read_parquet(DATA_PROCESSED / "returns_long.parquet")
@@ -40,35 +92,95 @@ def load_returns_long() -> pd.DataFrame:
 
 @lru_cache(maxsize=None)
 def load_returns_wide() -> pd.DataFrame:
+    """Rendements (Date × Symbol).
+
+    Si le pipeline a exporté `returns_wide.npy`, on s'y attache par mmap : pas
+    de copie, et les workers partagent les mêmes pages mémoire.
+    """
+    df = matrix_store.attach_matrix(matrix_store.RETURNS_MATRIX)
+    if df is not None:
+        return df
     df = pd.read_parquet(DATA_PROCESSED / "returns_wide.parquet")
     df.index = pd.to_datetime(df.index)
     return df.sort_index()
 
 
+@lru_cache(maxsize=None)
+def load_price_matrix(field: str = "Adj Close") -> pd.DataFrame:
+    """Une colonne de `prices` en large (Date × Symbol), mappée sans copie si possible."""
+    df = matrix_store.attach_matrix(matrix_store.PRICE_MATRICES[field])
+    if df is not None:
+        return df
+    wide = load_prices().pivot(index="Date", columns="Symbol", values=field)
+    wide.columns = pd.Index(wide.columns.astype(str), name="Symbol")
+    return wide.astype(np.float64)
+
+
 @lru_cache(maxsize=None)
 def load_selection() -> pd.DataFrame:
     return pd.read_csv(DATA_PROCESSED / "selected_tickers.csv")
 
 
-def compute_descriptive_stats(symbols: Iterable[str] | None = None) -> pd.DataFrame:
-    """Assemble les KPIs nécessaires aux tableaux/graphes du dashboard."""
-    returns = load_returns_wide()
-    if symbols:
-        returns = returns[list(symbols)]
+def price_history(symbols: Sequence[str]) -> pd.DataFrame:
+    """Table longue des prix des seuls `symbols` (pour les graphes).
+
+    Construite à partir des matrices mappées : on ne lit que les colonnes des
+    tickers demandés, jamais la table `prices` complète. Les tickers inconnus
+    sont ignorés.
+    """
+    adj_close = load_price_matrix("Adj Close")
+    symbols = [symbol for symbol in symbols if symbol in adj_close.columns]
+    adj_close = adj_close[symbols]
+    valid = adj_close.notna().to_numpy().T
+    symbol_idx, date_idx = np.nonzero(valid)
+    data = {
+        "Date": adj_close.index.to_numpy()[date_idx],
+        "Symbol": np.array(symbols, dtype=object)[symbol_idx],
+    }
+    for price_field in PRICE_FIELDS:
+        data[price_field] = load_price_matrix(price_field)[symbols].to_numpy().T[valid]
+    names = load_selection().set_index("Symbol")["Security Name"]
+    data["SecurityName"] = names.reindex(symbols).to_numpy()[symbol_idx]
+    return pd.DataFrame(data)
 
+
+def _price_aggregates(symbols: List[str]) -> pd.DataFrame:
+    """Séances, bornes, premier/dernier prix et volumes, colonne par colonne."""
+    adj_close = load_price_matrix("Adj Close")[symbols]
+    volume = load_price_matrix("Volume")[symbols]
+    valid = adj_close.notna().to_numpy()
+    cols = np.arange(len(symbols))
+    first_row = valid.argmax(axis=0)
+    last_row = len(valid) - 1 - valid[::-1].argmax(axis=0)
+    values = adj_close.to_numpy()
+    dates = adj_close.index
+    return pd.DataFrame(
+        {
+            "trading_days": valid.sum(axis=0),
+            "first_price": values[first_row, cols],
+            "last_price": values[last_row, cols],
+            "avg_volume": volume.where(valid).mean().to_numpy(),
+            "total_volume": volume.where(valid).sum().to_numpy(),
+            "first_date": dates[first_row],
+            "last_date": dates[last_row],
+        },
+        index=pd.Index(symbols),
+    )
+
+
+def _assemble_stats(
+    mean_daily: pd.Series, vol_daily: pd.Series, prices: pd.DataFrame
+) -> pd.DataFrame:
+    """Table KPI indexée par ticker (avant tri), jointe à la sélection."""
     selection = load_selection().set_index("Symbol")
-    prices = load_prices()
-    group_prices = prices.groupby("Symbol")
-
-    mean_daily = returns.mean()
-    vol_daily = returns.std()
-    trading_days = group_prices.size()
-    first_price = group_prices["Adj Close"].first()
-    last_price = group_prices["Adj Close"].last()
-    avg_volume = group_prices["Volume"].mean()
-    total_volume = group_prices["Volume"].sum()
-    first_date = group_prices["Date"].first()
-    last_date = group_prices["Date"].last()
+
+    trading_days = prices["trading_days"]
+    first_price = prices["first_price"]
+    last_price = prices["last_price"]
+    avg_volume = prices["avg_volume"]
+    total_volume = prices["total_volume"]
+    first_date = prices["first_date"]
+    last_date = prices["last_date"]
 
     stats = pd.DataFrame(
         {
@@ -86,22 +198,248 @@ def compute_descriptive_stats(symbols: Iterable[str] | None = None) -> pd.DataFr
     stats["start_date"] = first_date.dt.date
     stats["end_date"] = last_date.dt.date
 
-    stats = stats.join(selection, how="left")
+    return stats.join(selection, how="left")
+
+
+def _sorted_stats(stats: pd.DataFrame) -> pd.DataFrame:
     stats = stats.reset_index().rename(columns={"index": "Symbol"})
-    stats = stats.sort_values("return_risk_ratio", ascending=False)
-    return stats
+    return stats.sort_values("return_risk_ratio", ascending=False)
+
+
+class SymbolStatsIndex:
+    """KPIs par ticker calculés une fois, servis par simple recherche.
+
+    - `full` : table KPI de toute la période, indexée par ticker (sélection
+      déjà jointe) ; une requête sur k tickers coûte O(k).
+    - `window` : KPIs sur une fenêtre de dates quelconque à partir de sommes
+      cumulées par ticker (rendements, carrés, séances, volumes) : deux lignes
+      lues par ticker, quelle que soit la longueur de la fenêtre.
+
+    Les sommes cumulées ne sont construites qu'à la première requête fenêtrée.
+    """
+
+    def __init__(self, returns: pd.DataFrame, adj_close: pd.DataFrame, volume: pd.DataFrame):
+        self.returns = returns
+        self.adj_close = adj_close
+        self.volume = volume
+        symbols = list(returns.columns)
+        self.full = _assemble_stats(
+            returns.mean(), returns.std(), _price_aggregates(symbols)
+        )
+        self._cumulative: dict | None = None
+
+    def lookup(self, symbols: Iterable[str] | None = None) -> pd.DataFrame:
+        stats = self.full if not symbols else self.full.loc[list(symbols)]
+        return _sorted_stats(stats)
+
+    @staticmethod
+    def _cumsum(values: np.ndarray) -> np.ndarray:
+        """Sommes cumulées avec une ligne de zéros en tête (fenêtre = différence)."""
+        out = np.zeros((values.shape[0] + 1, values.shape[1]))
+        np.cumsum(values, axis=0, out=out[1:])
+        return out
+
+    def _prepare(self) -> dict:
+        if self._cumulative is None:
+            returns = self.returns.to_numpy()
+            has_return = ~np.isnan(returns)
+            filled = np.where(has_return, returns, 0.0)
+            prices = self.adj_close[self.returns.columns].to_numpy()
+            valid = ~np.isnan(prices)
+            volume = np.where(valid, self.volume[self.returns.columns].to_numpy(), 0.0)
+            n_dates = len(prices)
+            rows = np.arange(n_dates)[:, None]
+            # Prochaine (resp. dernière) séance cotée à partir de chaque ligne.
+            next_valid = np.where(valid, rows, n_dates)
+            next_valid = np.minimum.accumulate(next_valid[::-1], axis=0)[::-1]
+            prev_valid = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+            self._cumulative = {
+                "count": self._cumsum(has_return.astype(float)),
+                "sum": self._cumsum(filled),
+                "sum_sq": self._cumsum(filled * filled),
+                "days": self._cumsum(valid.astype(float)),
+                "volume": self._cumsum(volume),
+                "next_valid": np.vstack([next_valid, np.full((1, prices.shape[1]), n_dates)]),
+                "prev_valid": prev_valid,
+            }
+        return self._cumulative
+
+    def window(
+        self,
+        symbols: Iterable[str] | None = None,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """KPIs de `symbols` restreints à `[start, end]` (bornes incluses)."""
+        cum = self._prepare()
+        columns = self.returns.columns
+        symbols = list(symbols) if symbols else list(columns)
+        cols = columns.get_indexer(symbols)
+        if (cols < 0).any():
+            raise KeyError(f"Tickers inconnus: {[s for s, c in zip(symbols, cols) if c < 0]}")
+
+        def bounds(index: pd.DatetimeIndex) -> tuple:
+            a = 0 if start is None else index.searchsorted(start, side="left")
+            b = len(index) if end is None else index.searchsorted(end, side="right")
+            return a, max(a, b)
+
+        a, b = bounds(self.returns.index)
+        n = cum["count"][b, cols] - cum["count"][a, cols]
+        total = cum["sum"][b, cols] - cum["sum"][a, cols]
+        total_sq = cum["sum_sq"][b, cols] - cum["sum_sq"][a, cols]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_daily = np.where(n > 0, total / n, np.nan)
+            variance = np.where(n > 1, (total_sq - total * mean_daily) / (n - 1), np.nan)
+        vol_daily = np.sqrt(np.clip(variance, 0, None))
+
+        dates = self.adj_close.index
+        a, b = bounds(dates)
+        days = cum["days"][b, cols] - cum["days"][a, cols]
+        volume = cum["volume"][b, cols] - cum["volume"][a, cols]
+        first_row = cum["next_valid"][a, cols]
+        last_row = cum["prev_valid"][b - 1, cols] if b > 0 else np.full(len(cols), -1)
+        present = (days > 0) & (first_row < b) & (last_row >= a)
+        first_row = np.where(present, first_row, 0)
+        last_row = np.where(present, last_row, 0)
+        prices = self.adj_close[columns].to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            aggregates = pd.DataFrame(
+                {
+                    "trading_days": days.astype(int),
+                    "first_price": np.where(present, prices[first_row, cols], np.nan),
+                    "last_price": np.where(present, prices[last_row, cols], np.nan),
+                    "avg_volume": np.where(present, volume / days, np.nan),
+                    "total_volume": volume,
+                    "first_date": dates[first_row].where(present),
+                    "last_date": dates[last_row].where(present),
+                },
+                index=pd.Index(symbols, name=columns.name),
+            )
+        stats = _assemble_stats(
+            pd.Series(mean_daily, index=aggregates.index),
+            pd.Series(vol_daily, index=aggregates.index),
+            aggregates,
+        )
+        return _sorted_stats(stats)
+
+
+@lru_cache(maxsize=None)
+def load_stats_index() -> SymbolStatsIndex:
+    return SymbolStatsIndex(
+        load_returns_wide(),
+        load_price_matrix("Adj Close"),
+        load_price_matrix("Volume"),
+    )
+
+
+def compute_descriptive_stats(symbols: Iterable[str] | None = None) -> pd.DataFrame:
+    """Assemble les KPIs nécessaires aux tableaux/graphes du dashboard.
+
+    Simple lecture dans l'index précalculé (`load_stats_index`).
+    """
+    return load_stats_index().lookup(symbols)
+
+
+def window_descriptive_stats(
+    symbols: Iterable[str] | None = None,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Mêmes KPIs que `compute_descriptive_stats`, limités à `[start, end]`."""
+    return load_stats_index().window(symbols, start, end)
+
+
+@lru_cache(maxsize=None)
+def load_pairwise_moments() -> pairwise.PairwiseMoments | None:
+    """Moments deux à deux de l'univers exportés par le pipeline (mappés), si présents."""
+    return pairwise.PairwiseMoments.load()
+
+
+def _pairwise_block(symbols: Sequence[str] | None) -> pairwise.PairwiseMoments | None:
+    """Sous-bloc des moments précalculés, ou None s'ils manquent ou ignorent un ticker."""
+    moments = load_pairwise_moments()
+    if moments is None:
+        return None
+    symbols = list(symbols) if symbols else list(load_returns_wide().columns)
+    if not moments.covers(symbols):
+        return None
+    return moments.block(symbols)
 
 
 def correlation_matrix(symbols: Sequence[str] | None = None) -> pd.DataFrame:
+    """Corrélations sur les séances communes à chaque couple (comme `DataFrame.corr`).
+
+    Servies par découpe des moments précalculés quand ils existent.
+    """
+    block = _pairwise_block(symbols)
+    if block is not None:
+        corr = block.correlation()
+    else:
+        returns = load_returns_wide()
+        if symbols:
+            returns = returns[list(symbols)]
+        corr = returns.corr()
+    if not corr.empty:
+        np.fill_diagonal(corr.values, 1.0)
+    return corr
+
+
+def covariance_matrix(symbols: Sequence[str] | None = None) -> pd.DataFrame:
+    """Covariances journalières sur les séances communes à chaque couple (comme `DataFrame.cov`)."""
+    block = _pairwise_block(symbols)
+    if block is not None:
+        return block.covariance()
     returns = load_returns_wide()
     if symbols:
         returns = returns[list(symbols)]
-    corr = returns.corr()
+    return returns.cov()
+
+
+@lru_cache(maxsize=16)
+def rolling_statistics(
+    window: int = 60, benchmark: str | None = None
+) -> Dict[str, pd.DataFrame]:
+    """Volatilité, μ/σ, drawdown (et bêta si `benchmark`) glissants, tout l'univers.
+
+    Dict `métrique -> DataFrame (Date × Symbol)`, calculé une fois par couple
+    (fenêtre, benchmark) sur la matrice des rendements ; voir `src.rolling`.
+    """
+    return rolling.rolling_metrics(load_returns_wide(), window, benchmark=benchmark)
+
+
+def rolling_correlation(
+    symbols: Sequence[str] | None = None,
+    window: int = 60,
+    end: pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Corrélations des `window` séances se terminant à `end` (la dernière par défaut)."""
+    returns = load_returns_wide()
+    if symbols:
+        returns = returns[list(symbols)]
+    corr = rolling.window_correlation(returns, window, end=end)
     if not corr.empty:
         np.fill_diagonal(corr.values, 1.0)
     return corr
 
 
+def backtest_portfolios(
+    weights: pd.DataFrame | Dict[str, pd.Series],
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    rebalance: str | None = "monthly",
+    transaction_cost: float = 0.0,
+) -> backtest.BacktestResult:
+    """Backtest de plusieurs portefeuilles d'un coup sur `[start, end]`.
+
+    `weights` : une ligne par portefeuille (ou un dict nom -> poids par
+    ticker) ; rééquilibrage "daily"/"monthly"/"quarterly"/"yearly" ou None, frais
+    proportionnels à la rotation. Voir `src.backtest`.
+    """
+    return backtest.backtest_frame(
+        load_returns_wide(), weights, start, end, rebalance, transaction_cost
+    )
+
+
 def prepare_returns(symbols: Sequence[str]) -> pd.DataFrame:
     returns = load_returns_wide()
     missing = [s for s in symbols if s not in returns.columns]
@@ -141,52 +479,236 @@ class MarkowitzModel:
     returns: pd.DataFrame
     mean_daily: np.ndarray
     cov_matrix: np.ndarray
+    # Forme facteurs + diagonale de `cov_matrix`, si le modèle en a une.
+    risk: risk_model.FactorCovariance | None = None
 
     @classmethod
-    def from_symbols(cls, symbols: Sequence[str]) -> "MarkowitzModel":
+    def from_symbols(
+        cls,
+        symbols: Sequence[str],
+        covariance: str = "auto",
+        factors: int = risk_model.DEFAULT_FACTORS,
+    ) -> "MarkowitzModel":
+        """Modèle sur les séances où tous les `symbols` sont cotés.
+
+        En covariance empirique, moyenne et covariance sont découpées dans les
+        moments précalculés (`load_pairwise_moments`) quand ils décrivent
+        exactement ces séances ; sinon elles sont recalculées.
+        """
         subset = prepare_returns(symbols)
+        if covariance == "auto":
+            covariance = "sample" if len(subset.columns) <= SAMPLE_COVARIANCE_MAX else "factor"
+        if covariance == "sample":
+            block = _pairwise_block(list(subset.columns))
+            listwise = block.listwise() if block is not None else None
+            if listwise is not None and listwise[0] == len(subset):
+                _, mean_daily, cov = listwise
+                return cls.from_moments(subset, mean_daily, cov)
+        return cls.from_returns(subset, covariance, factors)
+
+    @classmethod
+    def from_returns(
+        cls,
+        subset: pd.DataFrame,
+        covariance: str = "auto",
+        factors: int = risk_model.DEFAULT_FACTORS,
+    ) -> "MarkowitzModel":
+        """Modèle sur des rendements sans trou ; `covariance` : "sample", "factor" ou "auto".
+
+        "auto" garde la covariance empirique jusqu'à `SAMPLE_COVARIANCE_MAX`
+        titres, puis passe au modèle à facteurs rétréci (Ledoit-Wolf).
+        """
+        symbols = list(subset.columns)
         mean_daily = subset.mean().values
-        cov = subset.cov().values + np.eye(len(symbols)) * 1e-8
-        return cls(list(symbols), subset, mean_daily, cov)
+        if covariance == "auto":
+            covariance = "sample" if len(symbols) <= SAMPLE_COVARIANCE_MAX else "factor"
+        if covariance == "sample":
+            return cls.from_moments(subset, mean_daily, subset.cov().values)
+        if covariance == "factor":
+            risk = risk_model.factor_covariance(subset, factors=factors)
+            return cls(symbols, subset, mean_daily, risk.dense(), risk)
+        raise ValueError(f"Covariance inconnue: {covariance}")
+
+    @classmethod
+    def from_moments(
+        cls, subset: pd.DataFrame, mean_daily: np.ndarray, cov: np.ndarray
+    ) -> "MarkowitzModel":
+        """Modèle à covariance empirique déjà calculée (par exemple en glissant)."""
+        cov = cov + np.eye(len(cov)) * COVARIANCE_RIDGE
+        return cls(list(subset.columns), subset, np.asarray(mean_daily), cov)
+
+    # Problèmes cvxpy paramétrés (cible, plafond), construits une fois par forme.
+    _problems: Dict[tuple, tuple] = field(default_factory=dict, init=False, repr=False)
+    # Dernier ensemble actif par jeu de bornes : point de départ du solveur exact.
+    _active: Dict[tuple, np.ndarray] = field(default_factory=dict, init=False, repr=False)
+    # Index des poids, construit une fois (une `PortfolioSolution` par point de frontière).
+    _index: pd.Index | None = field(default=None, init=False, repr=False)
+    # Les paramètres cvxpy sont partagés : une résolution à la fois par modèle.
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def warm_start(self, other: "MarkowitzModel") -> None:
+        """Repart des ensembles actifs d'un modèle voisin (mêmes titres, autre fenêtre)."""
+        if other.symbols == self.symbols:
+            self._active.update(other._active)
+
+    def _bounds(
+        self, allow_short: bool, max_weight: float | None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(self.symbols)
+        weight_cap = max_weight if (max_weight is not None and n > 1) else None
+        if weight_cap is not None and n * weight_cap < 1:
+            raise ValueError(
+                f"Plafond de {weight_cap:.0%} par titre trop bas pour {n} tickers "
+                f"(au moins {1 / n:.0%} pour investir 100 %)."
+            )
+        lower = np.full(n, -np.inf if allow_short else 0.0)
+        upper = np.full(n, np.inf if weight_cap is None else weight_cap)
+        return lower, upper
+
+    def _problem(
+        self, allow_short: bool, capped: bool, targeted: bool
+    ) -> Tuple[cp.Problem, cp.Variable, cp.Parameter, cp.Parameter]:
+        """Problème cvxpy à cible et plafond paramétrés (canonicalisé une seule fois)."""
+        key = (allow_short, capped, targeted)
+        if key not in self._problems:
+            import cvxpy as cp
+
+            w = cp.Variable(len(self.symbols))
+            target = cp.Parameter()
+            cap = cp.Parameter(nonneg=True)
+            constraints = [cp.sum(w) == 1]
+            if not allow_short:
+                constraints.append(w >= 0)
+            if capped:
+                constraints.append(w <= cap)
+            if targeted:
+                constraints.append(self.mean_daily @ w >= target)
+            if self.risk is None:
+                risk = cp.quad_form(w, self.cov_matrix)
+            else:
+                # ‖Bᵀw‖² + ‖√d ∘ w‖² : k + N carrés au lieu d'une forme dense N × N.
+                risk = cp.sum_squares(self.risk.exposures.T @ w) + cp.sum_squares(
+                    cp.multiply(np.sqrt(self.risk.specific), w)
+                )
+            objective = cp.Minimize(risk)
+            self._problems[key] = (cp.Problem(objective, constraints), w, target, cap)
+        return self._problems[key]
+
+    def _solve_cvxpy(
+        self,
+        target_daily: float | None,
+        allow_short: bool,
+        upper: np.ndarray,
+        solver,
+    ) -> np.ndarray:
+        capped = bool(np.isfinite(upper).all())
+        with self._lock:
+            prob, w, target, cap = self._problem(allow_short, capped, target_daily is not None)
+            if capped:
+                cap.value = float(upper[0])
+            if target_daily is not None:
+                target.value = target_daily
+            prob.solve(solver=solver, warm_start=True, verbose=False)
+            if prob.solver_stats is not None and prob.solver_stats.num_iters is not None:
+                metrics.SOLVER_ITERATIONS.observe(prob.solver_stats.num_iters, solver="cvxpy")
+            if w.value is None:
+                raise RuntimeError(f"Optimisation échouée ({prob.status}).")
+            return np.array(w.value).reshape(-1)
+
+    def _solve_exact(
+        self, target_daily: float | None, lower: np.ndarray, upper: np.ndarray
+    ) -> np.ndarray | None:
+        """Solveur exact par ensembles actifs (`src.frontier`), repris du point précédent.
+
+        Une cible au-delà du rendement maximal atteignable sous les bornes est
+        rejetée ici (RuntimeError) plutôt que confiée à cvxpy ; une cible égale
+        à ce maximum donne directement le portefeuille glouton.
+        """
+        if target_daily is not None:
+            best = frontier.max_return(self.mean_daily, lower, upper)
+            if not target_daily <= best + TARGET_TOLERANCE:
+                raise RuntimeError(
+                    f"Rendement cible inatteignable sous ces bornes "
+                    f"(maximum {(1 + best) ** 252 - 1:.2%} annualisé)."
+                )
+            if target_daily >= best - TARGET_TOLERANCE:
+                # Cible au maximum : le portefeuille glouton est le seul admissible
+                # (système KKT dégénéré pour les ensembles actifs).
+                return frontier.max_return_weights(self.mean_daily, lower, upper)
+        key = (lower[0], upper[0])
+        factor = None if self.risk is None else (self.risk.exposures, self.risk.specific)
+        ones = np.ones((1, len(self.symbols)))
+        result = frontier.solve_box_qp(
+            self.cov_matrix,
+            ones,
+            np.ones(1),
+            lower,
+            upper,
+            self._active.get((key, None)),
+            factor=factor,
+        )
+        if result is None:
+            return None
+        weights, state = result
+        self._active[(key, None)] = state
+        if target_daily is None or self.mean_daily @ weights >= target_daily:
+            return weights  # contrainte de rendement inactive : variance minimale
+
+        A = np.vstack([ones, self.mean_daily])
+        b = np.array([1.0, target_daily])
+        # Départ : point de frontière précédent, sinon la variance minimale (un
+        # point précédent lointain, d'un autre balayage, peut faire cycler).
+        starts = [self._active.get((key, "target")), state]
+        for start in starts if starts[0] is not None else starts[1:]:
+            result = frontier.solve_box_qp(
+                self.cov_matrix, A, b, lower, upper, start, factor=factor
+            )
+            if result is not None:
+                break
+        if result is None:
+            return None
+        weights, state = result
+        self._active[(key, "target")] = state
+        return weights
 
     def optimize(
         self,
         target_annual_return: float | None = None,
         allow_short: bool = False,
         max_weight: float | None = 0.35,
-        solver=cp.CLARABEL,
+        solver: str = DEFAULT_SOLVER,
     ) -> PortfolioSolution:
-        n = len(self.symbols)
-        w = cp.Variable(n)
-        constraints = [cp.sum(w) == 1]
-        if not allow_short:
-            constraints.append(w >= 0)
-
-        weight_cap = max_weight if (max_weight is not None and n > 1) else None
-        if weight_cap is not None:
-            constraints.append(w <= weight_cap)
+        """Portefeuille de variance minimale (sous rendement cible éventuel).
 
+        Le solveur exact est essayé d'abord ; `solver` (via cvxpy) sert de
+        secours quand il ne conclut pas, par exemple pour une cible infaisable.
+        """
+        lower, upper = self._bounds(allow_short, max_weight)
+        target_daily = None
         if target_annual_return is not None:
             target_daily = (1 + target_annual_return) ** (1 / 252) - 1
-            constraints.append(self.mean_daily @ w >= target_daily)
-
-        objective = cp.Minimize(cp.quad_form(w, self.cov_matrix))
-        prob = cp.Problem(objective, constraints)
-        prob.solve(solver=solver, verbose=False)
 
-        if w.value is None:
-            raise RuntimeError(f"Optimisation échouée ({prob.status}).")
+        weights = self._solve_exact(target_daily, lower, upper)
+        if weights is None:
+            metrics.SOLVER_FALLBACKS.inc()
+            weights = self._solve_cvxpy(target_daily, allow_short, upper, solver)
 
-        weights = np.array(w.value).reshape(-1)
         weights = np.clip(weights, 0, None) if not allow_short else weights
         weights = weights / weights.sum()
         return self._build_solution(weights)
 
+    def max_target_return(
+        self, allow_short: bool = False, max_weight: float | None = 0.35
+    ) -> float:
+        """Plus haut `target_annual_return` atteignable sous ces bornes (+inf sans borne)."""
+        lower, upper = self._bounds(allow_short, max_weight)
+        return float((1 + frontier.max_return(self.mean_daily, lower, upper)) ** 252 - 1)
+
     def minimum_variance(
         self,
         allow_short: bool = False,
         max_weight: float | None = 0.35,
-        solver=cp.CLARABEL,
+        solver: str = DEFAULT_SOLVER,
     ) -> PortfolioSolution:
         return self.optimize(
             target_annual_return=None,
@@ -200,14 +722,24 @@ class MarkowitzModel:
         num_points: int = 25,
         allow_short: bool = False,
         max_weight: float | None = 0.35,
-        solver=cp.CLARABEL,
+        solver: str = DEFAULT_SOLVER,
     ) -> List[PortfolioSolution]:
-        """Prépare les points de la courbe bleue (frontière) affichée dans Dash."""
+        """Prépare les points de la courbe bleue (frontière) affichée dans Dash.
+
+        Les cibles sont parcourues dans l'ordre croissant : chaque point repart
+        de l'ensemble actif du précédent, quelques centaines de points restent
+        donc bon marché. Elles s'arrêtent au rendement maximal atteignable sous
+        le plafond (`max_target_return`) : aucune cible infaisable.
+        """
         annual_returns = self.mean_daily * 252
         low = float(np.percentile(annual_returns, 10))
         high = float(np.percentile(annual_returns, 90))
         if np.isclose(low, high):
             high = low + 0.05
+        ceiling = self.max_target_return(allow_short, max_weight)
+        if high > ceiling:
+            high = ceiling
+            low = min(low, high)
 
         targets = np.linspace(low, high, num_points)
         solutions: List[PortfolioSolution] = []
@@ -232,7 +764,9 @@ class MarkowitzModel:
         ratio = (
             expected_return_annual / volatility_annual if volatility_annual > 0 else np.nan
         )
-        weights_series = pd.Series(weights, index=self.symbols)
+        if self._index is None:
+            self._index = pd.Index(self.symbols)
+        weights_series = pd.Series(weights, index=self._index, copy=False)
         return PortfolioSolution(
             symbols=self.symbols,
             weights=weights_series,
@@ -244,6 +778,189 @@ class MarkowitzModel:
         )
 
 
+def clear_caches() -> None:
+    """Oublie les données chargées et les optimisations calculées dessus."""
+    for loader in (
+        load_selection,
+        load_prices,
+        load_returns_long,
+        load_returns_wide,
+        load_price_matrix,
+        load_stats_index,
+        rolling_statistics,
+        load_pairwise_moments,
+    ):
+        loader.cache_clear()
+    OPTIMIZATION_CACHE.clear()
+
+
+_loaded_version: str | None = None
+_version_lock = threading.Lock()
+
+
+def data_version() -> str:
+    """Identifiant des données sur disque (mtime + taille), relu à chaque appel.
+
+    Quand il change (pipeline relancé sous un dashboard en marche), les
+    caches de chargement et d'optimisation sont vidés : les données sont
+    relues au prochain besoin, et les clés du cache d'optimisation changent.
+    """
+    global _loaded_version
+    parts = []
+    for name in DATA_VERSION_FILES:
+        try:
+            st = (DATA_PROCESSED / name).stat()
+        except FileNotFoundError:
+            parts.append("-")
+            continue
+        parts.append(f"{st.st_mtime_ns}-{st.st_size}")
+    version = "/".join(parts)
+    with _version_lock:
+        if version != _loaded_version:
+            if _loaded_version is not None:
+                clear_caches()
+            _loaded_version = version
+    return version
+
+
+def _approx_bytes(value: object) -> int:
+    """Taille mémoire approximative d'un résultat mis en cache."""
+    if isinstance(value, MarkowitzModel):
+        return int(
+            value.returns.memory_usage(deep=True).sum()
+            + value.cov_matrix.nbytes
+            + value.mean_daily.nbytes
+        )
+    if isinstance(value, PortfolioSolution):
+        return int(value.weights.memory_usage(deep=True)) + 512
+    if isinstance(value, list):
+        return sum(_approx_bytes(item) for item in value) + 64
+    return 512
+
+
+class OptimizationCache:
+    """Cache LRU borné (en entrées et en octets), partagé entre threads.
+
+    Le calcul d'une entrée manquante se fait hors verrou : deux requêtes
+    simultanées sur la même clé peuvent calculer deux fois, mais aucune
+    n'attend l'optimisation d'une autre.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[tuple, Tuple[object, int]] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], object]) -> object:
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+        value = compute()
+        nbytes = _approx_bytes(value)
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            if nbytes <= self.max_bytes:
+                self.entries[key] = (value, nbytes)
+                self.size += nbytes
+            while self.entries and (
+                len(self.entries) > self.max_entries or self.size > self.max_bytes
+            ):
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.size,
+            }
+
+
+OPTIMIZATION_CACHE = OptimizationCache(
+    OPTIMIZATION_CACHE_ENTRIES, OPTIMIZATION_CACHE_MB << 20
+)
+
+
+def _canonical(symbols: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(sorted(set(symbols)))
+
+
+def _in_order(solution: PortfolioSolution, symbols: Sequence[str]) -> PortfolioSolution:
+    """Même solution, poids présentés dans l'ordre demandé par l'appelant."""
+    return replace(solution, symbols=list(symbols), weights=solution.weights.reindex(symbols))
+
+
+def cached_model(symbols: Sequence[str]) -> MarkowitzModel:
+    key = ("model", _canonical(symbols), data_version())
+    return OPTIMIZATION_CACHE.get_or_compute(
+        key, lambda: MarkowitzModel.from_symbols(list(key[1]))
+    )
+
+
+def cached_solution(
+    symbols: Sequence[str],
+    mode: str = "min",
+    target_return: float | None = None,
+    max_weight: float | None = 0.35,
+) -> PortfolioSolution:
+    """`minimum_variance` (mode "min") ou `optimize` sous cible, mis en cache.
+
+    Clé : (tickers triés, mode, cible, plafond, version des données) ; la cible
+    est ignorée en mode "min".
+    """
+    target = None if mode == "min" else target_return
+    key = ("solution", _canonical(symbols), mode, target, max_weight, data_version())
+
+    def compute() -> PortfolioSolution:
+        model = cached_model(symbols)
+        if target is None:
+            return model.minimum_variance(max_weight=max_weight)
+        return model.optimize(target_annual_return=target, max_weight=max_weight)
+
+    return _in_order(OPTIMIZATION_CACHE.get_or_compute(key, compute), symbols)
+
+
+def cached_frontier(
+    symbols: Sequence[str],
+    max_weight: float | None = 0.35,
+    num_points: int = 25,
+) -> List[PortfolioSolution]:
+    key = ("frontier", _canonical(symbols), num_points, max_weight, data_version())
+    frontier = OPTIMIZATION_CACHE.get_or_compute(
+        key,
+        lambda: cached_model(symbols).efficient_frontier(
+            num_points=num_points, max_weight=max_weight
+        ),
+    )
+    return [_in_order(point, symbols) for point in frontier]
+
+
+def optimization_cache_stats() -> Dict[str, float]:
+    """Compteurs du cache d'optimisation (succès, échecs, évictions, taille)."""
+    return OPTIMIZATION_CACHE.stats()
+
+
 def risk_return_points(symbols: Sequence[str] | None = None) -> pd.DataFrame:
     stats = compute_descriptive_stats(symbols)
     return stats[
@@ -255,3 +972,87 @@ def risk_return_points(symbols: Sequence[str] | None = None) -> pd.DataFrame:
             "return_risk_ratio",
         ]
     ]
+
+
+def _walk_forward_weights(model: MarkowitzModel, options: dict) -> Tuple[np.ndarray, str]:
+    """Poids d'une fenêtre et problème effectivement résolu (voir `walk_forward_backtest`)."""
+    target = options["target_annual_return"]
+    if target is None:
+        return model.optimize(**options).weights.to_numpy(), walk_forward.MIN_VARIANCE
+    try:
+        return model.optimize(**options).weights.to_numpy(), walk_forward.TARGET
+    except RuntimeError:
+        ceiling = model.max_target_return(options["allow_short"], options["max_weight"])
+        if not np.isfinite(ceiling) or ceiling >= target:
+            raise  # cible atteignable : l'échec ne vient pas de la cible
+    capped = {**options, "target_annual_return": ceiling}
+    return model.optimize(**capped).weights.to_numpy(), walk_forward.MAX_RETURN
+
+
+def _walk_forward_chunk(
+    subset: pd.DataFrame,
+    window: int,
+    covariance: str,
+    options: dict,
+    starts: np.ndarray,
+) -> List[Tuple[np.ndarray, str]]:
+    """Poids des rééquilibrages `starts` (consécutifs), chaque solveur repartant du précédent."""
+    moments = walk_forward.MovingMoments(subset.to_numpy(dtype=float))
+    solved: List[Tuple[np.ndarray, str]] = []
+    previous = None
+    for start in starts:
+        history = subset.iloc[start - window : start]
+        if covariance == "sample":
+            moments.move(start - window, start)
+            model = MarkowitzModel.from_moments(history, moments.mean(), moments.covariance())
+        else:
+            model = MarkowitzModel.from_returns(history, covariance)
+        if previous is not None:
+            model.warm_start(previous)
+        solved.append(_walk_forward_weights(model, options))
+        previous = model
+    return solved
+
+
+def walk_forward_backtest(
+    symbols: Sequence[str],
+    window: int = walk_forward.DEFAULT_WINDOW,
+    rebalance: str | None = "monthly",
+    target_annual_return: float | None = None,
+    max_weight: float | None = 0.35,
+    allow_short: bool = False,
+    covariance: str = "auto",
+    transaction_cost: float = 0.0,
+    workers: int = 1,
+) -> walk_forward.WalkForwardResult:
+    """Réoptimisation glissante sur `window` séances, chaînée hors échantillon.
+
+    À chaque début de période `rebalance`, `optimize` est appelé sur les
+    `window` séances précédentes ; les poids sont détenus jusqu'au suivant.
+    `workers` > 1 répartit les fenêtres entre processus (0 = tous les cœurs).
+
+    Une fenêtre dont le rendement maximal atteignable (sous `max_weight`,
+    `allow_short`) reste sous `target_annual_return` n'interrompt pas le
+    calcul : elle détient le portefeuille de rendement maximal. Le problème
+    résolu à chaque rééquilibrage est dans `WalkForwardResult.objectives`.
+    Voir `src.walk_forward`.
+    """
+    subset = prepare_returns(symbols)
+    starts = walk_forward.rebalance_points(pd.DatetimeIndex(subset.index), window, rebalance)
+    if covariance == "auto":
+        covariance = "sample" if len(subset.columns) <= SAMPLE_COVARIANCE_MAX else "factor"
+    options = {
+        "target_annual_return": target_annual_return,
+        "allow_short": allow_short,
+        "max_weight": max_weight,
+    }
+    solve = partial(_walk_forward_chunk, subset, window, covariance, options)
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    chunks = np.array_split(starts, min(workers, len(starts)))
+    if len(chunks) == 1:
+        solved = solve(starts)
+    else:
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            solved = [item for chunk in pool.map(solve, chunks) for item in chunk]
+    weights, objectives = zip(*solved)
+    return walk_forward.chain(subset, starts, list(weights), list(objectives), transaction_cost)
@@ -0,0 +1,188 @@
+"""Backtest vectorisé : des milliers de portefeuilles en une passe.
+
+Entre deux rééquilibrages, un portefeuille n'est qu'une somme pondérée des
+indices de croissance de ses titres. Pour P portefeuilles à la fois :
+
+    G = cumprod(1 + R)        (séances × titres, depuis le dernier rééquilibrage)
+    V = G @ Wᵀ                (séances × portefeuilles)
+
+Un seul produit matriciel par période, quel que soit P. À chaque
+rééquilibrage, les poids ont dérivé (W ∘ G_fin / V_fin) : l'écart avec les
+poids cibles donne la rotation, facturée `transaction_cost` par unité échangée.
+L'achat initial est facturé de la même façon.
+
+Avec un rééquilibrage "daily", chaque séance est une période : c'est le
+portefeuille à poids constants, V_t = V_{t-1} (1 + R_t @ wᵀ), rotation de
+dérive comprise.
+
+Un rendement manquant (titre pas encore coté, suspension) compte pour 0 :
+la ligne garde sa valeur.
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# fréquence → période pandas ; None = achat puis conservation
+REBALANCE_FREQUENCIES = {"daily": "D", "monthly": "M", "quarterly": "Q", "yearly": "Y"}
+TRADING_DAYS = 252
+
+
+@dataclass
+class BacktestResult:
+    """Valeurs (base 1 au départ, frais déduits) de chaque portefeuille, jour par jour."""
+
+    dates: pd.DatetimeIndex
+    names: List[str]
+    values: np.ndarray  # (séances, portefeuilles)
+    turnover: np.ndarray  # rotation cumulée par portefeuille (achat initial compris)
+    costs: np.ndarray  # frais cumulés, en fraction de valeur
+
+    def equity(self, base: float = 100.0) -> pd.DataFrame:
+        return pd.DataFrame(self.values * base, index=self.dates, columns=self.names)
+
+    def summary(self) -> pd.DataFrame:
+        """Rendement total/annualisé, volatilité, ratio µ/σ, drawdown max, rotation."""
+        curve = np.vstack([np.ones((1, len(self.names))), self.values])
+        daily = curve[1:] / curve[:-1] - 1
+        total = self.values[-1] - 1
+        annual = (1 + total) ** (TRADING_DAYS / len(self.dates)) - 1
+        vol = daily.std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS)
+        drawdown = (curve / np.maximum.accumulate(curve) - 1).min(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(vol > 0, annual / vol, np.nan)
+        return pd.DataFrame(
+            {
+                "Portfolio": self.names,
+                "total_return": total,
+                "annual_return": annual,
+                "vol_annual": vol,
+                "return_risk_ratio": ratio,
+                "max_drawdown": drawdown,
+                "turnover": self.turnover,
+                "costs": self.costs,
+            }
+        )
+
+
+def rebalance_starts(dates: pd.DatetimeIndex, frequency: Optional[str]) -> np.ndarray:
+    """Indices des séances où l'on (ré)investit : la première, puis la première de chaque période."""
+    if frequency is None:
+        return np.array([0])
+    if frequency not in REBALANCE_FREQUENCIES:
+        raise ValueError(
+            f"Fréquence inconnue {frequency!r} (attendu : {', '.join(REBALANCE_FREQUENCIES)} ou None)."
+        )
+    periods = dates.to_period(REBALANCE_FREQUENCIES[frequency]).asi8
+    return np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+
+
+def _simulate(
+    returns: np.ndarray, starts: np.ndarray, targets: Iterable[np.ndarray], transaction_cost: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Valeurs, rotation et frais ; `targets` donne les poids (portefeuilles × titres) de chaque période."""
+    days = len(returns)
+    values = turnover = costs = value = held = None
+    for first, last, weights in zip(starts, np.r_[starts[1:], days], targets):
+        if values is None:
+            count = len(weights)
+            values = np.empty((days, count))
+            turnover, costs, value = np.zeros(count), np.zeros(count), np.ones(count)
+            held = np.zeros_like(weights)  # poids détenus juste avant le rééquilibrage
+        traded = np.abs(weights - held).sum(axis=1)
+        fee = traded * transaction_cost
+        turnover += traded
+        costs += fee * value
+        value = value * (1 - fee)
+        growth = np.cumprod(1 + returns[first:last], axis=0)
+        relative = growth @ weights.T  # (séances de la période × portefeuilles)
+        values[first:last] = relative * value
+        with np.errstate(divide="ignore", invalid="ignore"):
+            held = weights * growth[-1] / relative[-1][:, None]
+        held = np.nan_to_num(held)
+        value = values[last - 1]
+    return values, turnover, costs
+
+
+def run_backtest(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    dates: pd.DatetimeIndex,
+    rebalance: Optional[str] = "monthly",
+    transaction_cost: float = 0.0,
+    names: Optional[Sequence[str]] = None,
+) -> BacktestResult:
+    """Backtest de `weights` (portefeuilles × titres) sur `returns` (séances × titres).
+
+    Chaque ligne de `weights` est ramenée aux poids cibles à chaque début de
+    période `rebalance` ("daily", "monthly", "quarterly", "yearly" ; None = jamais).
+    """
+    returns = np.nan_to_num(np.asarray(returns, dtype=float), nan=0.0)
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    if weights.shape[1] != returns.shape[1]:
+        raise ValueError("weights et returns n'ont pas le même nombre de titres.")
+    names = list(names) if names is not None else [f"P{i}" for i in range(len(weights))]
+    starts = rebalance_starts(dates, rebalance)
+    values, turnover, costs = _simulate(
+        returns, starts, itertools.repeat(weights), transaction_cost
+    )
+    return BacktestResult(dates, names, values, turnover, costs)
+
+
+def run_schedule(
+    returns: np.ndarray,
+    dates: pd.DatetimeIndex,
+    starts: Sequence[int],
+    weights: np.ndarray,
+    transaction_cost: float = 0.0,
+    name: str = "P0",
+) -> BacktestResult:
+    """Un portefeuille dont les poids changent à chaque rééquilibrage.
+
+    `weights[i]` est détenu de la séance `starts[i]` jusqu'à la veille de
+    `starts[i + 1]` (la dernière période court jusqu'à la fin de `returns`).
+    """
+    returns = np.nan_to_num(np.asarray(returns, dtype=float), nan=0.0)
+    weights = np.asarray(weights, dtype=float)
+    starts = np.asarray(starts)
+    if len(weights) != len(starts) or not len(starts) or starts[0] != 0:
+        raise ValueError("Il faut un jeu de poids par période, la première commençant à 0.")
+    values, turnover, costs = _simulate(
+        returns, starts, (row[None, :] for row in weights), transaction_cost
+    )
+    return BacktestResult(dates, [name], values, turnover, costs)
+
+
+def backtest_frame(
+    returns: pd.DataFrame,
+    weights: pd.DataFrame | Dict[str, pd.Series],
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    rebalance: Optional[str] = "monthly",
+    transaction_cost: float = 0.0,
+) -> BacktestResult:
+    """`run_backtest` sur des tables nommées : une ligne (ou une série) de poids par portefeuille.
+
+    Les titres absents d'un portefeuille y pèsent 0 ; seules les colonnes
+    utilisées par au moins un portefeuille sont lues.
+    """
+    if isinstance(weights, dict):
+        weights = pd.DataFrame(weights).T
+    weights = weights.fillna(0.0)
+    window = returns.loc[start:end, list(weights.columns)]
+    if window.empty:
+        raise ValueError("Aucune séance dans la fenêtre demandée.")
+    return run_backtest(
+        window.to_numpy(),
+        weights.to_numpy(),
+        pd.DatetimeIndex(window.index),
+        rebalance=rebalance,
+        transaction_cost=transaction_cost,
+        names=[str(name) for name in weights.index],
+    )
@@ -6,31 +6,48 @@ les différents blocs se parlent : données → analyse → visualisation.
 
 from __future__ import annotations
 
+import importlib
+import logging
+import os
+import threading
 from datetime import date
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from dash import Dash, Input, Output, callback, dash_table, dcc, html
+from dash import Dash, Input, Output, State, callback, ctx, dash_table, dcc, html
+from dash.exceptions import PreventUpdate
 from dash.dash_table import FormatTemplate
 from dash.dash_table.Format import Format
 
-from src import analysis
+from src import analysis, backtest
+from src.dashboard import instrumentation
+from src.dashboard.background import ThreadManager
+from src.dashboard.downsample import downsample_frame
 
-MAX_TICKERS = 5
+MAX_TICKERS = 500
 GRAPH_HEIGHT = 420
 DEFAULT_MAX_WEIGHT = 0.35
+DEFAULT_TARGET_RETURN = 0.20
+FRONTIER_POINTS = 100
+PRICE_POINTS = 800  # points par courbe de prix, ≈ largeur du graphe en pixels
 DEFAULT_SYMBOLS = ["AAPL", "QQQ", "TQQQ"]
 BACKTEST_START = pd.Timestamp("2020-01-02")
 BACKTEST_END = pd.Timestamp("2020-03-31")
+BACKTEST_REBALANCE = "daily"  # poids constants chaque séance, comme la version d'origine
+REBALANCE_LABELS = {
+    "daily": "quotidien",
+    "monthly": "mensuel",
+    "quarterly": "trimestriel",
+    "yearly": "annuel",
+    None: "aucun",
+}
+BACKGROUND_WORKERS = 2  # calculs lourds (frontière, backtest) menés en parallèle
+BACKGROUND_POLL_MS = 250  # relance du navigateur pendant un calcul en arrière-plan
 
-# --- Données “vivantes” lues depuis data/processed ---
-# On charge tout une seule fois ; Dash réutilise les objets en mémoire.
-PRICES = analysis.load_prices()
-RETURNS_WIDE = analysis.load_returns_wide()
-SELECTION = analysis.load_selection()
-ALL_STATS = analysis.compute_descriptive_stats()
+logger = logging.getLogger(__name__)
 
 COLOR_SEQUENCE = (
     px.colors.qualitative.D3
@@ -39,26 +56,49 @@ COLOR_SEQUENCE = (
     + px.colors.qualitative.Plotly
 )
 DEFAULT_COLOR = "#636EFA"
-SYMBOL_COLOR_MAP = {
-    symbol: COLOR_SEQUENCE[i % len(COLOR_SEQUENCE)]
-    for i, symbol in enumerate(SELECTION["Symbol"].tolist())
-}
+
+# --- Données “vivantes” lues depuis data/processed ---
+# Rien n'est lu à l'import : le serveur démarre tout de suite, et chaque donnée
+# est chargée une seule fois, au premier besoin (caches de `src.analysis`).
+# Les matrices sont mappées (mmap) : les workers partagent les mêmes pages.
+# `warm_up` les prépare en tâche de fond ; `/ready` dit quand c'est fait.
+READY = threading.Event()
+_warm_up_pid: int | None = None  # processus où `warm_up` a été lancé
+_warm_up_lock = threading.Lock()
+
+
+def available_symbols() -> pd.Index:
+    return analysis.load_returns_wide().columns
+
+
+@lru_cache(maxsize=1)
+def symbol_color_map() -> dict:
+    return {
+        symbol: COLOR_SEQUENCE[i % len(COLOR_SEQUENCE)]
+        for i, symbol in enumerate(analysis.load_selection()["Symbol"].tolist())
+    }
 
 
 def color_map_for(symbols: List[str]) -> dict:
-    mapping = {symbol: SYMBOL_COLOR_MAP.get(symbol, DEFAULT_COLOR) for symbol in symbols}
+    colors = symbol_color_map()
+    mapping = {symbol: colors.get(symbol, DEFAULT_COLOR) for symbol in symbols}
     return mapping
 
 
+def default_symbols() -> List[str]:
+    return [s for s in DEFAULT_SYMBOLS if s in available_symbols()]
+
+
 def sanitize_selection(selected: List[str] | None):
     """Nettoie la sélection utilisateur pour éviter toute surprise."""
     symbols: List[str] = []
+    available = available_symbols()
     for symbol in (selected or []):
         symbol = symbol.upper()
-        if symbol in RETURNS_WIDE.columns and symbol not in symbols:
+        if symbol in available and symbol not in symbols:
             symbols.append(symbol)
     if not symbols:
-        symbols = [s for s in DEFAULT_SYMBOLS if s in RETURNS_WIDE.columns]
+        symbols = default_symbols()
     warning = ""
     if len(symbols) > MAX_TICKERS:
         warning = f"Sélection limitée à {MAX_TICKERS} tickers pour préserver la lisibilité."
@@ -75,12 +115,28 @@ def format_info(symbols: List[str], stats: pd.DataFrame) -> str:
     )
 
 
-def build_price_figure(symbols: List[str], mode: str) -> go.Figure:
-    """Graphique de prix ou d'indices base 100 (même palette partout)."""
-    data = PRICES[PRICES["Symbol"].isin(symbols)]
+def price_revision(symbols: List[str]) -> str:
+    """`uirevision` du graphe de prix : le zoom appartient à une sélection."""
+    return "|".join(symbols)
+
+
+@instrumentation.builder("build_price_figure")
+def build_price_figure(
+    symbols: List[str],
+    mode: str,
+    window: Tuple[pd.Timestamp, pd.Timestamp] | None = None,
+) -> go.Figure:
+    """Graphique de prix ou d'indices base 100 (même palette partout).
+
+    Chaque courbe est réduite à `PRICE_POINTS` points (LTTB) sur la fenêtre
+    visible `window` : le navigateur reçoit la même quantité de données quelle
+    que soit la longueur de l'historique ou le niveau de zoom.
+    """
+    data = analysis.price_history(symbols)
     if data.empty:
         return go.Figure()
     y_col = "Adj Close" if mode == "price" else "Normalized"
+    data = downsample_frame(data, y_col, PRICE_POINTS, window=window)
     title = "Prix ajustés" if mode == "price" else "Indices base 100"
     color_map = color_map_for(symbols)
     fig = px.line(
@@ -94,7 +150,10 @@ def build_price_figure(symbols: List[str], mode: str) -> go.Figure:
         color_discrete_map=color_map,
         category_orders={"Symbol": symbols},
     )
-    fig.update_layout(legend_title_text="Ticker")
+    # Même uirevision tant que la sélection ne change pas : le zoom est conservé.
+    fig.update_layout(legend_title_text="Ticker", uirevision=price_revision(symbols))
+    if window is not None:
+        fig.update_xaxes(range=[window[0], window[1]])
     if mode == "price":
         fig.update_yaxes(title="Adj Close ($)")
     else:
@@ -140,6 +199,7 @@ def stats_table_columns():
     ]
 
 
+@instrumentation.builder("build_risk_scatter")
 def build_risk_scatter(stats: pd.DataFrame) -> go.Figure:
     df = stats.copy()
     df["Rendement (%)"] = df["mean_annual_return"] * 100
@@ -164,6 +224,7 @@ def build_risk_scatter(stats: pd.DataFrame) -> go.Figure:
     return fig
 
 
+@instrumentation.builder("build_corr_heatmap")
 def build_corr_heatmap(symbols: List[str]) -> go.Figure:
     matrix = analysis.correlation_matrix(symbols)
     fig = go.Figure(
@@ -186,6 +247,7 @@ def build_corr_heatmap(symbols: List[str]) -> go.Figure:
     return fig
 
 
+@instrumentation.builder("build_weights_chart")
 def build_weights_chart(
     solution: analysis.PortfolioSolution, max_weight: float
 ) -> go.Figure:
@@ -202,7 +264,7 @@ def build_weights_chart(
     )
     fig.update_traces(texttemplate="%{text:.1%}")
     fig.update_yaxes(tickformat=".0%", range=[0, min(1, df["Weight"].max() * 1.2)])
-    colors = df["Symbol"].map(SYMBOL_COLOR_MAP).fillna(DEFAULT_COLOR)
+    colors = df["Symbol"].map(symbol_color_map()).fillna(DEFAULT_COLOR)
     fig.update_traces(marker_color=colors)
     return fig
 
@@ -226,13 +288,16 @@ def build_metrics(solution: analysis.PortfolioSolution) -> html.Div:
     )
 
 
+@instrumentation.builder("build_frontier_figure")
 def build_frontier_figure(
     solution: analysis.PortfolioSolution,
     stats: pd.DataFrame,
-    model: analysis.MarkowitzModel,
+    symbols: List[str],
     max_weight: float,
 ) -> go.Figure:
-    frontier = model.efficient_frontier(max_weight=max_weight)
+    frontier = analysis.cached_frontier(
+        symbols, max_weight=max_weight, num_points=FRONTIER_POINTS
+    )
     if not frontier:
         return go.Figure()
 
@@ -289,303 +354,495 @@ def build_frontier_figure(
     return fig
 
 
+@instrumentation.builder("build_backtest_figure")
 def build_backtest_figure(symbols: List[str], weights: pd.Series) -> go.Figure:
-    """Comparaison visuelle optimisé vs égalitaire vs benchmark (base 100)."""
-    returns = RETURNS_WIDE[symbols]
+    """Comparaison visuelle optimisé vs égalitaire vs benchmark (base 100).
+
+    Les trois portefeuilles passent ensemble dans le moteur vectorisé
+    (`src.backtest`), ramenés à leurs poids cibles à chaque séance
+    (`BACKTEST_REBALANCE`).
+    """
+    returns = analysis.load_returns_wide()[symbols]
     subset = returns.loc[BACKTEST_START:BACKTEST_END].dropna()
     if subset.empty:
         return go.Figure()
 
-    weight_vec = weights.reindex(symbols).fillna(0).values
-    optimized = subset.mul(weight_vec).sum(axis=1)
-    equal = subset.mul(1 / len(symbols)).sum(axis=1)
-
     bench_symbol = "QQQ" if "QQQ" in subset.columns else symbols[0]
-    benchmark = subset[bench_symbol]
-
-    def to_index(series: pd.Series) -> pd.Series:
-        return (1 + series).cumprod() * 100
-
-    df = pd.DataFrame(
+    portfolios = pd.DataFrame(
         {
-            "Date": subset.index,
-            "Optimisé": to_index(optimized),
-            "Égalitaire": to_index(equal),
-            f"Benchmark ({bench_symbol})": to_index(benchmark),
+            "Optimisé": weights.reindex(symbols).fillna(0),
+            "Égalitaire": pd.Series(1 / len(symbols), index=symbols),
+            f"Benchmark ({bench_symbol})": pd.Series(
+                [1.0 if symbol == bench_symbol else 0.0 for symbol in symbols], index=symbols
+            ),
         }
-    )
+    ).T
+    equity = backtest.backtest_frame(subset, portfolios, rebalance=BACKTEST_REBALANCE).equity()
 
     fig = go.Figure()
-    for column in df.columns[1:]:
+    for column in equity.columns:
         fig.add_trace(
             go.Scatter(
-                x=df["Date"],
-                y=df[column],
+                x=equity.index,
+                y=equity[column],
                 mode="lines",
                 name=column,
             )
         )
     fig.update_layout(
-        title="Backtest Jan-Mars 2020 (indice base 100)",
+        title=(
+            f"Backtest Jan-Mars 2020, rééquilibrage {REBALANCE_LABELS[BACKTEST_REBALANCE]}"
+            " (indice base 100)"
+        ),
         template="plotly_white",
         yaxis_title="Indice (base 100)",
     )
     return fig
 
 
-ticker_options = [
-    {
-        "label": f"{row['Symbol']} — {row['Security Name']} ({row['Market Category'] or 'Unk.'})",
-        "value": row["Symbol"],
-    }
-    for _, row in SELECTION.iterrows()
-]
+@lru_cache(maxsize=1)
+def ticker_options() -> Tuple[dict, ...]:
+    return tuple(
+        {
+            "label": f"{row['Symbol']} — {row['Security Name']} ({row['Market Category'] or 'Unk.'})",
+            "value": row["Symbol"],
+        }
+        for _, row in analysis.load_selection().iterrows()
+    )
 
-app = Dash(__name__)
+
+def build_layout(options: List[dict], value: List[str]) -> html.Div:
+    return html.Div(
+        [
+            html.H1("Portefeuille NASDAQ pré-Covid"),
+            html.P(
+                f"Sélectionnez jusqu'à {MAX_TICKERS} actions/ETF pour explorer les métriques, "
+                "les corrélations et optimiser votre portefeuille moyenne-variance.",
+                className="subtitle",
+            ),
+            html.Div(
+                [
+                    dcc.Dropdown(
+                        id="ticker-dropdown",
+                        options=options,
+                        value=value,
+                        multi=True,
+                        placeholder=f"Choisir jusqu'à {MAX_TICKERS} tickers",
+                    ),
+                    html.Div(
+                        [
+                            html.Div(
+                                [
+                                    html.Span("Visualisation :"),
+                                    dcc.RadioItems(
+                                        id="price-mode",
+                                        options=[
+                                            {"label": "Prix", "value": "price"},
+                                            {"label": "Rendement cumulatif", "value": "normalized"},
+                                        ],
+                                        value="normalized",
+                                        inline=True,
+                                    ),
+                                ],
+                                className="control-block",
+                            ),
+                            html.Div(
+                                [
+                                    html.Span("Mode portefeuille :"),
+                                    dcc.RadioItems(
+                                        id="portfolio-mode",
+                                        options=[
+                                            {"label": "Variance minimale", "value": "min"},
+                                            {"label": "Cible rendement", "value": "target"},
+                                        ],
+                                        value="target",
+                                        inline=True,
+                                    ),
+                                ],
+                                className="control-block",
+                            ),
+                            html.Div(
+                                [
+                                    html.Span("Rendement annuel cible"),
+                                    dcc.Slider(
+                                        id="target-return-slider",
+                                        min=0.0,
+                                        max=1.0,
+                                        step=0.02,
+                                        value=DEFAULT_TARGET_RETURN,
+                                        marks={
+                                            0.0: "0%",
+                                            0.2: "20%",
+                                            0.4: "40%",
+                                            0.6: "60%",
+                                            0.8: "80%",
+                                            1.0: "100%",
+                                        },
+                                    ),
+                                ],
+                                className="control-block",
+                            ),
+                            html.Div(
+                                [
+                                    html.Span("Poids max par titre"),
+                                    dcc.Slider(
+                                        id="max-weight-slider",
+                                        min=0.2,
+                                        max=1.0,
+                                        step=0.05,
+                                        value=DEFAULT_MAX_WEIGHT,
+                                        marks={
+                                            0.2: "20%",
+                                            0.35: "35%",
+                                            0.5: "50%",
+                                            0.75: "75%",
+                                            1.0: "100%",
+                                        },
+                                    ),
+                                ],
+                                className="control-block",
+                            ),
+                            html.Button("Optimiser", id="optimize-button", className="primary"),
+                        ],
+                        className="controls-grid",
+                    ),
+                ],
+                className="controls-wrapper",
+            ),
+            dcc.Store(id="selection-store"),
+            dcc.Store(id="solution-store"),
+            dcc.Store(id="price-zoom-store"),
+            html.Div(id="warning-banner", className="warning"),
+            html.Div(id="selection-info", className="selection-info"),
+            # Les cartes KPI sont placées juste en dessous pour “résumer” la sélection
+            html.Div(id="portfolio-metrics", className="metric-strip"),
+            html.Div(
+                [
+                    dcc.Graph(
+                        id="price-graph",
+                        className="card",
+                        style={"height": f"{GRAPH_HEIGHT}px"},
+                    ),
+                    dash_table.DataTable(
+                        id="stats-table",
+                        columns=stats_table_columns(),
+                        data=[],
+                        page_size=10,
+                        sort_action="native",
+                        style_table={"height": "400px", "overflowY": "auto"},
+                    ),
+                ],
+                className="grid two",
+            ),
+            html.Div(
+                [
+                    dcc.Graph(
+                        id="risk-graph",
+                        className="card",
+                        style={"height": f"{GRAPH_HEIGHT}px"},
+                    ),
+                    dcc.Graph(
+                        id="correlation-graph",
+                        className="card",
+                        style={"height": f"{GRAPH_HEIGHT}px"},
+                    ),
+                ],
+                className="grid two",
+            ),
+            html.Div(
+                [
+                    dcc.Graph(
+                        id="weights-graph",
+                        className="card",
+                        style={"height": f"{GRAPH_HEIGHT}px"},
+                    ),
+                ],
+                className="grid two",
+            ),
+            html.Div(
+                [
+                    dcc.Graph(
+                        id="frontier-graph",
+                        className="card",
+                        style={"height": f"{GRAPH_HEIGHT}px"},
+                    ),
+                    dcc.Graph(
+                        id="backtest-graph",
+                        className="card",
+                        style={"height": f"{GRAPH_HEIGHT}px"},
+                    ),
+                ],
+                className="grid two",
+            ),
+        ],
+        className="app-container",
+    )
+
+
+def serve_layout() -> html.Div:
+    """Mise en page servie à chaque chargement ; les données sont lues au premier appel."""
+    return build_layout(list(ticker_options()), default_symbols())
+
+
+def warm_up() -> None:
+    """Mappe les données et prépare les caches (puis cvxpy) hors du chemin des requêtes."""
+    try:
+        analysis.data_version()  # version de référence des données préchargées
+        analysis.load_returns_wide()
+        analysis.load_price_matrix("Normalized")
+        analysis.load_stats_index()
+        ticker_options()
+        symbol_color_map()
+        READY.set()
+        importlib.import_module("cvxpy")  # solveur de secours, ≈ 1 s d'import
+    except Exception:  # pragma: no cover - /ready reste à 503, l'erreur est journalisée
+        logger.exception("Préchargement des données impossible")
+
+
+def start_warm_up() -> None:
+    """Lance `warm_up` une fois par processus.
+
+    Un fork ne copie pas les threads : un worker issu d'un parent préchargé
+    (`gunicorn --preload`) relance le sien, d'où le contrôle du PID.
+    """
+    global _warm_up_pid
+    with _warm_up_lock:
+        if _warm_up_pid == os.getpid():
+            return
+        _warm_up_pid = os.getpid()
+    threading.Thread(target=warm_up, name="dashboard-warm-up", daemon=True).start()
+
+
+# Frontière et backtest tournent sur des threads du serveur (`ThreadManager`) :
+# leurs résultats restent dans le cache d'optimisation et leurs mesures sur /metrics.
+BACKGROUND_MANAGER = ThreadManager(BACKGROUND_WORKERS)
+
+app = Dash(__name__, background_callback_manager=BACKGROUND_MANAGER)
 app.title = "Portefeuille NASDAQ"
 server = app.server
+instrumentation.install(server)  # /metrics (Prometheus)
 
-app.layout = html.Div(
-    [
-        html.H1("Portefeuille NASDAQ pré-Covid"),
-        html.P(
-            "Sélectionnez jusqu'à cinq actions/ETF pour explorer les métriques, "
-            "les corrélations et optimiser votre portefeuille moyenne-variance.",
-            className="subtitle",
-        ),
-        html.Div(
-            [
-                dcc.Dropdown(
-                    id="ticker-dropdown",
-                    options=ticker_options,
-                    value=[s for s in DEFAULT_SYMBOLS if s in RETURNS_WIDE.columns],
-                    multi=True,
-                    placeholder="Choisir jusqu'à 5 tickers",
-                ),
-                html.Div(
-                    [
-                        html.Div(
-                            [
-                                html.Span("Visualisation :"),
-                                dcc.RadioItems(
-                                    id="price-mode",
-                                    options=[
-                                        {"label": "Prix", "value": "price"},
-                                        {"label": "Rendement cumulatif", "value": "normalized"},
-                                    ],
-                                    value="normalized",
-                                    inline=True,
-                                ),
-                            ],
-                            className="control-block",
-                        ),
-                        html.Div(
-                            [
-                                html.Span("Mode portefeuille :"),
-                                dcc.RadioItems(
-                                    id="portfolio-mode",
-                                    options=[
-                                        {"label": "Variance minimale", "value": "min"},
-                                        {"label": "Cible rendement", "value": "target"},
-                                    ],
-                                    value="target",
-                                    inline=True,
-                                ),
-                            ],
-                            className="control-block",
-                        ),
-                        html.Div(
-                            [
-                                html.Span("Rendement annuel cible"),
-                                dcc.Slider(
-                                    id="target-return-slider",
-                                    min=0.0,
-                                    max=1.0,
-                                    step=0.02,
-                                    value=0.20,
-                                    marks={
-                                        0.0: "0%",
-                                        0.2: "20%",
-                                        0.4: "40%",
-                                        0.6: "60%",
-                                        0.8: "80%",
-                                        1.0: "100%",
-                                    },
-                                ),
-                            ],
-                            className="control-block",
-                        ),
-                        html.Div(
-                            [
-                                html.Span("Poids max par titre"),
-                                dcc.Slider(
-                                    id="max-weight-slider",
-                                    min=0.2,
-                                    max=1.0,
-                                    step=0.05,
-                                    value=DEFAULT_MAX_WEIGHT,
-                                    marks={
-                                        0.2: "20%",
-                                        0.35: "35%",
-                                        0.5: "50%",
-                                        0.75: "75%",
-                                        1.0: "100%",
-                                    },
-                                ),
-                            ],
-                            className="control-block",
-                        ),
-                        html.Button("Optimiser", id="optimize-button", className="primary"),
-                    ],
-                    className="controls-grid",
-                ),
-            ],
-            className="controls-wrapper",
-        ),
-        html.Div(id="warning-banner", className="warning"),
-        html.Div(id="selection-info", className="selection-info"),
-        # Les cartes KPI sont placées juste en dessous pour “résumer” la sélection
-        html.Div(id="portfolio-metrics", className="metric-strip"),
-        html.Div(
-            [
-                dcc.Graph(
-                    id="price-graph",
-                    className="card",
-                    style={"height": f"{GRAPH_HEIGHT}px"},
-                ),
-                dash_table.DataTable(
-                    id="stats-table",
-                    columns=stats_table_columns(),
-                    data=[],
-                    page_size=10,
-                    sort_action="native",
-                    style_table={"height": "400px", "overflowY": "auto"},
-                ),
-            ],
-            className="grid two",
-        ),
-        html.Div(
-            [
-                dcc.Graph(
-                    id="risk-graph",
-                    className="card",
-                    style={"height": f"{GRAPH_HEIGHT}px"},
-                ),
-                dcc.Graph(
-                    id="correlation-graph",
-                    className="card",
-                    style={"height": f"{GRAPH_HEIGHT}px"},
-                ),
-            ],
-            className="grid two",
-        ),
-        html.Div(
-            [
-                dcc.Graph(
-                    id="weights-graph",
-                    className="card",
-                    style={"height": f"{GRAPH_HEIGHT}px"},
-                ),
-            ],
-            className="grid two",
-        ),
-        html.Div(
-            [
-                dcc.Graph(
-                    id="frontier-graph",
-                    className="card",
-                    style={"height": f"{GRAPH_HEIGHT}px"},
-                ),
-                dcc.Graph(
-                    id="backtest-graph",
-                    className="card",
-                    style={"height": f"{GRAPH_HEIGHT}px"},
-                ),
-            ],
-            className="grid two",
-        ),
-    ],
-    className="app-container",
+# Squelette sans données : Dash y valide les callbacks sans appeler serve_layout.
+app.validation_layout = build_layout([], [])
+app.layout = serve_layout
+
+
+@server.route("/ready")
+def ready():
+    """200 quand les données sont mappées (sonde de disponibilité), 503 avant."""
+    if READY.is_set():
+        return {"ready": True}, 200
+    return {"ready": False}, 503
+
+
+@server.before_request
+def warm_up_worker() -> None:
+    """Première requête d'un worker forké : y lancer le préchargement."""
+    start_warm_up()
+
+
+start_warm_up()
+
+
+# --- Callbacks : un graphe de dépendances plutôt qu'un callback géant ---
+# ticker-dropdown ─▶ selection-store ─┬▶ prix (avec price-mode)
+#                                     ├▶ table, infos, nuage, corrélations
+#                                     └▶ solution-store (avec mode, cible, cap)
+#                                          ├▶ poids + cartes KPI
+#                                          ├▶ frontière (arrière-plan)
+#                                          └▶ backtest (arrière-plan)
+# Les stores ne contiennent que des clés ; les résultats lourds restent côté
+# serveur dans le cache d'optimisation de `src.analysis`.
+
+
+@callback(
+    Output("selection-store", "data"),
+    Input("ticker-dropdown", "value"),
 )
+@instrumentation.timed_callback
+def update_selection(selected):
+    symbols, warning = sanitize_selection(selected)
+    return {"symbols": symbols, "warning": warning}
+
+
+def zoom_window(relayout: dict | None) -> Tuple[pd.Timestamp, pd.Timestamp] | None:
+    """Fenêtre de dates d'un événement de zoom Plotly (None = tout l'historique)."""
+    if not relayout or relayout.get("xaxis.autorange"):
+        return None
+    if "xaxis.range[0]" in relayout:
+        return (
+            pd.Timestamp(relayout["xaxis.range[0]"]),
+            pd.Timestamp(relayout["xaxis.range[1]"]),
+        )
+    if "xaxis.range" in relayout:
+        start, end = relayout["xaxis.range"]
+        return pd.Timestamp(start), pd.Timestamp(end)
+    return None
 
 
 @callback(
     Output("price-graph", "figure"),
+    Output("price-zoom-store", "data"),
+    Input("selection-store", "data"),
+    Input("price-mode", "value"),
+    Input("price-graph", "relayoutData"),
+    State("price-zoom-store", "data"),
+)
+@instrumentation.timed_callback
+def update_price_graph(selection, price_mode, relayout, zoom):
+    """Redessine au changement de sélection/mode, et affine l'échantillon au zoom.
+
+    `relayoutData` n'est jamais remis à zéro : le zoom retenu est rangé dans
+    `price-zoom-store` avec la révision (sélection) du graphe qu'il concernait,
+    et ignoré une fois la sélection changée.
+    """
+    symbols = selection["symbols"]
+    revision = price_revision(symbols)
+    if ctx.triggered_id == "price-graph":
+        if not relayout or not any(key.startswith("xaxis.") for key in relayout):
+            raise PreventUpdate  # légende, axe y… : rien à rééchantillonner
+        window = zoom_window(relayout)
+    elif ctx.triggered_id == "price-mode" and zoom and zoom["revision"] == revision:
+        window = zoom["window"] and tuple(pd.Timestamp(bound) for bound in zoom["window"])
+    else:
+        window = None
+    stored = {
+        "revision": revision,
+        "window": window and [bound.isoformat() for bound in window],
+    }
+    return build_price_figure(symbols, price_mode, window), stored
+
+
+@callback(
     Output("stats-table", "data"),
     Output("selection-info", "children"),
     Output("risk-graph", "figure"),
     Output("correlation-graph", "figure"),
-    Output("weights-graph", "figure"),
-    Output("portfolio-metrics", "children"),
-    Output("frontier-graph", "figure"),
-    Output("backtest-graph", "figure"),
-    Output("warning-banner", "children"),
-    Input("ticker-dropdown", "value"),
-    Input("price-mode", "value"),
+    Input("selection-store", "data"),
+)
+@instrumentation.timed_callback
+def update_selection_panels(selection):
+    symbols = selection["symbols"]
+    with instrumentation.builder("compute_descriptive_stats"):
+        stats = analysis.compute_descriptive_stats(symbols)
+    return (
+        stats.to_dict("records"),
+        format_info(symbols, stats),
+        build_risk_scatter(stats),
+        build_corr_heatmap(symbols),
+    )
+
+
+@callback(
+    Output("solution-store", "data"),
+    Input("selection-store", "data"),
     Input("portfolio-mode", "value"),
     Input("target-return-slider", "value"),
     Input("max-weight-slider", "value"),
     Input("optimize-button", "n_clicks"),
 )
-def update_dashboard(selected, price_mode, mode, target_return, max_weight, _):
-    """Cerveau du dashboard : lit les inputs et renvoie toutes les figures."""
-    symbols, warning = sanitize_selection(selected)
-    stats = analysis.compute_descriptive_stats(symbols)
-    price_fig = build_price_figure(symbols, price_mode)
-    info = format_info(symbols, stats)
-    risk_fig = build_risk_scatter(stats)
-    corr_fig = build_corr_heatmap(symbols)
-
+@instrumentation.timed_callback
+def update_solution(selection, mode, target_return, max_weight, _):
+    """Résout (ou relit du cache) le portefeuille ; le store n'en garde que la clé."""
+    request = {
+        "symbols": selection["symbols"],
+        "mode": mode,
+        "target_return": target_return,
+        "max_weight": max_weight,
+        "error": None,
+    }
     try:
-        model = analysis.MarkowitzModel.from_symbols(symbols)
-        if mode == "min":
-            solution = model.minimum_variance(max_weight=max_weight)
-        else:
-            solution = model.optimize(
-                target_annual_return=target_return,
-                max_weight=max_weight,
-            )
+        solution_for(request)
     except Exception as exc:  # pragma: no cover - affichage utilisateur
-        warning = f"{warning} Optimisation impossible: {exc}"
-        empty_fig = go.Figure()
-        return (
-            price_fig,
-            stats.to_dict("records"),
-            info,
-            risk_fig,
-            corr_fig,
-            empty_fig,
-            html.Div("Sélectionner au moins deux titres."),
-            empty_fig,
-            empty_fig,
-            warning,
-        )
+        request["error"] = str(exc)
+    return request
+
 
-    weights_fig = build_weights_chart(solution, max_weight)
-    metrics = build_metrics(solution)
-    frontier_fig = build_frontier_figure(
-        solution, stats, model, max_weight=max_weight
+@instrumentation.builder("cached_solution")
+def solution_for(request: dict) -> analysis.PortfolioSolution:
+    return analysis.cached_solution(
+        request["symbols"],
+        mode=request["mode"],
+        target_return=request["target_return"],
+        max_weight=request["max_weight"],
     )
-    backtest_fig = build_backtest_figure(symbols, solution.weights)
 
-    return (
-        price_fig,
-        stats.to_dict("records"),
-        info,
-        risk_fig,
-        corr_fig,
-        weights_fig,
-        metrics,
-        frontier_fig,
-        backtest_fig,
-        warning,
+
+@callback(
+    Output("weights-graph", "figure"),
+    Output("portfolio-metrics", "children"),
+    Input("solution-store", "data"),
+)
+@instrumentation.timed_callback
+def update_portfolio_panels(request):
+    if request["error"]:
+        return go.Figure(), html.Div("Sélectionner au moins deux titres.")
+    solution = solution_for(request)
+    return build_weights_chart(solution, request["max_weight"]), build_metrics(solution)
+
+
+def background_options(graph_id: str) -> dict:
+    """Options d'un callback lourd : hors du thread de requête.
+
+    Le graphe est grisé pendant le calcul, et un calcul en cours est
+    abandonné dès que la sélection de tickers change.
+    """
+    return {
+        "background": True,
+        "manager": BACKGROUND_MANAGER,
+        "interval": BACKGROUND_POLL_MS,
+        "running": [(Output(graph_id, "className"), "card is-computing", "card")],
+        "cancel": [Input("ticker-dropdown", "value")],
+    }
+
+
+@callback(
+    Output("frontier-graph", "figure"),
+    Input("solution-store", "data"),
+    **background_options("frontier-graph"),
+)
+@instrumentation.timed_callback
+def update_frontier(request):
+    if request["error"]:
+        return go.Figure()
+    symbols = request["symbols"]
+    with instrumentation.builder("compute_descriptive_stats"):
+        stats = analysis.compute_descriptive_stats(symbols)
+    return build_frontier_figure(
+        solution_for(request), stats, symbols, max_weight=request["max_weight"]
     )
 
 
+@callback(
+    Output("backtest-graph", "figure"),
+    Input("solution-store", "data"),
+    **background_options("backtest-graph"),
+)
+@instrumentation.timed_callback
+def update_backtest(request):
+    if request["error"]:
+        return go.Figure()
+    return build_backtest_figure(request["symbols"], solution_for(request).weights)
+
+
+@callback(
+    Output("warning-banner", "children"),
+    Input("selection-store", "data"),
+    Input("solution-store", "data"),
+)
+@instrumentation.timed_callback
+def update_warning(selection, request):
+    warning = selection["warning"]
+    if request["error"]:
+        warning = f"{warning} Optimisation impossible: {request['error']}"
+    return warning
+
+
 @callback(
     Output("target-return-slider", "disabled"),
     Input("portfolio-mode", "value"),
 )
+@instrumentation.timed_callback
 def toggle_target_slider(mode: str) -> bool:
     """Grise le slider de rendement quand il n'est pas utilisé."""
     return mode == "min"
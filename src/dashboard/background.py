@@ -0,0 +1,141 @@
+"""Callbacks Dash en arrière-plan sur des threads du serveur.
+
+Les gestionnaires fournis par Dash (`DiskcacheManager`, `CeleryManager`)
+exécutent chaque tâche dans un autre processus : ce qu'elle range dans le
+cache d'optimisation de `src.analysis` et ses mesures `/metrics` disparaissent
+avec lui. `ThreadManager` garde le protocole de Dash (la requête rend tout de
+suite la main, le navigateur revient chercher le résultat, `running` grise le
+graphe, `cancel` abandonne une tâche dépassée) mais exécute les tâches dans un
+pool de threads du processus du serveur.
+
+Un thread ne s'interrompt pas : une tâche annulée avant de démarrer est
+retirée de la file, une tâche déjà lancée va au bout (son résultat reste
+utile au cache d'optimisation) mais sa figure est jetée.
+
+Tâches et résultats vivent dans le processus : avec plusieurs workers
+(gunicorn), le navigateur doit retomber sur le même ; préférer un seul
+worker à plusieurs threads (`--workers 1 --threads N`).
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Callable, Dict, Optional, Tuple
+
+from dash._callback_context import context_value
+from dash._utils import AttributeDict
+from dash.background_callback._proxy_set_props import ProxySetProps
+from dash.background_callback.managers import BaseBackgroundCallbackManager
+from dash.exceptions import PreventUpdate
+
+MAX_PENDING_RESULTS = 64  # résultats jamais relus (onglet fermé…) avant éviction
+
+NO_UPDATE = {"_dash_no_update": "_dash_no_update"}
+
+
+class ThreadManager(BaseBackgroundCallbackManager):
+    """Gestionnaire de callbacks en arrière-plan adossé à un `ThreadPoolExecutor`."""
+
+    def __init__(self, workers: int = 2) -> None:
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dash-background")
+        self.lock = threading.Lock()
+        self.jobs: Dict[str, Tuple[Future, str]] = {}  # tâche → (future, clé du résultat)
+        self.cancelled: set = set()
+        self.results: OrderedDict[str, object] = OrderedDict()  # par tâche
+        self.updated_props: Dict[str, dict] = {}
+        self._ids = itertools.count(1)
+        super().__init__(None)
+
+    # --- Exécution ---
+
+    def make_job_fn(self, fn: Callable, progress: bool, key: Optional[str] = None) -> Callable:
+        if progress:
+            raise ValueError("ThreadManager ne gère pas `progress`.")
+        return fn
+
+    def call_job_fn(self, key: str, job_fn: Callable, args, context) -> str:
+        job = str(next(self._ids))
+        future = self.pool.submit(copy_context().run, self._run, job, key, job_fn, args, context)
+        with self.lock:
+            self.jobs[job] = (future, key)
+        return job
+
+    def _run(self, job: str, key: str, fn: Callable, args, context) -> None:
+        callback_context = AttributeDict(**context)
+        callback_context.ignore_register_page = False
+        callback_context.updated_props = ProxySetProps(
+            lambda _id, props: self._set_props(job, key, _id, props)
+        )
+        context_value.set(callback_context)
+        try:
+            if isinstance(args, dict):
+                result = fn(**args)
+            elif isinstance(args, (list, tuple)):
+                result = fn(*args)
+            else:
+                result = fn(args)
+        except PreventUpdate:
+            result = NO_UPDATE
+        except Exception as err:  # remonté au navigateur par Dash
+            result = {"background_callback_error": {"msg": str(err), "tb": traceback.format_exc()}}
+        with self.lock:
+            if job in self.cancelled:
+                self.cancelled.discard(job)
+                return
+            self.results[job] = result
+            while len(self.results) > MAX_PENDING_RESULTS:
+                evicted, _ = self.results.popitem(last=False)
+                self.jobs.pop(evicted, None)
+
+    def _set_props(self, job: str, key: str, _id, props: dict) -> None:
+        with self.lock:
+            if job not in self.cancelled:
+                self.updated_props.setdefault(key, {})[_id] = props
+
+    # --- Suivi, interrogé par Dash à chaque relance du navigateur ---
+
+    def job_running(self, job) -> bool:
+        with self.lock:
+            entry = self.jobs.get(str(job))
+        return entry is not None and not entry[0].done()
+
+    def terminate_job(self, job) -> None:
+        """Abandonne une tâche : retirée de la file, ou résultat ignoré si elle tourne."""
+        if job is None:
+            return
+        with self.lock:
+            entry = self.jobs.pop(str(job), None)
+            if entry is None:
+                return
+            future, key = entry
+            if not future.cancel() and not future.done():
+                self.cancelled.add(str(job))
+            self.results.pop(str(job), None)
+            self.updated_props.pop(key, None)
+
+    def terminate_unhealthy_job(self, job) -> bool:
+        return False
+
+    def get_progress(self, key: str):
+        return None
+
+    def result_ready(self, key: str) -> bool:
+        with self.lock:
+            return any(job in self.results for job, (_, k) in self.jobs.items() if k == key)
+
+    def get_result(self, key: str, job):
+        """Résultat rangé par tâche : deux sessions aux mêmes entrées partagent `key`."""
+        with self.lock:
+            result = self.results.pop(str(job), self.UNDEFINED)
+            if result is not self.UNDEFINED:
+                self.jobs.pop(str(job), None)
+        return result
+
+    def get_updated_props(self, key: str) -> dict:
+        with self.lock:
+            return self.updated_props.pop(key, {})
@@ -0,0 +1,86 @@
+"""Réduction des séries de prix avant envoi au navigateur (LTTB).
+
+Largest-Triangle-Three-Buckets : la série est découpée en autant de paquets
+que de points voulus, et dans chaque paquet on garde le point qui forme le
+plus grand triangle avec le point retenu avant lui et la moyenne du paquet
+suivant. Pics et creux survivent, la forme de la courbe aussi, mais le
+nombre de points envoyés ne dépend plus de la longueur de l'historique.
+
+Sur un zoom, seule la fenêtre visible est réduite : le détail réapparaît
+au fur et à mesure, à taille de payload constante.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices (croissants) des `threshold` points retenus ; tous si la série est plus courte."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bornes des paquets intérieurs (premier et dernier points toujours gardés).
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(int) + 1
+    edges[-1] = n - 1
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[anchor] - avg_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (avg_y - y[anchor])
+        )
+        anchor = start + int(np.argmax(area))
+        selected[i + 1] = anchor
+    return selected
+
+
+def visible_slice(
+    dates: np.ndarray, window: Optional[Tuple[pd.Timestamp, pd.Timestamp]]
+) -> slice:
+    """Lignes de la fenêtre visible, plus un point de chaque côté (courbe continue)."""
+    if window is None:
+        return slice(0, len(dates))
+    start = max(0, int(np.searchsorted(dates, np.datetime64(window[0]), side="left")) - 1)
+    stop = min(len(dates), int(np.searchsorted(dates, np.datetime64(window[1]), side="right")) + 1)
+    return slice(start, stop)
+
+
+def downsample_frame(
+    data: pd.DataFrame,
+    y: str,
+    points: int,
+    window: Optional[Tuple[pd.Timestamp, pd.Timestamp]] = None,
+    x: str = "Date",
+    group: str = "Symbol",
+) -> pd.DataFrame:
+    """Réduit chaque série (`group`) à `points` points sur la fenêtre visible.
+
+    `data` doit être trié par (`group`, `x`) ; les autres colonnes suivent les
+    lignes retenues (infobulles inchangées).
+    """
+    keep = []
+    offsets = np.flatnonzero(
+        np.r_[True, data[group].to_numpy()[1:] != data[group].to_numpy()[:-1]]
+    )
+    bounds = np.r_[offsets, len(data)]
+    dates = data[x].to_numpy()
+    values = data[y].to_numpy()
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        part = visible_slice(dates[first:last], window)
+        lo = first + part.start
+        hi = first + part.stop
+        keep.append(lo + lttb(dates[lo:hi].astype("int64"), values[lo:hi], points))
+    if not keep:
+        return data
+    return data.iloc[np.concatenate(keep)]
@@ -0,0 +1,171 @@
+"""Mesures de production du dashboard, exposées sur `/metrics` (format Prometheus).
+
+- `timed_callback` : latence de chaque callback Dash ; au-delà de
+  `SLOW_CALLBACK_SECONDS`, un avertissement détaille le temps passé dans
+  chaque constructeur appelé pendant la requête.
+- `builder` : latence des constructeurs de figures et des calculs
+  d'analyse, en décorateur ou en bloc `with`.
+- Côté serveur Flask, chaque requête `/_dash-update-component` est chronométrée
+  et sa réponse pesée, étiquetée par la sortie Dash mise à jour (temps vu
+  par le navigateur, sérialisation comprise).
+- Au scrape : taux de succès du cache d'optimisation et des caches de
+  chargement (`lru_cache`) de `src.analysis`.
+
+Seuil des callbacks lents : `TRABBIDS_SLOW_CALLBACK_MS` (défaut 1000 ms).
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Tuple
+
+from dash.exceptions import PreventUpdate
+from flask import Flask, Response, g, request
+
+from src import analysis, metrics
+
+SLOW_CALLBACK_SECONDS = float(os.environ.get("TRABBIDS_SLOW_CALLBACK_MS", "1000")) / 1000
+DASH_UPDATE_PATH = "/_dash-update-component"
+LOADER_CACHES = {
+    "returns_wide": analysis.load_returns_wide,
+    "prices": analysis.load_prices,
+    "price_matrix": analysis.load_price_matrix,
+    "stats_index": analysis.load_stats_index,
+    "rolling_statistics": analysis.rolling_statistics,
+    "pairwise_moments": analysis.load_pairwise_moments,
+}
+
+logger = logging.getLogger(__name__)
+
+CALLBACK_SECONDS = metrics.histogram(
+    "trabbids_callback_seconds", "Durée d'exécution des callbacks Dash.", ["callback"]
+)
+CALLBACK_ERRORS = metrics.counter(
+    "trabbids_callback_errors_total", "Callbacks terminés par une exception.", ["callback"]
+)
+BUILDER_SECONDS = metrics.histogram(
+    "trabbids_builder_seconds", "Durée des constructeurs de figures et calculs.", ["builder"]
+)
+REQUEST_SECONDS = metrics.histogram(
+    "trabbids_dash_request_seconds",
+    "Durée des requêtes de mise à jour Dash, par sortie.",
+    ["output"],
+)
+RESPONSE_BYTES = metrics.histogram(
+    "trabbids_dash_response_bytes",
+    "Taille des réponses envoyées au navigateur, par sortie.",
+    ["output"],
+    buckets=metrics.SIZE_BUCKETS,
+)
+
+_local = threading.local()
+
+
+@contextmanager
+def builder(name: str) -> Iterator[None]:
+    """Chronomètre un constructeur ; s'utilise aussi en décorateur (`@builder("…")`)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        BUILDER_SECONDS.observe(elapsed, builder=name)
+        breakdown = getattr(_local, "breakdown", None)
+        if breakdown is not None:
+            breakdown.append((name, elapsed))
+
+
+def timed_callback(func: Callable) -> Callable:
+    """Chronomètre un callback (à placer sous `@callback`)."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        outer = getattr(_local, "breakdown", None)
+        breakdown: List[Tuple[str, float]] = []
+        _local.breakdown = breakdown
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except PreventUpdate:
+            raise
+        except Exception:
+            CALLBACK_ERRORS.inc(callback=name)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            _local.breakdown = outer
+            CALLBACK_SECONDS.observe(elapsed, callback=name)
+            if elapsed > SLOW_CALLBACK_SECONDS:
+                _log_slow(name, elapsed, breakdown)
+
+    return wrapper
+
+
+def _log_slow(name: str, elapsed: float, breakdown: List[Tuple[str, float]]) -> None:
+    parts = sorted(breakdown, key=lambda item: -item[1])
+    accounted = sum(seconds for _, seconds in breakdown)
+    detail = ", ".join(f"{builder_name} {seconds * 1000:.0f} ms" for builder_name, seconds in parts)
+    logger.warning(
+        "Callback lent %s : %.0f ms (%s ; hors constructeurs %.0f ms)",
+        name,
+        elapsed * 1000,
+        detail or "aucun constructeur",
+        (elapsed - accounted) * 1000,
+    )
+
+
+@metrics.REGISTRY.collector
+def _cache_metrics() -> List[metrics.Metric]:
+    hits = metrics.Counter("trabbids_cache_hits_total", "Succès de cache.", ["cache"])
+    misses = metrics.Counter("trabbids_cache_misses_total", "Échecs de cache.", ["cache"])
+    ratio = metrics.Gauge("trabbids_cache_hit_ratio", "Taux de succès de cache.", ["cache"])
+    entries = metrics.Gauge("trabbids_cache_entries", "Entrées en cache.", ["cache"])
+    stats = analysis.optimization_cache_stats()
+    counts = {"optimization": (stats["hits"], stats["misses"], stats["entries"])}
+    for cache_name, loader in LOADER_CACHES.items():
+        info = loader.cache_info()
+        counts[cache_name] = (info.hits, info.misses, info.currsize)
+    for cache_name, (hit, miss, size) in counts.items():
+        hits.inc(hit, cache=cache_name)
+        misses.inc(miss, cache=cache_name)
+        ratio.set(hit / (hit + miss) if hit + miss else 0.0, cache=cache_name)
+        entries.set(size, cache=cache_name)
+    bytes_used = metrics.Gauge(
+        "trabbids_optimization_cache_bytes", "Mémoire estimée du cache d'optimisation."
+    )
+    bytes_used.set(stats["bytes"])
+    return [hits, misses, ratio, entries, bytes_used]
+
+
+def _dash_output() -> str:
+    payload = request.get_json(silent=True) or {}
+    return str(payload.get("output", "inconnu"))
+
+
+def install(server: Flask) -> None:
+    """Ajoute `/metrics` et le chronométrage des requêtes Dash au serveur Flask."""
+
+    @server.before_request
+    def _start_timer() -> None:
+        if request.path.endswith(DASH_UPDATE_PATH):
+            g.metrics_start = time.perf_counter()
+
+    @server.after_request
+    def _observe(response: Response) -> Response:
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            output = _dash_output()
+            REQUEST_SECONDS.observe(time.perf_counter() - start, output=output)
+            if not response.direct_passthrough:
+                RESPONSE_BYTES.observe(len(response.get_data()), output=output)
+        return response
+
+    @server.route("/metrics")
+    def _metrics() -> Response:
+        return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
@@ -4,6 +4,23 @@ Notes pédagogiques pour le lecteur / prof :
 - On raconte l’histoire des données en trois actes (sélection → prix/rendements → stats).
 - Chaque acte écrit explicitement ses fichiers dans `data/processed/` pour inspection.
 - Une seule commande relance l’intégralité du pipeline, donc pas de scripts à enchaîner.
+- Les CSV bruts sont convertis une fois en Parquet typé (`src.raw_store`) ; les
+  exécutions suivantes relisent ce store au lieu de reparser le texte.
+- `data/processed/manifest.json` (`src.manifest`) permet de sauter les actes dont
+  ni les entrées ni les paramètres n'ont changé (`--force` pour tout refaire).
+- Le scan d'activité garde au passage l'historique des tickers encore
+  sélectionnables (`FrameCache`) : l'acte 2 les réutilise sans relire le disque.
+- Optionnel : `--rolling-windows 20,60,252` exporte en plus les statistiques
+  glissantes (`src.rolling`) dans `rolling_<fenêtre>.parquet`.
+- `--chunk-rows N` lit les fichiers bruts par blocs de N lignes (`src.streaming`) :
+  mémoire bornée quelle que soit leur taille, barres intrajournalières
+  ramenées à une ligne par séance.
+- Chaque exécution se termine par un tableau des durées par étape
+  (`src.profiling`), aussi exporté dans `pipeline_profile.json` ;
+  `--profile run.prof` y ajoute un profil cProfile complet.
+- Les artefacts d'un acte sont écrits en parallèle (`--export-threads`), en
+  Parquet zstd par défaut (`--parquet-codec`, `--row-group-rows`), avec durée
+  et taille de chacun ; les copies CSV ne sont produites qu'avec `--csv`.
 
 Commande unique : `python -m src.data_loading`
 """
@@ -11,20 +28,30 @@ Commande unique : `python -m src.data_loading`
 from __future__ import annotations
 
 import argparse
+import functools
+import heapq
 import logging
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 from pandas import Timestamp
 
 try:  # pragma: no cover
-    from . import analysis
+    from . import analysis, matrix_store, pairwise, profiling, raw_store, rolling, streaming
+    from .manifest import Manifest, SummaryCache, stat_digest
     from .paths import DATA_PROCESSED, DATA_RAW
 except ImportError:  # pragma: no cover
-    from src import analysis
+    from src import analysis, matrix_store, pairwise, profiling, raw_store, rolling, streaming
+    from src.manifest import Manifest, SummaryCache, stat_digest
     from paths import DATA_PROCESSED, DATA_RAW
 
 
@@ -33,7 +60,42 @@ DEFAULT_END_DATE = Timestamp("2020-04-01")
 DEFAULT_MIN_TRADING_DAYS = 252 * 3  # 3 ans utiles
 DEFAULT_TOP_PER_BUCKET = 7
 DEFAULT_MAX_SYMBOLS = 49
+DEFAULT_WORKERS = 1
+DEFAULT_FRAME_CACHE_MB = 512
+DEFAULT_CHUNK_ROWS = 0  # 0 = fichiers lus d'un bloc
+PRICE_DTYPE = np.float32  # colonnes de prix de `prices.parquet` (les matrices restent en float64)
+PARQUET_CODECS = ("zstd", "lz4", "snappy", "gzip", "none")
+DEFAULT_PARQUET_CODEC = "zstd"
+DEFAULT_ROW_GROUP_ROWS = 128 * 1024  # petits row groups : lecture sélective par ticker
+DEFAULT_EXPORT_THREADS = 4
 PROGRESS_BATCH_SIZE = 500
+# Plusieurs petits lots par worker : équilibre la charge sans payer un aller-retour
+# inter-processus par ticker.
+CHUNKS_PER_WORKER = 16
+
+META_PATH = DATA_RAW / "symbols_valid_meta.csv"
+ACTIVITY_STATS_FILE = "activity_stats.parquet"
+SELECTION_FILE = "selected_tickers.csv"
+HISTORY_FILES = (
+    "prices.parquet",
+    "returns_long.parquet",
+    "returns_wide.parquet",
+    "returns_wide_full.parquet",
+) + tuple(
+    f"{name}{suffix}"
+    for name in (matrix_store.RETURNS_MATRIX, *matrix_store.PRICE_MATRICES.values())
+    for suffix in (".npy", ".json")
+)
+STATISTICS_FILES = (
+    "stats_summary.parquet",
+    "correlation_matrix.parquet",
+    f"{matrix_store.PAIRWISE_MOMENTS}.npy",
+    f"{matrix_store.PAIRWISE_MOMENTS}.json",
+)
+# Copies CSV, seulement avec --csv
+HISTORY_CSV_FILES = ("returns.csv",)
+STATISTICS_CSV_FILES = ("stats_summary.csv",)
+PROFILE_FILE = "pipeline_profile.json"
 
 
 logger = logging.getLogger(__name__)
@@ -87,11 +149,51 @@ def symbol_path(symbol: str, is_etf: str) -> Optional[str]:
     return None
 
 
-def summarize_symbol(symbol: str, path_str: str, end_date: Timestamp) -> Optional[SymbolProfile]:
-    path = DATA_RAW / path_str
-    df = pd.read_csv(path, usecols=["Date", "Adj Close", "Volume"])
-    df["Date"] = pd.to_datetime(df["Date"])
-    df = df[df["Date"] <= end_date]
+def summarize_symbol(
+    symbol: str, path_str: str, end_date: Timestamp, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Optional[SymbolProfile]:
+    if chunk_rows:
+        return stream_symbol(symbol, path_str, end_date, None, chunk_rows)[0]
+    df = raw_store.read_prices(DATA_RAW / path_str, end=end_date)
+    return summarize_frame(symbol, path_str, df)
+
+
+def stream_symbol(
+    symbol: str,
+    path_str: str,
+    end_date: Timestamp,
+    history_start: Optional[Timestamp],
+    chunk_rows: int,
+) -> Tuple[Optional[SymbolProfile], Optional[pd.DataFrame]]:
+    """`summarize_frame` (et l'historique depuis `history_start`) en une lecture par blocs.
+
+    Seules les séances agrégées sont gardées en mémoire, jamais le fichier brut.
+    """
+    totals = streaming.ActivityTotals()
+    history: List[pd.DataFrame] = []
+    chunks = raw_store.iter_prices(DATA_RAW / path_str, chunk_rows, end=end_date)
+    for daily in streaming.daily_bars(chunks):
+        totals.push(daily)
+        if history_start is not None:
+            history.append(daily[daily["Date"] >= history_start])
+    if not totals.trading_days:
+        return None, None
+    profile = SymbolProfile(
+        symbol=symbol,
+        is_etf=False,
+        data_file=path_str,
+        total_volume=totals.total_volume,
+        average_volume=totals.average_volume,
+        trading_days=totals.trading_days,
+        first_date=totals.first_date,
+        last_date=totals.last_date,
+    )
+    if not history:
+        return profile, None
+    return profile, clean_price_history(pd.concat(history, ignore_index=True))
+
+
+def summarize_frame(symbol: str, path_str: str, df: pd.DataFrame) -> Optional[SymbolProfile]:
     df = df.dropna(subset=["Adj Close", "Volume"])
     if df.empty:
         return None
@@ -108,9 +210,8 @@ def summarize_symbol(symbol: str, path_str: str, end_date: Timestamp) -> Optiona
 
 
 def load_metadata() -> pd.DataFrame:
-    meta_path = DATA_RAW / "symbols_valid_meta.csv"
-    logger.info("Chargement des métadonnées depuis %s", meta_path)
-    meta = pd.read_csv(meta_path)
+    logger.info("Chargement des métadonnées depuis %s", META_PATH)
+    meta = pd.read_csv(META_PATH)
     mask = (
         (meta["Nasdaq Traded"] == "Y")
         & (meta["Test Issue"] == "N")
@@ -123,26 +224,213 @@ def load_metadata() -> pd.DataFrame:
     return filtered
 
 
-def attach_activity_stats(meta: pd.DataFrame, end_date: Timestamp) -> pd.DataFrame:
+class FrameCache:
+    """Historiques déjà parsés pendant le scan, réutilisés par l'acte 2.
+
+    Seuls les tickers encore sélectionnables sont gardés : au plus
+    `top_per_bucket` par couple (Listing Exchange, Market Category), ceux qui
+    ont assez de séances et le plus gros volume vu jusque-là. Au-delà de
+    `max_bytes` en mémoire, les plus anciens partent sur disque (Parquet dans un
+    dossier temporaire) ; un ticker évincé de son groupe est oublié.
+    """
+
+    def __init__(
+        self,
+        start_date: Timestamp,
+        top_per_bucket: int,
+        min_trading_days: int,
+        max_bytes: int = DEFAULT_FRAME_CACHE_MB << 20,
+    ):
+        self.start_date = start_date
+        self.top_per_bucket = top_per_bucket
+        self.min_trading_days = min_trading_days
+        self.max_bytes = max_bytes
+        self.buckets: Dict[tuple, List[Tuple[float, str]]] = {}
+        self.memory: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self.memory_bytes = 0
+        self.spilled: Dict[str, Path] = {}
+        self.spill_dir: Optional[Path] = None
+        self.spill_count = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _bucket(row: Dict[str, object]) -> tuple:
+        return tuple(
+            None if pd.isna(row[key]) else row[key]
+            for key in ("Listing Exchange", "Market Category")
+        )
+
+    def offer(self, row: Dict[str, object], profile: SymbolProfile, frame: pd.DataFrame) -> None:
+        """Garde `frame` si le ticker peut encore entrer dans la sélection."""
+        if profile.trading_days < self.min_trading_days or self.top_per_bucket <= 0:
+            return
+        heap = self.buckets.setdefault(self._bucket(row), [])
+        entry = (profile.total_volume, profile.symbol)
+        if len(heap) < self.top_per_bucket:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            _, evicted = heapq.heapreplace(heap, entry)
+            self.discard(evicted)
+        else:
+            return
+        self._store(profile.symbol, frame)
+
+    def _store(self, symbol: str, frame: pd.DataFrame) -> None:
+        self.memory[symbol] = frame
+        self.memory_bytes += int(frame.memory_usage(index=True).sum())
+        while self.memory_bytes > self.max_bytes and self.memory:
+            self._spill(*self.memory.popitem(last=False))
+
+    def _spill(self, symbol: str, frame: pd.DataFrame) -> None:
+        self.memory_bytes -= int(frame.memory_usage(index=True).sum())
+        if self.spill_dir is None:
+            self.spill_dir = Path(tempfile.mkdtemp(prefix="trabbids-frames-"))
+        self.spill_count += 1
+        path = self.spill_dir / f"{self.spill_count}.parquet"
+        frame.to_parquet(path)
+        self.spilled[symbol] = path
+
+    def discard(self, symbol: str) -> None:
+        frame = self.memory.pop(symbol, None)
+        if frame is not None:
+            self.memory_bytes -= int(frame.memory_usage(index=True).sum())
+        path = self.spilled.pop(symbol, None)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def get(self, symbol: str) -> Optional[pd.DataFrame]:
+        frame = self.memory.get(symbol)
+        if frame is None and symbol in self.spilled:
+            frame = pd.read_parquet(self.spilled[symbol])
+        if frame is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return frame
+
+    def close(self) -> None:
+        self.memory.clear()
+        self.memory_bytes = 0
+        self.spilled.clear()
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+
+
+# (ticker, fichier, date de fin, début d'historique à garder, séances minimales,
+#  lignes par bloc)
+SummaryTask = Tuple[str, str, Timestamp, Optional[Timestamp], int, int]
+SummaryResult = Tuple[Optional[SymbolProfile], Optional[pd.DataFrame]]
+
+
+def _summarize_task(task: SummaryTask) -> SummaryResult:
+    """Unité de travail picklable pour le pool de processus.
+
+    Si un début d'historique est fourni, la même lecture sert aussi l'acte 2 :
+    on renvoie la fenêtre `[history_start, end_date]` déjà nettoyée, mais
+    seulement pour les tickers assez longs pour être sélectionnés.
+    """
+    symbol, rel_path, end_date, history_start, min_trading_days, chunk_rows = task
+    if history_start is None:
+        return summarize_symbol(symbol, rel_path, end_date, chunk_rows), None
+    if chunk_rows:
+        profile, history = stream_symbol(symbol, rel_path, end_date, history_start, chunk_rows)
+        if profile is None or profile.trading_days < min_trading_days:
+            return profile, None
+        return profile, history
+    df = raw_store.read_prices(DATA_RAW / rel_path, end=end_date)
+    profile = summarize_frame(symbol, rel_path, df)
+    if profile is None or profile.trading_days < min_trading_days:
+        return profile, None
+    return profile, clean_price_history(df[df["Date"] >= history_start])
+
+
+def _iter_profiles(tasks: Sequence[SummaryTask], workers: int) -> Iterator[SummaryResult]:
+    """Résumés dans l'ordre des tâches, en série ou via un pool de processus.
+
+    `Executor.map` rend les résultats dans l'ordre de soumission : la fusion est
+    donc déterministe et identique au mode série, quel que soit `workers`.
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        yield from map(_summarize_task, tasks)
+        return
+    chunksize = max(1, len(tasks) // (workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_summarize_task, tasks, chunksize=chunksize)
+
+
+def attach_activity_stats(
+    meta: pd.DataFrame,
+    end_date: Timestamp,
+    workers: int = DEFAULT_WORKERS,
+    cache: Optional[SummaryCache] = None,
+    frames: Optional[FrameCache] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> pd.DataFrame:
+    """Ajoute volume/séances/bornes à chaque ticker ayant un fichier exploitable.
+
+    Avec `cache`, seuls les fichiers bruts modifiés depuis le dernier passage
+    (ou jamais vus) sont relus ; les autres résumés viennent du cache.
+    Avec `frames`, les historiques des tickers relus sont gardés pour l'acte 2.
+    """
     total_meta = len(meta)
+    end_key = end_date.isoformat()
+    daily_bars = bool(chunk_rows)  # lecture par blocs : une ligne par séance
     logger.info(
-        "Calcul des métriques d'activité jusqu'au %s pour %s tickers",
+        "Calcul des métriques d'activité jusqu'au %s pour %s tickers (%s worker(s))",
         end_date.date().isoformat(),
         total_meta,
+        workers,
     )
-    records = []
-    for idx, (_, row) in enumerate(meta.iterrows(), start=1):
-        rel_path = symbol_path(row["Symbol"], row["ETF"])
+    rows = meta.to_dict("records")
+    paths = [symbol_path(row["Symbol"], row["ETF"]) for row in rows]
+    profiles: List[Optional[Dict[str, object]]] = [None] * total_meta
+    pending: List[int] = []
+    for idx, (row, rel_path) in enumerate(zip(rows, paths)):
         if rel_path is None:
             continue
-        stats = summarize_symbol(row["Symbol"], rel_path, end_date)
-        if stats is None:
+        entry = cache.get(row["Symbol"], rel_path, end_key, daily_bars) if cache else None
+        if entry is None:
+            pending.append(idx)
+        else:
+            profiles[idx] = cache.profile(entry)
+    if cache is not None:
+        logger.info(
+            "%s résumés repris du cache, %s à calculer",
+            sum(path is not None for path in paths) - len(pending),
+            len(pending),
+        )
+
+    history_start = frames.start_date if frames is not None else None
+    min_trading_days = frames.min_trading_days if frames is not None else 0
+    tasks = [
+        (rows[idx]["Symbol"], paths[idx], end_date, history_start, min_trading_days, chunk_rows)
+        for idx in pending
+    ]
+    computed = zip(pending, _iter_profiles(tasks, workers))
+    with profiling.span("activity.scan") as scan:
+        for done, (idx, (stats, history)) in enumerate(computed, start=1):
+            profiles[idx] = stats.to_dict() if stats is not None else None
+            if stats is not None:
+                scan.add(rows=stats.trading_days)
+            if frames is not None and history is not None:
+                frames.offer(rows[idx], stats, history)
+            if cache is not None:
+                cache.put(rows[idx]["Symbol"], paths[idx], end_key, profiles[idx], daily_bars)
+            if done % PROGRESS_BATCH_SIZE == 0 or done == len(pending):
+                logger.info("%s/%s tickers analysés", done, len(pending))
+    if cache is not None:
+        with profiling.span("activity.cache_save"):
+            cache.save()
+
+    records = []
+    for row, profile in zip(rows, profiles):
+        if profile is None:
             continue
-        record = row.to_dict()
-        record.update(stats.to_dict())
+        record = dict(row)
+        record.update(profile)
         records.append(record)
-        if total_meta and (idx % PROGRESS_BATCH_SIZE == 0 or idx == total_meta):
-            logger.info("%s/%s tickers analysés", idx, total_meta)
     if not records:
         raise RuntimeError("Aucun ticker valide trouvé dans les métadonnées.")
     df = pd.DataFrame(records)
@@ -173,7 +461,7 @@ def select_top_tickers(
     if max_symbols:
         grouped = grouped.sort_values("TotalVolume", ascending=False).head(max_symbols)
     grouped = grouped.sort_values(["Listing Exchange", "Market Category", "Symbol"])
-    grouped.to_csv(DATA_PROCESSED / "selected_tickers.csv", index=False)
+    grouped.to_csv(DATA_PROCESSED / SELECTION_FILE, index=False)
     print(f"[1/3] Sélection: {len(grouped)} tickers sauvegardés.")
     return grouped
 
@@ -191,12 +479,23 @@ def resolve_data_path(row: pd.Series) -> Path:
     raise FileNotFoundError(f"Aucun fichier trouvé pour {row['Symbol']}")
 
 
-def load_price_history(path: Path, start_date: Timestamp, end_date: Timestamp) -> pd.DataFrame:
-    df = pd.read_csv(path, usecols=["Date", "Adj Close", "Volume"])
-    df["Date"] = pd.to_datetime(df["Date"])
-    mask = (df["Date"] >= start_date) & (df["Date"] <= end_date)
-    df = df.loc[mask].sort_values("Date")
-    df = df.dropna(subset=["Adj Close"])
+def load_price_history(
+    path: Path,
+    start_date: Timestamp,
+    end_date: Timestamp,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> pd.DataFrame:
+    if chunk_rows:
+        chunks = raw_store.iter_prices(path, chunk_rows, start_date, end_date)
+        days = list(streaming.daily_bars(chunks))
+        if not days:
+            return clean_price_history(pd.DataFrame(columns=raw_store.PRICE_COLUMNS))
+        return clean_price_history(pd.concat(days, ignore_index=True))
+    return clean_price_history(raw_store.read_prices(path, start_date, end_date))
+
+
+def clean_price_history(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
     df["Adj Close"] = df["Adj Close"].astype(float)
     df["Volume"] = df["Volume"].fillna(0).astype(float)
     return df
@@ -215,12 +514,86 @@ def compute_returns(prices: pd.DataFrame) -> pd.DataFrame:
     return returns.dropna(subset=["Return"])
 
 
-def build_price_and_return_tables(
-    selection: pd.DataFrame, start_date: Timestamp, end_date: Timestamp
-) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    # Cette étape “bricole” toutes les tables nécessaires pour la suite.
-    price_frames: List[pd.DataFrame] = []
-    return_frames: List[pd.DataFrame] = []
+@dataclass
+class PriceMatrix:
+    """Historiques alignés sur un calendrier commun : tableaux (séances × tickers).
+
+    Les colonnes sont triées par ticker (ordre de `returns_wide`) ; une case
+    vaut NaN quand le ticker n'a pas coté ce jour-là. Tout le reste (indices
+    base 100, rendements, tables longues) se dérive de ces tableaux par des
+    opérations vectorisées, sans concat/pivot intermédiaire.
+    """
+    dates: np.ndarray
+    symbols: List[str]
+    adj_close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_series(cls, series: Dict[str, pd.DataFrame]) -> "PriceMatrix":
+        symbols = sorted(series)
+        dates = np.unique(
+            np.concatenate([series[symbol]["Date"].to_numpy() for symbol in symbols])
+        )
+        shape = (len(dates), len(symbols))
+        adj_close = np.full(shape, np.nan)
+        volume = np.full(shape, np.nan)
+        for col, symbol in enumerate(symbols):
+            frame = series[symbol]
+            rows = np.searchsorted(dates, frame["Date"].to_numpy())
+            adj_close[rows, col] = frame["Adj Close"].to_numpy()
+            volume[rows, col] = frame["Volume"].to_numpy()
+        return cls(dates, symbols, adj_close, volume)
+
+    @property
+    def valid(self) -> np.ndarray:
+        return ~np.isnan(self.adj_close)
+
+    def normalized(self) -> np.ndarray:
+        """Indice base 100 : prix / premier prix coté de chaque colonne."""
+        first_row = self.valid.argmax(axis=0)
+        first_price = self.adj_close[first_row, np.arange(len(self.symbols))]
+        return (self.adj_close / first_price) * 100
+
+    def returns(self) -> np.ndarray:
+        """Rendements entre deux cotations successives de chaque ticker.
+
+        Même calcul que `compute_returns` (variation, ±inf → NaN, clipping
+        ±80 %), mais sur toute la matrice à la fois : le prix précédent est celui
+        de la dernière séance cotée du ticker, pas forcément la veille du
+        calendrier commun.
+        """
+        n_dates = len(self.dates)
+        last_row = np.where(self.valid, np.arange(n_dates)[:, None], -1)
+        last_row = np.maximum.accumulate(last_row, axis=0)
+        prev_row = np.vstack([np.full((1, len(self.symbols)), -1), last_row[:-1]])
+        cols = np.arange(len(self.symbols))
+        prev_price = np.where(
+            prev_row >= 0, self.adj_close[np.maximum(prev_row, 0), cols], np.nan
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = self.adj_close / prev_price - 1
+        returns[np.isinf(returns)] = np.nan
+        return np.clip(returns, -0.8, 0.8)
+
+
+SymbolAttributes = Dict[str, Tuple[object, object, object]]
+
+
+def build_price_matrix(
+    selection: pd.DataFrame,
+    start_date: Timestamp,
+    end_date: Timestamp,
+    frames: Optional[FrameCache] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Tuple[PriceMatrix, SymbolAttributes]:
+    """Lit l'historique de chaque ticker retenu et l'aligne dans une `PriceMatrix`.
+
+    Les historiques déjà lus pendant le scan (`frames`) évitent un second parsing.
+    Les attributs (nom, catégorie, exchange) sont rendus dans l'ordre de la
+    sélection, qui est aussi celui de la table longue des prix.
+    """
+    series: Dict[str, pd.DataFrame] = {}
+    attributes: SymbolAttributes = {}
 
     total_symbols = len(selection)
     logger.info(
@@ -231,90 +604,346 @@ def build_price_and_return_tables(
     )
 
     for idx, (_, row) in enumerate(selection.iterrows(), start=1):
-        try:
-            path = resolve_data_path(row)
-        except FileNotFoundError as exc:
-            logger.warning("%s", exc)
-            continue
-
-        prices = load_price_history(path, start_date, end_date)
+        with profiling.span("history.symbol", key=row["Symbol"]) as symbol_span:
+            prices = frames.get(row["Symbol"]) if frames is not None else None
+            if prices is None:
+                try:
+                    path = resolve_data_path(row)
+                except FileNotFoundError as exc:
+                    logger.warning("%s", exc)
+                    continue
+                prices = load_price_history(path, start_date, end_date, chunk_rows)
+            symbol_span.add(rows=len(prices))
         if prices.empty:
             logger.warning("Aucune donnée dans l'intervalle pour %s", row["Symbol"])
             continue
 
-        prices = prices.assign(
-            Symbol=row["Symbol"],
-            SecurityName=row["Security Name"],
-            MarketCategory=row["Market Category"],
-            ListingExchange=row["Listing Exchange"],
+        series[row["Symbol"]] = prices
+        attributes[row["Symbol"]] = (
+            row["Security Name"],
+            row["Market Category"],
+            row["Listing Exchange"],
         )
-        price_frames.append(prices)
-
-        returns = compute_returns(prices)
-        if returns.empty:
-            continue
-        returns = returns.assign(Symbol=row["Symbol"])
-        return_frames.append(returns[["Date", "Symbol", "Return"]])
 
         if total_symbols and (idx % PROGRESS_BATCH_SIZE == 0 or idx == total_symbols):
             logger.info("%s/%s tickers traités pour les historiques", idx, total_symbols)
 
-    if not price_frames or not return_frames:
+    if frames is not None:
+        logger.info(
+            "Historiques réutilisés depuis le scan : %s, relus sur disque : %s",
+            frames.hits,
+            frames.misses,
+        )
+    if not series:
         raise RuntimeError("Impossible de construire les tables de prix/rendements.")
+    with profiling.span("history.align") as s:
+        matrix = PriceMatrix.from_series(series)
+        s.add(rows=matrix.adj_close.size, bytes=matrix.adj_close.nbytes + matrix.volume.nbytes)
+    return matrix, attributes
 
-    prices_all = pd.concat(price_frames, ignore_index=True)
-    prices_all["Normalized"] = prices_all.groupby("Symbol")["Adj Close"].transform(
-        lambda s: (s / s.iloc[0]) * 100 if not s.empty else s
-    )
 
-    returns_long = pd.concat(return_frames, ignore_index=True)
-    returns_long["Date"] = pd.to_datetime(returns_long["Date"])
-    returns_long = returns_long.sort_values(["Date", "Symbol"])
+def build_price_and_return_tables(
+    selection: pd.DataFrame,
+    start_date: Timestamp,
+    end_date: Timestamp,
+    frames: Optional[FrameCache] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    matrix, attributes = build_price_matrix(selection, start_date, end_date, frames)
+    return price_and_return_tables(matrix, attributes)
+
 
-    returns_wide = (
-        returns_long.pivot(index="Date", columns="Symbol", values="Return").sort_index()
+def price_and_return_tables(
+    matrix: PriceMatrix, attributes: SymbolAttributes
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    # Cette étape “bricole” toutes les tables nécessaires pour la suite.
+    # Tables longues et larges sont extraites de la matrice sans concat ni pivot.
+    returns = matrix.returns()
+    has_return = ~np.isnan(returns)
+    if not has_return.any():
+        raise RuntimeError("Impossible de construire les tables de prix/rendements.")
+
+    prices_all = _prices_long(matrix, attributes)
+
+    # Long trié (Date, Symbol) = parcours ligne par ligne de la matrice triée.
+    row_idx, col_idx = np.nonzero(has_return)
+    symbols = np.array(matrix.symbols, dtype=object)
+    returns_long = pd.DataFrame(
+        {
+            "Date": matrix.dates[row_idx],
+            "Symbol": symbols[col_idx],
+            "Return": returns[row_idx, col_idx],
+        }
+    )
+
+    keep_rows = has_return.any(axis=1)
+    keep_cols = has_return.any(axis=0)
+    returns_wide = pd.DataFrame(
+        returns[np.ix_(keep_rows, keep_cols)],
+        index=pd.DatetimeIndex(matrix.dates[keep_rows], name="Date"),
+        columns=pd.Index(symbols[keep_cols], name="Symbol"),
+        copy=False,
     )
     returns_wide_full = returns_wide.dropna()
     return prices_all, returns_long, returns_wide, returns_wide_full
 
 
+def _volume_dtype(volume: np.ndarray) -> type:
+    """Plus petit entier non signé qui contient tous les volumes."""
+    if volume.size and volume.max() > np.iinfo(np.uint32).max:
+        return np.int64
+    return np.uint32
+
+
+def _prices_long(matrix: PriceMatrix, attributes: SymbolAttributes) -> pd.DataFrame:
+    """Table longue des prix, ticker par ticker dans l'ordre de la sélection.
+
+    Format compact : `Symbol` catégoriel (un code entier par ligne), prix en
+    float32, volumes entiers. Nom, catégorie de marché et place de cotation
+    ne sont pas répétés ligne à ligne : ils vivent dans la sélection
+    (`analysis.with_symbol_attributes` les rejoint à la demande).
+    """
+    order = list(attributes)
+    position = {symbol: col for col, symbol in enumerate(matrix.symbols)}
+    cols = np.array([position[symbol] for symbol in order])
+    valid = matrix.valid[:, cols].T
+    counts = valid.sum(axis=1)
+    date_idx = np.nonzero(valid)[1]
+
+    def long(values: np.ndarray, dtype: type = PRICE_DTYPE) -> np.ndarray:
+        return values[:, cols].T[valid].astype(dtype)
+
+    categories = sorted(order)
+    code = {symbol: i for i, symbol in enumerate(categories)}
+    codes = np.repeat(np.array([code[symbol] for symbol in order]), counts)
+    volume = np.rint(long(matrix.volume, np.float64))
+    return pd.DataFrame(
+        {
+            "Date": matrix.dates[date_idx],
+            "Adj Close": long(matrix.adj_close),
+            "Volume": volume.astype(_volume_dtype(volume)),
+            "Symbol": pd.Categorical.from_codes(codes, categories=categories),
+            "Normalized": long(matrix.normalized()),
+        }
+    )
+
+
+@dataclass(frozen=True)
+class ExportOptions:
+    """Réglages d'écriture des artefacts de `data/processed`."""
+
+    codec: str = DEFAULT_PARQUET_CODEC  # "zstd", "lz4", "snappy", "gzip" ou "none"
+    row_group_rows: int = DEFAULT_ROW_GROUP_ROWS
+    csv: bool = False  # copies CSV de `returns` et `stats_summary`
+    threads: int = DEFAULT_EXPORT_THREADS
+
+    def params(self) -> Dict[str, object]:
+        """Ce qui change le contenu des fichiers (pour le manifeste)."""
+        return {"codec": self.codec, "row_group_rows": self.row_group_rows, "csv": self.csv}
+
+
+@dataclass
+class Artifact:
+    """Un fichier écrit : durée d'écriture, lignes, taille sur disque."""
+
+    name: str
+    seconds: float
+    rows: int
+    bytes: int
+
+
+def _write(
+    frame: pd.DataFrame, name: str, index: bool = False, options: ExportOptions = ExportOptions()
+) -> Path:
+    """Écrit `frame` dans `DATA_PROCESSED` (Parquet ou CSV selon l'extension).
+
+    Les tables longues (colonnes `Symbol` et `Date`) sont triées par ticker
+    puis date : chaque row group ne couvre que quelques tickers, et ses
+    statistiques min/max permettent d'écarter les autres à la lecture.
+    N'ouvre pas de span : appelable depuis un thread d'export.
+    """
+    path = DATA_PROCESSED / name
+    if path.suffix == ".csv":
+        frame.to_csv(path, index=index)
+        return path
+    if not index and {"Symbol", "Date"} <= set(frame.columns):
+        frame = frame.sort_values(["Symbol", "Date"], kind="stable", ignore_index=True)
+    frame.to_parquet(
+        path,
+        index=index,
+        compression=None if options.codec == "none" else options.codec,
+        row_group_size=options.row_group_rows,
+    )
+    return path
+
+
+ExportJob = Tuple[str, Callable[[], Path], int]  # (nom, écriture, lignes)
+
+
+def _frame_job(
+    frame: pd.DataFrame, name: str, options: ExportOptions, index: bool = False
+) -> ExportJob:
+    return name, functools.partial(_write, frame, name, index, options), len(frame)
+
+
+def _export(jobs: Sequence[ExportJob], options: ExportOptions) -> List[Artifact]:
+    """Écrit les artefacts en parallèle (threads : pyarrow et numpy relâchent le GIL).
+
+    Chaque écriture se chronomètre elle-même ; les spans `write <nom>` sont
+    rattachés ensuite depuis le fil principal, puis un récapitulatif
+    (durée, taille) est affiché.
+    """
+    DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+
+    def run(job: ExportJob) -> Artifact:
+        name, write, rows = job
+        start = time.perf_counter()
+        path = write()
+        return Artifact(name, time.perf_counter() - start, rows, path.stat().st_size)
+
+    threads = max(1, min(options.threads, len(jobs)))
+    with profiling.span("export"):  # durée murale ; les écritures s'y chevauchent
+        if threads == 1:
+            artifacts = [run(job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                artifacts = list(pool.map(run, jobs))
+        for artifact in artifacts:
+            profiling.record(
+                f"write {artifact.name}", artifact.seconds, rows=artifact.rows, bytes=artifact.bytes
+            )
+    for artifact in artifacts:
+        print(
+            f"    {artifact.name:<32} {artifact.seconds:>7.3f} s {artifact.bytes / 2**20:>9.2f} Mo"
+        )
+    return artifacts
+
+
+def history_files(options: ExportOptions = ExportOptions()) -> Tuple[str, ...]:
+    return HISTORY_FILES + (HISTORY_CSV_FILES if options.csv else ())
+
+
+def statistics_files(options: ExportOptions = ExportOptions()) -> Tuple[str, ...]:
+    return STATISTICS_FILES + (STATISTICS_CSV_FILES if options.csv else ())
+
+
+def _remove_stale(names: Sequence[str]) -> None:
+    """Supprime des copies qu'une exécution précédente (`--csv`) a pu laisser.
+
+    Le manifeste ne les suit plus : gardées, elles resteraient figées à
+    côté des Parquet régénérés.
+    """
+    for name in names:
+        (DATA_PROCESSED / name).unlink(missing_ok=True)
+
+
 def export_prices_and_returns(
     prices_all: pd.DataFrame,
     returns_long: pd.DataFrame,
     returns_wide: pd.DataFrame,
     returns_wide_full: pd.DataFrame,
-) -> None:
-    DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
-    prices_all.to_parquet(DATA_PROCESSED / "prices.parquet", index=False)
-    returns_long.to_parquet(DATA_PROCESSED / "returns_long.parquet", index=False)
-    returns_long.to_csv(DATA_PROCESSED / "returns.csv", index=False)
-    returns_wide.to_parquet(DATA_PROCESSED / "returns_wide.parquet")
-    returns_wide_full.to_parquet(DATA_PROCESSED / "returns_wide_full.parquet")
+    matrix: PriceMatrix,
+    options: ExportOptions = ExportOptions(),
+) -> List[Artifact]:
+    """Tables de prix/rendements et matrices mappables, toutes issues de `matrix`.
+
+    Les matrices de prix sont toujours réécrites avec les rendements : des
+    `prices_*.npy` d'une exécution précédente ne peuvent pas survivre à côté
+    d'un `returns_wide.npy` neuf (`analysis.load_price_matrix` les lit en premier).
+    """
+    jobs = [
+        _frame_job(prices_all, "prices.parquet", options),
+        _frame_job(returns_long, "returns_long.parquet", options),
+        _frame_job(returns_wide, "returns_wide.parquet", options, index=True),
+        _frame_job(returns_wide_full, "returns_wide_full.parquet", options, index=True),
+    ]
+    if options.csv:
+        jobs.append(_frame_job(returns_long, "returns.csv", options))
+    else:
+        _remove_stale(HISTORY_CSV_FILES)
+
+    # Copies binaires mappables (`src.matrix_store`) pour le dashboard
+    def matrix_job(name: str, values: np.ndarray, dates, symbols) -> ExportJob:
+        write = functools.partial(matrix_store.write_matrix, name, values, dates, symbols)
+        return f"{name}.npy", lambda: write()[0], len(dates)
+
+    jobs.append(
+        matrix_job(
+            matrix_store.RETURNS_MATRIX,
+            returns_wide.to_numpy(),
+            returns_wide.index,
+            returns_wide.columns,
+        )
+    )
+    fields = {
+        "Adj Close": matrix.adj_close,
+        "Normalized": matrix.normalized(),
+        "Volume": matrix.volume,
+    }
+    for field, name in matrix_store.PRICE_MATRICES.items():
+        jobs.append(matrix_job(name, fields[field], matrix.dates, matrix.symbols))
+
+    artifacts = _export(jobs, options)
     unique = prices_all["Symbol"].nunique()
     sessions = prices_all["Date"].nunique()
     print(f"[2/3] Prix & rendements: {unique} tickers, {sessions} séances.")
+    return artifacts
 
 
-def export_statistics() -> None:
+def export_statistics(options: ExportOptions = ExportOptions()) -> List[Artifact]:
     # Les fonctions d'analyse utilisent des caches → les vider avant recalcul
-    analysis.load_selection.cache_clear()
-    analysis.load_prices.cache_clear()
-    analysis.load_returns_long.cache_clear()
-    analysis.load_returns_wide.cache_clear()
-
-    stats = analysis.compute_descriptive_stats()
-    corr = analysis.correlation_matrix()
-    stats_path = DATA_PROCESSED / "stats_summary.parquet"
-    stats_csv = DATA_PROCESSED / "stats_summary.csv"
-    corr_path = DATA_PROCESSED / "correlation_matrix.parquet"
-
-    stats.to_parquet(stats_path, index=False)
-    stats.to_csv(stats_csv, index=False)
-    corr.to_parquet(corr_path)
+    analysis.clear_caches()
+
+    with profiling.span("statistics.descriptive"):
+        stats = analysis.compute_descriptive_stats()
+    with profiling.span("statistics.correlation"):
+        moments = pairwise.PairwiseMoments.from_returns(analysis.load_returns_wide())
+        corr = moments.correlation()
+        np.fill_diagonal(corr.values, 1.0)
+
+    jobs = [
+        _frame_job(stats, "stats_summary.parquet", options),
+        _frame_job(corr, "correlation_matrix.parquet", options, index=True),
+        # Moments deux à deux mappables : `analysis` en découpe les sous-blocs.
+        (
+            f"{matrix_store.PAIRWISE_MOMENTS}.npy",
+            lambda: moments.write()[0],
+            len(moments.symbols),
+        ),
+    ]
+    if options.csv:
+        jobs.append(_frame_job(stats, "stats_summary.csv", options))
+    else:
+        _remove_stale(STATISTICS_CSV_FILES)
+    artifacts = _export(jobs, options)
+    analysis.load_pairwise_moments.cache_clear()
     print(f"[3/3] Statistiques exportées ({len(stats)} lignes, corr {corr.shape}).")
+    return artifacts
+
+
+def rolling_file(window: int) -> str:
+    return f"rolling_{window}.parquet"
+
+
+def export_rolling_statistics(
+    windows: Sequence[int], benchmark: Optional[str], options: ExportOptions = ExportOptions()
+) -> List[Artifact]:
+    """Métriques glissantes au format long, un fichier par fenêtre."""
+    returns = analysis.load_returns_wide()
+    jobs = []
+    for window in windows:
+        with profiling.span("rolling.metrics", key=str(window)):
+            metrics = rolling.rolling_metrics(returns, window, benchmark=benchmark)
+        jobs.append(_frame_job(rolling.to_long(metrics), rolling_file(window), options))
+    artifacts = _export(jobs, options)
+    print(f"[+] Statistiques glissantes exportées (fenêtres {list(windows)}).")
+    return artifacts
 
 
-def parse_args() -> argparse.Namespace:
+def _parse_windows(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Pipeline complet : sélection + rendements + stats."
     )
@@ -348,28 +977,263 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_MAX_SYMBOLS,
         help="Nombre maximum total de tickers retenus.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Processus parallèles pour le scan des CSV (0 = tous les cœurs).",
+    )
+    parser.add_argument(
+        "--skip-ingest",
+        action="store_true",
+        help="Ne pas mettre à jour le store Parquet (lecture des CSV si absent).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore le manifeste et les caches : recalcule toutes les étapes.",
+    )
+    parser.add_argument(
+        "--frame-cache-mb",
+        type=int,
+        default=DEFAULT_FRAME_CACHE_MB,
+        help="Mémoire pour garder les historiques lus au scan (0 = désactivé).",
+    )
+    parser.add_argument(
+        "--rolling-windows",
+        type=_parse_windows,
+        default=[],
+        help=(
+            "Fenêtres (en séances) des statistiques glissantes à exporter, "
+            f"ex. {','.join(map(str, rolling.DEFAULT_WINDOWS))} (vide = aucune)."
+        ),
+    )
+    parser.add_argument(
+        "--benchmark",
+        default=None,
+        help="Ticker de référence pour le bêta glissant (doit être sélectionné).",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help=(
+            "Lit les fichiers bruts par blocs de N lignes (mémoire bornée, barres "
+            "intrajournalières agrégées par séance ; 0 = d'un bloc). Changer ce "
+            "réglage sur des données intrajournalières demande --force."
+        ),
+    )
+    parser.add_argument(
+        "--parquet-codec",
+        choices=PARQUET_CODECS,
+        default=DEFAULT_PARQUET_CODEC,
+        help="Compression des fichiers Parquet exportés.",
+    )
+    parser.add_argument(
+        "--row-group-rows",
+        type=int,
+        default=DEFAULT_ROW_GROUP_ROWS,
+        help="Lignes par row group Parquet (tables longues triées par ticker puis date).",
+    )
+    parser.add_argument(
+        "--csv",
+        action="store_true",
+        help="Exporte aussi returns.csv et stats_summary.csv.",
+    )
+    parser.add_argument(
+        "--export-threads",
+        type=int,
+        default=DEFAULT_EXPORT_THREADS,
+        help="Threads d'écriture des artefacts (1 = un par un).",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        help="Écrit un profil cProfile de l'exécution dans ce fichier (ex. run.prof).",
+    )
+    return parser.parse_args(argv)
+
+
+def _selection_data_files(selection: pd.DataFrame) -> List[Path]:
+    return [
+        DATA_RAW / data_file
+        for data_file in selection.get("DataFile", pd.Series(dtype=object)).dropna()
+    ]
 
 
 def run_pipeline(args: argparse.Namespace) -> None:
-    """Chaine les trois actes : sélection → historique → stats."""
+    """Chaine les trois actes : sélection → historique → stats.
+
+    Chaque acte est sauté si le manifeste montre que ses entrées (empreintes de
+    fichiers) et ses paramètres CLI n'ont pas changé depuis le dernier passage.
+    """
     if args.start_date >= args.end_date:
         raise ValueError("start_date doit être antérieure à end_date.")
 
-    meta = load_metadata()
-    enriched = attach_activity_stats(meta, args.end_date)
-    selection = select_top_tickers(
-        enriched,
-        top_per_bucket=args.top_per_bucket,
-        min_trading_days=args.min_trading_days,
-        max_symbols=args.max_symbols,
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    profiler = profiling.Profiler(cprofile=args.profile is not None)
+    with profiling.activate(profiler):
+        if not args.skip_ingest:
+            with profiling.span("ingest"):
+                raw_store.ingest_raw(workers=workers, chunk_rows=args.chunk_rows)
+        manifest = Manifest() if args.force else Manifest.load()
+        frames = (
+            FrameCache(
+                args.start_date,
+                args.top_per_bucket,
+                args.min_trading_days,
+                max_bytes=args.frame_cache_mb << 20,
+            )
+            if args.frame_cache_mb > 0
+            else None
+        )
+        try:
+            _run_stages(args, manifest, workers, frames)
+        finally:
+            if frames is not None:
+                frames.close()
+    print("Pipeline terminé. data/processed prêt pour le dashboard.")
+    print(profiler.table())
+    profiler.write_json(DATA_PROCESSED / PROFILE_FILE)
+    if profiler.write_cprofile(args.profile):
+        print(f"Profil cProfile : {args.profile} (python -m pstats {args.profile})")
+
+
+def _run_stages(
+    args: argparse.Namespace,
+    manifest: Manifest,
+    workers: int,
+    frames: Optional[FrameCache],
+) -> None:
+    export = ExportOptions(
+        codec=args.parquet_codec,
+        row_group_rows=args.row_group_rows,
+        csv=args.csv,
+        threads=args.export_threads,
+    )
+    # Lecture par blocs : barres intrajournalières ramenées à une par séance,
+    # d'où des séances et volumes différents de la lecture en un bloc.
+    daily_bars = bool(args.chunk_rows)
+
+    # Acte 1a : métriques d'activité (incrémental ticker par ticker)
+    activity_params = {"end_date": args.end_date.isoformat(), "daily_bars": daily_bars}
+    activity_inputs = {
+        **manifest.fingerprint_inputs("activity", {"meta": META_PATH}),
+        "raw": stat_digest(raw_store.iter_raw_files()),
+    }
+    with profiling.span("activity"):
+        if manifest.is_current("activity", activity_params, activity_inputs):
+            logger.info("Métriques d'activité inchangées, relues depuis %s", ACTIVITY_STATS_FILE)
+            enriched = pd.read_parquet(DATA_PROCESSED / ACTIVITY_STATS_FILE)
+        else:
+            cache = SummaryCache() if args.force else SummaryCache.load()
+            enriched = attach_activity_stats(
+                load_metadata(),
+                args.end_date,
+                workers=workers,
+                cache=cache,
+                frames=frames,
+                chunk_rows=args.chunk_rows,
+            )
+            enriched.to_parquet(DATA_PROCESSED / ACTIVITY_STATS_FILE, index=False)
+            manifest.record("activity", activity_params, activity_inputs, [ACTIVITY_STATS_FILE])
+
+    # Acte 1b : sélection
+    selection_params = {
+        "top_per_bucket": args.top_per_bucket,
+        "min_trading_days": args.min_trading_days,
+        "max_symbols": args.max_symbols,
+    }
+    selection_inputs = manifest.fingerprint_inputs(
+        "selection", {"activity": DATA_PROCESSED / ACTIVITY_STATS_FILE}
     )
-    prices_all, returns_long, returns_wide, returns_wide_full = (
-        build_price_and_return_tables(selection, args.start_date, args.end_date)
+    with profiling.span("selection"):
+        if manifest.is_current("selection", selection_params, selection_inputs):
+            selection = pd.read_csv(DATA_PROCESSED / SELECTION_FILE)
+            print(f"[1/3] Sélection inchangée: {len(selection)} tickers.")
+        else:
+            selection = select_top_tickers(enriched, **selection_params)
+            manifest.record("selection", selection_params, selection_inputs, [SELECTION_FILE])
+
+    # Acte 2 : historiques de prix et rendements
+    history_params = {
+        "start_date": args.start_date.isoformat(),
+        "end_date": args.end_date.isoformat(),
+        "daily_bars": daily_bars,
+        **export.params(),
+    }
+    history_inputs = {
+        **manifest.fingerprint_inputs(
+            "history", {"selection": DATA_PROCESSED / SELECTION_FILE}
+        ),
+        "raw": stat_digest(_selection_data_files(selection)),
+    }
+    with profiling.span("history"):
+        if manifest.is_current(
+            "history", history_params, history_inputs, history_files(export)
+        ):
+            print("[2/3] Prix & rendements inchangés.")
+        else:
+            matrix, attributes = build_price_matrix(
+                selection, args.start_date, args.end_date, frames=frames, chunk_rows=args.chunk_rows
+            )
+            with profiling.span("history.tables"):
+                prices_all, returns_long, returns_wide, returns_wide_full = (
+                    price_and_return_tables(matrix, attributes)
+                )
+            export_prices_and_returns(
+                prices_all,
+                returns_long,
+                returns_wide,
+                returns_wide_full,
+                matrix=matrix,
+                options=export,
+            )
+            manifest.record("history", history_params, history_inputs, history_files(export))
+
+    # Acte 3 : statistiques
+    statistics_inputs = manifest.fingerprint_inputs(
+        "statistics",
+        {
+            name: DATA_PROCESSED / name
+            for name in (SELECTION_FILE, "prices.parquet", "returns_wide.parquet")
+        },
     )
-    export_prices_and_returns(prices_all, returns_long, returns_wide, returns_wide_full)
-    export_statistics()
-    print("Pipeline terminé. data/processed prêt pour le dashboard.")
+    statistics_params = export.params()
+    with profiling.span("statistics"):
+        if manifest.is_current(
+            "statistics", statistics_params, statistics_inputs, statistics_files(export)
+        ):
+            print("[3/3] Statistiques inchangées.")
+        else:
+            export_statistics(export)
+            manifest.record(
+                "statistics", statistics_params, statistics_inputs, statistics_files(export)
+            )
+
+    # Optionnel : statistiques glissantes
+    if args.rolling_windows:
+        rolling_params = {
+            "windows": args.rolling_windows,
+            "benchmark": args.benchmark,
+            "codec": export.codec,
+            "row_group_rows": export.row_group_rows,
+        }
+        rolling_inputs = manifest.fingerprint_inputs(
+            "rolling", {"returns": DATA_PROCESSED / "returns_wide.parquet"}
+        )
+        with profiling.span("rolling"):
+            if manifest.is_current("rolling", rolling_params, rolling_inputs):
+                print("[+] Statistiques glissantes inchangées.")
+            else:
+                export_rolling_statistics(args.rolling_windows, args.benchmark, export)
+                manifest.record(
+                    "rolling",
+                    rolling_params,
+                    rolling_inputs,
+                    [rolling_file(window) for window in args.rolling_windows],
+                )
 
 
 def main() -> None:
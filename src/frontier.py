@@ -0,0 +1,178 @@
+"""Résolution exacte du QP de Markowitz à bornes, réutilisable d'une cible à l'autre.
+
+Problème : min w'Σw  sous  A w = b  et  l ≤ w ≤ u
+(A = [1, μ] pour la frontière : budget et rendement cible ; l = 0 sans vente
+à découvert, u = plafond par ligne).
+
+Méthode des ensembles actifs primal-dual : on devine quels poids sont collés
+à une borne, on résout le système KKT restreint aux poids libres, puis on
+corrige la devinette à partir des multiplicateurs. Le long de la frontière,
+l'ensemble actif ne change qu'aux « points critiques » : en repartant de celui
+de la cible précédente, une ou deux résolutions d'un petit système linéaire
+suffisent par point.
+
+Avec une covariance facteurs + diagonale (Σ = B Bᵀ + diag(d), voir
+`src.risk_model`), le système restreint est résolu par Woodbury en
+O(N k²) au lieu de O(N³) : quelques millisecondes même pour N = 1000.
+
+Quand la méthode ne conclut pas (système singulier, cycle), `solve_box_qp`
+renvoie None et l'appelant retombe sur cvxpy. Une cible au-delà de
+`max_return` n'a pas de solution : l'appelant la rejette avant.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from . import metrics
+
+
+FREE, LOWER, UPPER = 0, 1, 2
+MAX_ITERATIONS = 50
+
+
+Factor = Tuple[np.ndarray, np.ndarray]
+KktSolver = Callable[[np.ndarray, np.ndarray], Optional[Tuple[np.ndarray, np.ndarray]]]
+
+
+def _dense_kkt(cov: np.ndarray, A: np.ndarray, b: np.ndarray) -> KktSolver:
+    def solve(free: np.ndarray, w: np.ndarray):
+        fixed = ~free
+        k, m = int(free.sum()), len(b)
+        kkt = np.zeros((k + m, k + m))
+        kkt[:k, :k] = cov[np.ix_(free, free)]
+        kkt[:k, k:] = A[:, free].T
+        kkt[k:, :k] = A[:, free]
+        rhs = np.concatenate(
+            [-cov[np.ix_(free, fixed)] @ w[fixed], b - A[:, fixed] @ w[fixed]]
+        )
+        try:
+            solution = np.linalg.solve(kkt, rhs)
+        except np.linalg.LinAlgError:
+            return None
+        return solution[:k], solution[k:]
+
+    return solve
+
+
+def _factor_kkt(factor: Factor, A: np.ndarray, b: np.ndarray) -> KktSolver:
+    exposures, specific = factor
+
+    def solve(free: np.ndarray, w: np.ndarray):
+        fixed = ~free
+        B, d = exposures[free], specific[free]
+        # (D + B Bᵀ)⁻¹ par Woodbury : seul un système k × k est factorisé.
+        inner = np.eye(B.shape[1]) + B.T @ (B / d[:, None])
+
+        def inverse(v: np.ndarray) -> np.ndarray:
+            scaled = v / d[:, None]
+            return scaled - (B @ np.linalg.solve(inner, B.T @ scaled)) / d[:, None]
+
+        coupling = B @ (exposures[fixed].T @ w[fixed])  # Σ_FB w_B (D est diagonale)
+        A_free = A[:, free]
+        try:
+            base = inverse(-coupling[:, None])[:, 0]
+            spread = inverse(A_free.T)
+            lam = np.linalg.solve(A_free @ spread, A_free @ base - (b - A[:, fixed] @ w[fixed]))
+        except np.linalg.LinAlgError:
+            return None
+        return base - spread @ lam, lam
+
+    return solve
+
+
+def _factor_matvec(factor: Factor) -> Callable[[np.ndarray], np.ndarray]:
+    exposures, specific = factor
+
+    def matvec(v: np.ndarray) -> np.ndarray:
+        return exposures @ (exposures.T @ v) + specific * v
+
+    return matvec
+
+
+def max_return_weights(
+    mean: np.ndarray, lower: np.ndarray, upper: np.ndarray
+) -> Optional[np.ndarray]:
+    """Poids de rendement μ'w maximal sous Σw = 1 et l ≤ w ≤ u (glouton, exact ici).
+
+    On part des bornes basses, puis on remplit les titres par μ décroissant
+    jusqu'à leur borne haute. None si la vente à découvert est illimitée
+    (rendement non borné) ou si les bornes ne permettent pas Σw = 1.
+    """
+    if not np.isfinite(lower).all():
+        return None
+    weights = lower.astype(float).copy()
+    budget = 1.0 - weights.sum()
+    for i in np.argsort(-mean, kind="stable"):
+        if budget <= 0:
+            break
+        step = min(upper[i] - weights[i], budget)
+        weights[i] += step
+        budget -= step
+    return weights if budget <= 1e-12 else None
+
+
+def max_return(mean: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> float:
+    """Rendement de `max_return_weights` ; +inf sans borne basse, NaN si bornes infaisables."""
+    if not np.isfinite(lower).all():
+        return float("inf")
+    weights = max_return_weights(mean, lower, upper)
+    return float("nan") if weights is None else float(mean @ weights)
+
+
+def solve_box_qp(
+    cov: np.ndarray,
+    A: np.ndarray,
+    b: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    state: Optional[np.ndarray] = None,
+    factor: Optional[Factor] = None,
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Poids optimaux et ensemble actif final (FREE/LOWER/UPPER par poids), ou None.
+
+    `state` est l'ensemble actif de départ (typiquement celui du point voisin) ;
+    `factor` = (B, d) si `cov` vaut B Bᵀ + diag(d).
+    """
+    n = len(cov)
+    state = np.full(n, FREE, dtype=np.int8) if state is None else state.copy()
+    if factor is None:
+        solve, matvec = _dense_kkt(cov, A, b), cov.__matmul__
+    else:
+        solve, matvec = _factor_kkt(factor, A, b), _factor_matvec(factor)
+    # Ramène multiplicateurs (∼ Σw) et écarts aux bornes (∼ w) à la même échelle.
+    scale = float(np.mean(np.diag(cov)))
+    iterations = 0
+    try:
+        seen = set()
+        for iterations in range(1, MAX_ITERATIONS + 1):
+            key = state.tobytes()
+            if key in seen:
+                return None
+            seen.add(key)
+
+            free = state == FREE
+            w = np.where(state == LOWER, lower, np.where(state == UPPER, upper, 0.0))
+            if not np.isfinite(w[~free]).all():
+                return None
+            result = solve(free, w)
+            if result is None or not all(np.isfinite(part).all() for part in result):
+                return None
+            w[free], lam = result
+            # Gradient du lagrangien : multiplicateur de borne des poids fixés
+            # (> 0 en borne basse, < 0 en borne haute à l'optimum).
+            z = matvec(w) + A.T @ lam
+            z[free] = 0.0
+
+            with np.errstate(invalid="ignore"):
+                to_lower = z - scale * (w - lower) > 0
+                to_upper = z + scale * (upper - w) < 0
+            new_state = np.where(to_lower, LOWER, np.where(to_upper, UPPER, FREE)).astype(np.int8)
+            if np.array_equal(new_state, state):
+                return w, state
+            state = new_state
+        return None
+    finally:
+        metrics.SOLVER_ITERATIONS.observe(iterations, solver="active_set")
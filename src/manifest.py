@@ -0,0 +1,246 @@
+"""Manifeste du pipeline : savoir ce qui a déjà été calculé, et à partir de quoi.
+
+`data/processed/manifest.json` garde, pour chaque étape, les paramètres CLI
+utilisés, l'empreinte de ses entrées et la liste de ses sorties. Une étape dont
+rien n'a bougé est sautée.
+
+Empreinte d'un fichier = (mtime, taille, hash). Le hash n'est recalculé que si
+mtime ou taille changent : un simple `touch` n'invalide donc rien. Les milliers
+de CSV bruts ne sont, eux, suivis que par (mtime, taille) : les hasher coûterait
+autant que de les relire.
+
+Les résumés d'activité par ticker ont leur propre cache (`SummaryCache`) pour
+ne recalculer que les fichiers bruts modifiés.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional
+
+import pandas as pd
+
+try:  # pragma: no cover
+    from .paths import DATA_PROCESSED, DATA_RAW
+except ImportError:  # pragma: no cover
+    from paths import DATA_PROCESSED, DATA_RAW
+
+
+MANIFEST_PATH = DATA_PROCESSED / "manifest.json"
+SUMMARY_CACHE_PATH = DATA_PROCESSED / "activity_cache.parquet"
+HASH_CHUNK_SIZE = 1 << 20
+
+Fingerprint = Dict[str, object]
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(path: Path, previous: Optional[Fingerprint] = None) -> Fingerprint:
+    """Empreinte (mtime, taille, hash), en réutilisant le hash si rien n'a bougé."""
+    st = path.stat()
+    if (
+        previous
+        and previous.get("mtime_ns") == st.st_mtime_ns
+        and previous.get("size") == st.st_size
+    ):
+        return dict(previous)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "hash": file_hash(path)}
+
+
+def stat_digest(paths: Iterable[Path]) -> str:
+    """Empreinte légère (mtime, taille) d'un ensemble de fichiers bruts."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(paths):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        digest.update(f"{path.relative_to(DATA_RAW)}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def _same_inputs(recorded: Mapping[str, object], current: Mapping[str, object]) -> bool:
+    if recorded.keys() != current.keys():
+        return False
+    for key, value in current.items():
+        old = recorded[key]
+        if isinstance(value, dict) and isinstance(old, dict):
+            if value.get("hash") != old.get("hash"):
+                return False
+        elif value != old:
+            return False
+    return True
+
+
+class Manifest:
+    """Registre JSON des étapes : paramètres, entrées, sorties."""
+
+    def __init__(self, path: Path = MANIFEST_PATH, stages: Optional[dict] = None):
+        self.path = path
+        self.stages: Dict[str, dict] = stages or {}
+
+    @classmethod
+    def load(cls, path: Path = MANIFEST_PATH) -> "Manifest":
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(path)
+        return cls(path, data.get("stages", {}))
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"stages": self.stages}, fh, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def previous_fingerprint(self, stage: str, key: str) -> Optional[Fingerprint]:
+        value = self.stages.get(stage, {}).get("inputs", {}).get(key)
+        return value if isinstance(value, dict) else None
+
+    def fingerprint_inputs(self, stage: str, files: Mapping[str, Path]) -> Dict[str, Fingerprint]:
+        return {
+            key: fingerprint(path, self.previous_fingerprint(stage, key))
+            for key, path in files.items()
+        }
+
+    def is_current(
+        self,
+        stage: str,
+        params: Mapping[str, object],
+        inputs: Mapping[str, object],
+        outputs: Optional[Iterable[str]] = None,
+    ) -> bool:
+        """Vrai si paramètres et entrées sont inchangés et les sorties présentes.
+
+        `outputs` : sorties attendues aujourd'hui (par défaut, celles de la
+        dernière exécution) ; un fichier ajouté à une étape la fait rejouer.
+        """
+        entry = self.stages.get(stage)
+        if not entry or entry.get("params") != dict(params):
+            return False
+        if not _same_inputs(entry.get("inputs", {}), inputs):
+            return False
+        expected = entry.get("outputs", []) if outputs is None else outputs
+        return all((DATA_PROCESSED / name).exists() for name in expected)
+
+    def record(
+        self,
+        stage: str,
+        params: Mapping[str, object],
+        inputs: Mapping[str, object],
+        outputs: Iterable[str],
+    ) -> None:
+        self.stages[stage] = {
+            "params": dict(params),
+            "inputs": dict(inputs),
+            "outputs": list(outputs),
+        }
+        self.save()
+
+
+class SummaryCache:
+    """Résumés d'activité par (ticker, fichier), valides tant que le CSV ne change pas.
+
+    Une entrée vide (`Empty`) mémorise aussi les fichiers sans donnée exploitable,
+    pour ne pas les relire à chaque exécution. `DailyBars` note le mode de
+    lecture : par blocs (`--chunk-rows`), les barres intrajournalières sont
+    ramenées à une par séance, et les résumés d'un mode ne valent pas pour l'autre.
+    """
+
+    COLUMNS = [
+        "Symbol",
+        "DataFile",
+        "MtimeNs",
+        "Size",
+        "EndDate",
+        "DailyBars",
+        "Empty",
+        "TotalVolume",
+        "AverageVolume",
+        "TradingDays",
+        "FirstDate",
+        "LastDate",
+    ]
+    PROFILE_COLUMNS = ["TotalVolume", "AverageVolume", "TradingDays", "FirstDate", "LastDate"]
+
+    def __init__(self, path: Path = SUMMARY_CACHE_PATH):
+        self.path = path
+        self.entries: Dict[tuple, dict] = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path = SUMMARY_CACHE_PATH) -> "SummaryCache":
+        cache = cls(path)
+        if path.exists():
+            for record in pd.read_parquet(path).to_dict("records"):
+                cache.entries[(record["Symbol"], record["DataFile"])] = record
+        return cache
+
+    @staticmethod
+    def _stat(data_file: str) -> os.stat_result:
+        return (DATA_RAW / data_file).stat()
+
+    def get(
+        self, symbol: str, data_file: str, end_date: str, daily_bars: bool = False
+    ) -> Optional[dict]:
+        """Entrée valide ou None. Une entrée valide peut être vide (`Empty`)."""
+        entry = self.entries.get((symbol, data_file))
+        if entry is None or entry["EndDate"] != end_date:
+            return None
+        if entry.get("DailyBars") != daily_bars:
+            return None
+        st = self._stat(data_file)
+        if entry["MtimeNs"] != st.st_mtime_ns or entry["Size"] != st.st_size:
+            return None
+        return entry
+
+    def put(
+        self,
+        symbol: str,
+        data_file: str,
+        end_date: str,
+        profile: Optional[dict],
+        daily_bars: bool = False,
+    ) -> None:
+        st = self._stat(data_file)
+        entry = {
+            "Symbol": symbol,
+            "DataFile": data_file,
+            "MtimeNs": st.st_mtime_ns,
+            "Size": st.st_size,
+            "EndDate": end_date,
+            "DailyBars": daily_bars,
+            "Empty": profile is None,
+        }
+        for column in self.PROFILE_COLUMNS:
+            entry[column] = None if profile is None else profile[column]
+        self.entries[(symbol, data_file)] = entry
+        self.dirty = True
+
+    def profile(self, entry: dict) -> Optional[dict]:
+        """Reconstitue le dict `SymbolProfile.to_dict()` d'une entrée."""
+        if entry["Empty"]:
+            return None
+        profile = {"Symbol": entry["Symbol"], "DataFile": entry["DataFile"]}
+        profile.update({column: entry[column] for column in self.PROFILE_COLUMNS})
+        profile["TradingDays"] = int(profile["TradingDays"])
+        return profile
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        frame = pd.DataFrame(list(self.entries.values()), columns=self.COLUMNS)
+        tmp = self.path.with_suffix(".parquet.tmp")
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, self.path)
+        self.dirty = False
@@ -0,0 +1,122 @@
+"""Matrices (séances × tickers) en binaire brut, lues par mmap.
+
+Chaque matrice `<nom>` tient en deux fichiers dans `data/processed/` :
+- `<nom>.npy` : tableau float64 stocké colonne par colonne (ordre Fortran),
+  pour qu'extraire quelques tickers ne touche que leurs pages ;
+- `<nom>.json` : petit index annexe (dates ISO, tickers, forme).
+
+Les workers Dash s'y attachent avec `np.load(mmap_mode="r")` : aucune copie,
+les pages sont partagées par le cache du système, et le démarrage ne dépend
+plus de la taille du jeu de données.
+
+Les piles de matrices (tickers × tickers), comme les moments deux à deux de
+`src.pairwise`, suivent le même schéma : `<nom>.npy` de forme
+(champs, N, N) et un index listant tickers et champs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:  # pragma: no cover
+    from .paths import DATA_PROCESSED
+except ImportError:  # pragma: no cover
+    from paths import DATA_PROCESSED
+
+
+RETURNS_MATRIX = "returns_wide"
+PRICE_MATRICES = {
+    "Adj Close": "prices_adj_close",
+    "Normalized": "prices_normalized",
+    "Volume": "prices_volume",
+}
+PAIRWISE_MOMENTS = "pairwise_moments"
+
+
+def matrix_files(name: str) -> Tuple[Path, Path]:
+    return DATA_PROCESSED / f"{name}.npy", DATA_PROCESSED / f"{name}.json"
+
+
+def write_matrix(
+    name: str, values: np.ndarray, dates: Sequence, symbols: Sequence[str]
+) -> Tuple[Path, Path]:
+    """Écrit la matrice et son index."""
+    values = np.asfortranarray(values, dtype=np.float64)
+    index = {
+        "dates": pd.DatetimeIndex(dates).strftime("%Y-%m-%d").tolist(),
+        "symbols": [str(symbol) for symbol in symbols],
+        "shape": list(values.shape),
+    }
+    if values.shape != (len(index["dates"]), len(index["symbols"])):
+        raise ValueError(f"Forme incohérente pour {name}: {values.shape}")
+    return _replace_files(name, values, index)
+
+
+def _replace_files(name: str, values: np.ndarray, index: dict) -> Tuple[Path, Path]:
+    """Remplacement atomique des deux fichiers (données puis index)."""
+    data_path, index_path = matrix_files(name)
+    tmp_data = data_path.with_suffix(".npy.tmp")
+    with open(tmp_data, "wb") as fh:
+        np.save(fh, values)
+    tmp_index = index_path.with_suffix(".json.tmp")
+    with open(tmp_index, "w", encoding="utf-8") as fh:
+        json.dump(index, fh)
+    os.replace(tmp_data, data_path)
+    os.replace(tmp_index, index_path)
+    return data_path, index_path
+
+
+def attach_matrix(name: str) -> Optional[pd.DataFrame]:
+    """DataFrame (Date × Symbol) adossé au fichier mappé, ou None s'il manque.
+
+    Le tableau est en lecture seule : toute transformation produit une copie,
+    jamais une écriture dans le fichier partagé.
+    """
+    data_path, index_path = matrix_files(name)
+    if not (data_path.exists() and index_path.exists()):
+        return None
+    with open(index_path, encoding="utf-8") as fh:
+        index = json.load(fh)
+    values = np.load(data_path, mmap_mode="r")
+    if list(values.shape) != index["shape"]:
+        return None
+    return pd.DataFrame(
+        values,
+        index=pd.DatetimeIndex(pd.to_datetime(index["dates"]), name="Date"),
+        columns=pd.Index(index["symbols"], name="Symbol"),
+        copy=False,
+    )
+
+
+def write_stack(
+    name: str, fields: Dict[str, np.ndarray], symbols: Sequence[str]
+) -> Tuple[Path, Path]:
+    """Écrit des matrices carrées (tickers × tickers) empilées, une par champ."""
+    values = np.stack([np.asarray(field, dtype=np.float64) for field in fields.values()])
+    index = {
+        "fields": list(fields),
+        "symbols": [str(symbol) for symbol in symbols],
+        "shape": list(values.shape),
+    }
+    if values.shape[1:] != (len(index["symbols"]),) * 2:
+        raise ValueError(f"Forme incohérente pour {name}: {values.shape}")
+    return _replace_files(name, values, index)
+
+
+def attach_stack(name: str) -> Optional[Tuple[Dict[str, np.ndarray], List[str]]]:
+    """Champs (vues mappées en lecture seule) et tickers, ou None si absents."""
+    data_path, index_path = matrix_files(name)
+    if not (data_path.exists() and index_path.exists()):
+        return None
+    with open(index_path, encoding="utf-8") as fh:
+        index = json.load(fh)
+    values = np.load(data_path, mmap_mode="r")
+    if list(values.shape) != index["shape"]:
+        return None
+    return dict(zip(index["fields"], values)), index["symbols"]
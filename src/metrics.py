@@ -0,0 +1,207 @@
+"""Métriques au format texte Prometheus, sans dépendance externe.
+
+Trois types, comme dans `prometheus_client` :
+- `Counter` : total qui ne fait que croître (`inc`) ;
+- `Gauge` : valeur instantanée (`set`) ;
+- `Histogram` : distribution par seaux cumulés, plus somme et nombre (`observe`).
+
+Chaque métrique a des étiquettes fixes, passées en mots-clés :
+
+    LATENCY.observe(0.12, callback="update_frontier")
+
+`REGISTRY.render()` produit le texte servi sur `/metrics`. Les collecteurs
+(`REGISTRY.collector`) calculent des métriques au moment du scrape, pour les
+compteurs qui vivent ailleurs (caches…).
+
+Les valeurs sont propres au processus : avec plusieurs workers (gunicorn),
+chaque worker expose les siennes.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = tuple(float(1 << shift) for shift in range(10, 25, 2))  # 1 Kio → 16 Mio
+ITERATION_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelKey:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name}: étiquettes attendues {self.labels}, reçues {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """(suffixe, noms d'étiquettes, valeurs, mesure) de chaque ligne exposée."""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, names, values, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", self.labels, key, value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # par jeu d'étiquettes : [compte par seau (non cumulé)…, somme, nombre]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        names = self.labels + ("le",)
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                yield "_bucket", names, key + (_format_value(bound),), cumulative
+            yield "_sum", self.labels, key, state[-2]
+            yield "_count", self.labels, key, state[-1]
+
+
+class Registry:
+    """Ensemble des métriques exposées par le processus."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Enregistre `metric` ; renvoie celle déjà connue sous ce nom le cas échéant."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def collector(self, func: Callable[[], Iterable[Metric]]) -> Callable[[], Iterable[Metric]]:
+        """Décorateur : `func` fournit des métriques fraîches à chaque scrape."""
+        with self._lock:
+            self._collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for collect in collectors:
+            metrics.extend(collect())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help, labels))
+
+
+def gauge(name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, help, labels))
+
+
+def histogram(
+    name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labels, buckets))
+
+
+# Partagées par l'analyse et le dashboard.
+SOLVER_ITERATIONS = histogram(
+    "trabbids_solver_iterations",
+    "Itérations par résolution de portefeuille.",
+    ["solver"],
+    buckets=ITERATION_BUCKETS,
+)
+SOLVER_FALLBACKS = counter(
+    "trabbids_solver_fallbacks_total",
+    "Résolutions où le solveur exact n'a pas conclu (secours cvxpy).",
+)
@@ -0,0 +1,130 @@
+"""Moments deux à deux de tout l'univers, calculés une fois, servis par sous-blocs.
+
+`DataFrame.corr()` / `.cov()` travaillent sur les séances communes à chaque
+couple de tickers (« pairwise complete ») : pour un couple (i, j), seules
+comptent les séances où i et j sont cotés. `PairwiseMoments` garde, pour tous
+les couples :
+
+- `count[i, j]` : nombre de séances communes ;
+- `mean[i, j]` : moyenne de i sur ces séances ;
+- `var[i, j]` : variance (ddof=1) de i sur ces séances ;
+- `cov[i, j]` : covariance (ddof=1) de i et j sur ces séances.
+
+Toute sélection se sert alors par découpe (`block`) : corrélation et
+covariance sont celles de pandas sur la sélection, sans repasser sur les
+rendements. Le pipeline les exporte en `pairwise_moments.npy` (voir
+`src.matrix_store`), que le dashboard mappe sans copie.
+
+Quand tous les comptes d'un bloc sont égaux, tous ses tickers sont cotés sur
+les mêmes séances : les moments deux à deux sont alors ceux des rendements
+sans trou (`dropna`) et peuvent nourrir le modèle de Markowitz (`listwise`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:  # pragma: no cover
+    from . import matrix_store
+except ImportError:  # pragma: no cover
+    import matrix_store
+
+
+FIELDS = ("count", "mean", "var", "cov")
+
+
+@dataclass
+class PairwiseMoments:
+    symbols: List[str]
+    count: np.ndarray
+    mean: np.ndarray
+    var: np.ndarray
+    cov: np.ndarray
+
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame) -> "PairwiseMoments":
+        """Moments de toutes les colonnes de `returns` (séances × tickers, NaN = non coté)."""
+        values = returns.to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        mask = valid.astype(float)
+        count = mask.T @ mask
+        # Décalage par la moyenne de chaque ticker : sommes de petits nombres,
+        # moins de pertes de précision dans Σxy - ΣxΣy/n.
+        with np.errstate(invalid="ignore"):
+            shift = np.nan_to_num(np.nanmean(np.where(valid, values, np.nan), axis=0))
+        filled = np.where(valid, values - shift, 0.0)
+        sum_x = filled.T @ mask  # sum_x[i, j] : Σ x_i sur les séances où j est coté
+        sum_xx = (filled * filled).T @ mask
+        sum_xy = filled.T @ filled
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = shift[:, None] + sum_x / count
+            var = np.clip((sum_xx - sum_x * sum_x / count) / (count - 1), 0.0, None)
+            cov = (sum_xy - sum_x * sum_x.T / count) / (count - 1)
+        enough = count >= 2
+        return cls(
+            [str(symbol) for symbol in returns.columns],
+            count,
+            np.where(count >= 1, mean, np.nan),
+            np.where(enough, var, np.nan),
+            np.where(enough, cov, np.nan),
+        )
+
+    @classmethod
+    def load(cls, name: str = matrix_store.PAIRWISE_MOMENTS) -> Optional["PairwiseMoments"]:
+        """Moments exportés par le pipeline (mappés), ou None s'ils manquent."""
+        stored = matrix_store.attach_stack(name)
+        if stored is None:
+            return None
+        fields, symbols = stored
+        if set(FIELDS) - set(fields):
+            return None
+        return cls(symbols, *(fields[field] for field in FIELDS))
+
+    def write(self, name: str = matrix_store.PAIRWISE_MOMENTS) -> Tuple:
+        return matrix_store.write_stack(
+            name, {field: getattr(self, field) for field in FIELDS}, self.symbols
+        )
+
+    def covers(self, symbols: Sequence[str]) -> bool:
+        known = set(self.symbols)
+        return all(symbol in known for symbol in symbols)
+
+    def block(self, symbols: Sequence[str]) -> "PairwiseMoments":
+        """Sous-bloc des `symbols`, dans cet ordre (KeyError si un ticker manque)."""
+        position = {symbol: i for i, symbol in enumerate(self.symbols)}
+        missing = [symbol for symbol in symbols if symbol not in position]
+        if missing:
+            raise KeyError(f"Tickers inconnus: {missing}")
+        idx = np.array([position[symbol] for symbol in symbols], dtype=np.intp)
+        rows = np.ix_(idx, idx)
+        return PairwiseMoments(
+            list(symbols),
+            *(np.array(getattr(self, field)[rows]) for field in FIELDS),
+        )
+
+    def covariance(self) -> pd.DataFrame:
+        """Comme `DataFrame.cov()` sur les mêmes colonnes."""
+        return pd.DataFrame(self.cov, index=self.symbols, columns=self.symbols)
+
+    def correlation(self) -> pd.DataFrame:
+        """Comme `DataFrame.corr()` sur les mêmes colonnes."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = self.cov / np.sqrt(self.var * self.var.T)
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=self.symbols, columns=self.symbols)
+
+    def listwise(self) -> Optional[Tuple[int, np.ndarray, np.ndarray]]:
+        """(séances, moyennes, covariance) des rendements sans trou, si le bloc le permet.
+
+        Uniquement quand tous les tickers partagent exactement les mêmes
+        séances (comptes tous égaux) ; None sinon.
+        """
+        if not self.count.size:
+            return None
+        sessions = self.count.min()
+        if sessions < 2 or self.count.max() != sessions:
+            return None
+        return int(sessions), np.diag(self.mean).copy(), self.cov.copy()
@@ -1,11 +1,18 @@
+import os
 from pathlib import Path
 
 ROOT = Path(__file__).parent.parent
 
-DATA_RAW = ROOT / 'data' / 'raw'
+# racine des données ; TRABBIDS_DATA=/chemin pour travailler ailleurs (benchmarks, jeux synthétiques)
+DATA = Path(os.environ.get('TRABBIDS_DATA', ROOT / 'data'))
 
-DATA_PROCESSED = ROOT / 'data' / 'processed'
+DATA_RAW = DATA / 'raw'
+
+DATA_PROCESSED = DATA / 'processed'
+
+# copie typée (Parquet, un fichier par ticker) de DATA_RAW
+DATA_STORE = DATA / 'store'
 
 # ensure all directories we'll write to here
-for d in (DATA_PROCESSED,):
+for d in (DATA_PROCESSED, DATA_STORE):
     d.mkdir(parents=True, exist_ok=True)
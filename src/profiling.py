@@ -0,0 +1,224 @@
+"""Instrumentation du pipeline : durées imbriquées, mémoire, volumes traités.
+
+Le code instrumenté ouvre des « spans » nommés :
+
+    with profiling.span("history.read", key=symbol) as s:
+        df = ...
+        s.add(rows=len(df))
+
+- Sans profiler actif, `span` ne fait rien (coût d'un appel de fonction) :
+  les modules peuvent s'instrumenter sans condition.
+- Les spans ouverts dans un span deviennent ses enfants ; ceux de même nom
+  sous un même parent sont fusionnés (appels, total, max, clé la plus lente).
+  Un span par ticker reste ainsi lisible sur des milliers de tickers.
+- Chaque span note le pic de mémoire résidente (RSS) du processus à sa
+  sortie, et de combien il l'a fait monter.
+
+Les travaux envoyés à un pool de processus ne remontent que comme un tout
+(le span du parent) : `--workers 1` donne le détail par fichier. Ceux d'un
+pool de threads se chronomètrent eux-mêmes et sont rattachés après coup
+depuis le fil principal (`record`).
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:  # pragma: no cover - absent sous Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+def peak_rss() -> int:
+    """Pic de mémoire résidente (octets) du processus et de ses enfants terminés."""
+    if resource is None:
+        return 0
+    # ru_maxrss : kilo-octets sous Linux, octets sous macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) * unit
+
+
+@dataclass
+class Span:
+    """Durées cumulées d'un nom de span sous un parent donné."""
+
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    slowest: Optional[str] = None
+    rows: int = 0
+    bytes: int = 0
+    peak_rss: int = 0
+    rss_growth: int = 0
+    children: Dict[str, "Span"] = field(default_factory=dict)
+
+    def add(self, rows: int = 0, bytes: int = 0, path: Optional[Path] = None) -> None:
+        """Volumes traités ; `path` ajoute la taille du fichier écrit ou lu."""
+        self.rows += int(rows)
+        self.bytes += int(bytes)
+        if path is not None:
+            self.bytes += Path(path).stat().st_size
+
+    def child(self, name: str) -> "Span":
+        if name not in self.children:
+            self.children[name] = Span(name)
+        return self.children[name]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "seconds": round(self.seconds, 6),
+            "max_seconds": round(self.max_seconds, 6),
+            "slowest": self.slowest,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "peak_rss": self.peak_rss,
+            "rss_growth": self.rss_growth,
+            "children": [child.to_dict() for child in self.children.values()],
+        }
+
+
+class _NullSpan:
+    """Remplaçant de `Span` quand aucun profiler n'est actif."""
+
+    def add(self, rows: int = 0, bytes: int = 0, path: Optional[Path] = None) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """Arbre de spans d'une exécution, avec cProfile en option.
+
+    Pas thread-safe : un profiler suit un seul fil d'exécution (le pipeline).
+    """
+
+    def __init__(self, name: str = "pipeline", cprofile: bool = False) -> None:
+        self.root = Span(name)
+        self._stack: List[Span] = [self.root]
+        self._started = time.perf_counter()
+        self._rss_start = peak_rss()
+        self.cprofile = cProfile.Profile() if cprofile else None
+
+    @contextmanager
+    def span(self, name: str, key: Optional[str] = None) -> Iterator[Span]:
+        node = self._stack[-1].child(name)
+        self._stack.append(node)
+        rss_before = peak_rss()
+        start = time.perf_counter()
+        try:
+            yield node
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            node.calls += 1
+            node.seconds += elapsed
+            if elapsed > node.max_seconds:
+                node.max_seconds = elapsed
+                node.slowest = key
+            node.peak_rss = peak_rss()
+            node.rss_growth += node.peak_rss - rss_before
+
+    def record(
+        self, name: str, seconds: float, rows: int = 0, bytes: int = 0, key: Optional[str] = None
+    ) -> None:
+        """Ajoute au span courant un enfant chronométré ailleurs (dans un thread)."""
+        node = self._stack[-1].child(name)
+        node.calls += 1
+        node.seconds += seconds
+        if seconds > node.max_seconds:
+            node.max_seconds = seconds
+            node.slowest = key
+        node.add(rows=rows, bytes=bytes)
+        node.peak_rss = peak_rss()
+
+    def finish(self) -> Span:
+        root = self.root
+        root.calls = 1
+        root.seconds = root.max_seconds = time.perf_counter() - self._started
+        root.peak_rss = peak_rss()
+        root.rss_growth = root.peak_rss - self._rss_start
+        return root
+
+    def table(self) -> str:
+        """Résumé lisible : un span par ligne, indenté selon l'imbrication."""
+        header = (
+            f"{'span':<40} {'appels':>7} {'total s':>9} {'%':>6} {'max s':>8} "
+            f"{'lignes':>11} {'Mo':>9} {'pic RSS Mo':>11}"
+        )
+        lines = [header, "-" * len(header)]
+        total = self.root.seconds or 1.0
+
+        def walk(node: Span, depth: int) -> None:
+            label = ("  " * depth + node.name)[:40]
+            lines.append(
+                f"{label:<40} {node.calls:>7} {node.seconds:>9.3f} "
+                f"{100 * node.seconds / total:>5.1f}% {node.max_seconds:>8.3f} "
+                f"{node.rows:>11} {node.bytes / 2**20:>9.1f} {node.peak_rss / 2**20:>11.1f}"
+            )
+            for child in sorted(node.children.values(), key=lambda c: -c.seconds):
+                walk(child, depth + 1)
+
+        walk(self.root, 0)
+        return "\n".join(lines)
+
+    def write_json(self, path: Path) -> Path:
+        path.write_text(json.dumps(self.root.to_dict(), indent=2), encoding="utf-8")
+        return path
+
+    def write_cprofile(self, path: Path) -> Optional[Path]:
+        """Statistiques cProfile (`python -m pstats`, snakeviz…), si activé."""
+        if self.cprofile is None:
+            return None
+        self.cprofile.dump_stats(str(path))
+        return path
+
+
+_ACTIVE: Optional[Profiler] = None
+
+
+@contextmanager
+def activate(profiler: Profiler) -> Iterator[Profiler]:
+    """Rend `profiler` actif pour tous les `span` du bloc."""
+    global _ACTIVE
+    previous, _ACTIVE = _ACTIVE, profiler
+    if profiler.cprofile is not None:
+        profiler.cprofile.enable()
+    try:
+        yield profiler
+    finally:
+        if profiler.cprofile is not None:
+            profiler.cprofile.disable()
+        _ACTIVE = previous
+        profiler.finish()
+
+
+@contextmanager
+def span(name: str, key: Optional[str] = None) -> Iterator[object]:
+    """Span dans le profiler actif ; sans effet (hors `add` ignoré) sinon."""
+    if _ACTIVE is None:
+        yield _NULL_SPAN
+        return
+    with _ACTIVE.span(name, key) as node:
+        yield node
+
+
+def record(
+    name: str, seconds: float, rows: int = 0, bytes: int = 0, key: Optional[str] = None
+) -> None:
+    """`Profiler.record` sur le profiler actif ; sans effet sinon."""
+    if _ACTIVE is not None:
+        _ACTIVE.record(name, seconds, rows, bytes, key)
@@ -0,0 +1,386 @@
+"""Stockage colonne des CSV bruts (`data/raw` → `data/store`).
+
+Les CSV Kaggle sont relus à chaque exécution du pipeline, avec conversion
+texte → date à chaque fois. On les convertit donc une seule fois en Parquet :
+- un fichier par ticker (`data/store/{stocks,etfs}/<SYMBOL>.parquet`),
+- dates déjà parsées, triées, prix en float32 et volumes en int64,
+- lignes sans `Adj Close` écartées (aucune étape ne s'en sert),
+- groupes de lignes d'environ un an : leurs statistiques min/max sur `Date`
+  permettent de ne décoder que la fenêtre demandée.
+
+Un fichier du store est considéré à jour s'il est plus récent que son CSV ;
+sinon les lecteurs retombent sur le CSV, le pipeline reste donc correct même
+si l'ingestion n'a pas été relancée.
+
+Pour les fichiers trop gros pour la mémoire (barres minute, plusieurs Go),
+`iter_prices` et `ingest_file(..., chunk_rows=N)` travaillent par blocs de N
+lignes : la mémoire de pointe ne dépend plus de la taille du fichier.
+
+Commande seule : `python -m src.raw_store`
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:  # pragma: no cover
+    from . import profiling
+    from .paths import DATA_RAW, DATA_STORE
+except ImportError:  # pragma: no cover
+    import profiling
+    from paths import DATA_RAW, DATA_STORE
+
+
+RAW_FOLDERS = ("stocks", "etfs")
+PRICE_COLUMNS = ["Date", "Adj Close", "Volume"]
+STORE_SCHEMA = pa.schema(
+    [
+        ("Date", pa.timestamp("ns")),
+        ("Adj Close", pa.float32()),
+        ("Volume", pa.int64()),
+    ]
+)
+STORE_COMPRESSION = "zstd"
+STORE_ROW_GROUP_SIZE = 252  # ≈ une année de séances par groupe de lignes
+DATE_WIDTH = len("YYYY-MM-DD")
+PROGRESS_BATCH_SIZE = 500
+
+
+logger = logging.getLogger(__name__)
+
+
+def store_path(csv_path: Path) -> Path:
+    """Emplacement Parquet correspondant à un CSV de `DATA_RAW`."""
+    return (DATA_STORE / csv_path.relative_to(DATA_RAW)).with_suffix(".parquet")
+
+
+def is_fresh(csv_path: Path) -> bool:
+    target = store_path(csv_path)
+    try:
+        return target.stat().st_mtime_ns >= csv_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def read_csv_prices(csv_path: Path) -> pd.DataFrame:
+    """Lecture texte historique (utilisée pour l'ingestion et en secours)."""
+    with profiling.span("csv.parse", key=csv_path.stem) as s:
+        df = pd.read_csv(csv_path, usecols=PRICE_COLUMNS)
+        s.add(rows=len(df), path=csv_path)
+    with profiling.span("csv.dates"):
+        df["Date"] = pd.to_datetime(df["Date"])
+    df = df.dropna(subset=["Adj Close"])
+    return df.sort_values("Date", kind="stable").reset_index(drop=True)
+
+
+def _store_table(df: pd.DataFrame) -> pa.Table:
+    return pa.table(
+        {
+            "Date": pa.array(df["Date"].to_numpy(), pa.timestamp("ns")),
+            "Adj Close": pa.array(df["Adj Close"].to_numpy(), pa.float32()),
+            "Volume": pa.array(df["Volume"].round().astype("Int64"), pa.int64()),
+        },
+        schema=STORE_SCHEMA,
+    )
+
+
+def ingest_file(csv_path: Path, chunk_rows: int = 0) -> Path:
+    """Convertit un CSV en Parquet typé (écriture atomique).
+
+    Avec `chunk_rows`, le CSV est lu et écrit bloc par bloc (il doit alors être
+    déjà trié par date, comme les fichiers Kaggle).
+    """
+    target = store_path(csv_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".parquet.tmp")
+    with profiling.span("parquet.write", key=csv_path.stem) as s:
+        if chunk_rows:
+            with pq.ParquetWriter(tmp, STORE_SCHEMA, compression=STORE_COMPRESSION) as writer:
+                for chunk in iter_csv_chunks(csv_path, chunk_rows):
+                    writer.write_table(_store_table(chunk), row_group_size=STORE_ROW_GROUP_SIZE)
+                    s.add(rows=len(chunk))
+        else:
+            table = _store_table(read_csv_prices(csv_path))
+            pq.write_table(
+                table, tmp, compression=STORE_COMPRESSION, row_group_size=STORE_ROW_GROUP_SIZE
+            )
+            s.add(rows=table.num_rows)
+        s.add(path=tmp)
+    os.replace(tmp, target)
+    return target
+
+
+def iter_raw_files() -> Iterator[Path]:
+    for folder in RAW_FOLDERS:
+        yield from sorted((DATA_RAW / folder).glob("*.csv"))
+
+
+def ingest_raw(workers: int = 1, force: bool = False, chunk_rows: int = 0) -> int:
+    """Convertit les CSV nouveaux ou modifiés ; renvoie le nombre converti."""
+    pending: List[Path] = [
+        path for path in iter_raw_files() if force or not is_fresh(path)
+    ]
+    if not pending:
+        logger.info("Store colonne à jour (%s)", DATA_STORE)
+        return 0
+    logger.info("Ingestion de %s CSV vers %s", len(pending), DATA_STORE)
+    ingest = functools.partial(ingest_file, chunk_rows=chunk_rows)
+    if workers <= 1:
+        converted = map(ingest, pending)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(pending) // (workers * 16))
+        converted = pool.map(ingest, pending, chunksize=chunksize)
+    try:
+        for idx, _ in enumerate(converted, start=1):
+            if idx % PROGRESS_BATCH_SIZE == 0 or idx == len(pending):
+                logger.info("%s/%s fichiers ingérés", idx, len(pending))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return len(pending)
+
+
+def _line_date(fh: BinaryIO, offset: int, header_end: int) -> Tuple[bytes, int]:
+    """Date et offset de la première ligne commençant à `offset` ou après."""
+    if offset <= header_end:
+        fh.seek(header_end)
+    else:
+        fh.seek(offset - 1)
+        fh.readline()  # termine la ligne entamée
+    start = fh.tell()
+    return fh.readline()[:DATE_WIDTH], start
+
+
+def _bisect_offset(fh: BinaryIO, key: bytes, size: int, header_end: int, right: bool) -> int:
+    """Offset de la première ligne dont la date est >= `key` (> `key` si `right`).
+
+    Les CSV Kaggle sont triés par date ISO : la comparaison lexicographique des
+    dix premiers octets de chaque ligne suffit, sans rien parser.
+    """
+    low, high = header_end, size
+    while low < high:
+        mid = (low + high) // 2
+        date, _ = _line_date(fh, mid, header_end)
+        if date and (date < key or (right and date == key)):
+            low = mid + 1
+        else:
+            high = mid
+    _, line_start = _line_date(fh, low, header_end)
+    return line_start
+
+
+def read_csv_window(
+    csv_path: Path, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]
+) -> pd.DataFrame:
+    """Lecture CSV limitée aux lignes de `[start, end]` par recherche dichotomique.
+
+    Seul le segment d'octets de la fenêtre est décodé, le reste du fichier
+    n'est jamais parsé.
+    """
+    size = csv_path.stat().st_size
+    with open(csv_path, "rb") as fh:
+        header = fh.readline()
+        header_end = fh.tell()
+        first = header_end
+        last = size
+        if start is not None:
+            key = start.strftime("%Y-%m-%d").encode()
+            first = _bisect_offset(fh, key, size, header_end, right=False)
+        if end is not None:
+            key = end.strftime("%Y-%m-%d").encode()
+            last = _bisect_offset(fh, key, size, header_end, right=True)
+        fh.seek(first)
+        body = fh.read(max(0, last - first))
+    with profiling.span("csv.parse", key=csv_path.stem) as s:
+        df = pd.read_csv(
+            io.BytesIO(header + body),
+            usecols=PRICE_COLUMNS,
+            dtype={"Adj Close": "float64", "Volume": "float64"},
+        )
+        s.add(rows=len(df), bytes=len(header) + len(body))
+    with profiling.span("csv.dates"):
+        df["Date"] = pd.to_datetime(df["Date"])
+    df = df.dropna(subset=["Adj Close"])
+    return df.sort_values("Date", kind="stable").reset_index(drop=True)
+
+
+def read_prices(
+    csv_path: Path,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Colonnes `Date`, `Adj Close`, `Volume` d'un ticker sur `[start, end]`, triées.
+
+    Lit le Parquet du store s'il est à jour (seuls les groupes de lignes qui
+    recoupent la fenêtre sont décodés), sinon le segment correspondant du CSV
+    d'origine. Les deux chemins rendent les mêmes colonnes (volumes manquants
+    en NaN).
+    """
+    if not is_fresh(csv_path):
+        if start is None and end is None:
+            return read_csv_prices(csv_path)
+        return read_csv_window(csv_path, start, end)
+    filters = []
+    if start is not None:
+        filters.append(("Date", ">=", start))
+    if end is not None:
+        filters.append(("Date", "<=", end))
+    with profiling.span("parquet.read", key=csv_path.stem) as s:
+        df = pd.read_parquet(
+            store_path(csv_path), columns=PRICE_COLUMNS, filters=filters or None
+        )
+        s.add(rows=len(df))
+    return df
+
+
+def _end_of_day(end: Optional[pd.Timestamp]) -> Optional[pd.Timestamp]:
+    """Borne exclue : lendemain de `end` à minuit (barres intrajournalières incluses)."""
+    return None if end is None else end.normalize() + pd.Timedelta(days=1)
+
+
+def _clip_chunk(chunk: pd.DataFrame, stop: Optional[pd.Timestamp]) -> Tuple[pd.DataFrame, bool]:
+    """Lignes avant `stop`, et si le fichier (trié) va au-delà."""
+    if stop is None or chunk.empty or chunk["Date"].iat[-1] < stop:
+        return chunk, False
+    return chunk[chunk["Date"] < stop], True
+
+
+def iter_csv_chunks(
+    csv_path: Path,
+    chunk_rows: int,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+) -> Iterator[pd.DataFrame]:
+    """Blocs d'au plus `chunk_rows` lignes de `[start, end]`, dans l'ordre du fichier.
+
+    Le début de fenêtre est trouvé par dichotomie, et la lecture s'arrête au
+    premier bloc qui dépasse `end` : le reste du fichier n'est pas lu.
+    """
+    stop = _end_of_day(end)
+    size = csv_path.stat().st_size
+    with open(csv_path, "rb") as fh:
+        header = fh.readline()
+        header_end = fh.tell()
+        offset = header_end
+        if start is not None:
+            key = start.strftime("%Y-%m-%d").encode()
+            offset = _bisect_offset(fh, key, size, header_end, right=False)
+        fh.seek(offset)
+        columns = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+        reader = pd.read_csv(
+            fh,
+            names=columns,
+            header=None,
+            usecols=PRICE_COLUMNS,
+            dtype={"Adj Close": "float64", "Volume": "float64"},
+            chunksize=chunk_rows,
+        )
+        for chunk in reader:
+            chunk["Date"] = pd.to_datetime(chunk["Date"])
+            chunk = chunk.dropna(subset=["Adj Close"]).reset_index(drop=True)
+            chunk, past_end = _clip_chunk(chunk, stop)
+            if not chunk.empty:
+                yield chunk[PRICE_COLUMNS]
+            if past_end:
+                return
+
+
+def iter_store_chunks(
+    csv_path: Path,
+    chunk_rows: int,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+) -> Iterator[pd.DataFrame]:
+    """Comme `iter_csv_chunks`, depuis le Parquet du store.
+
+    Les groupes de lignes hors fenêtre (statistiques min/max) ne sont pas lus.
+    """
+    stop = _end_of_day(end)
+    parquet = pq.ParquetFile(store_path(csv_path))
+    groups = []
+    for index in range(parquet.num_row_groups):
+        stats = parquet.metadata.row_group(index).column(0).statistics
+        if stats is not None and stats.has_min_max:
+            if start is not None and pd.Timestamp(stats.max) < start:
+                continue
+            if stop is not None and pd.Timestamp(stats.min) >= stop:
+                break
+        groups.append(index)
+    if not groups:
+        return
+    for batch in parquet.iter_batches(
+        batch_size=chunk_rows, row_groups=groups, columns=PRICE_COLUMNS
+    ):
+        chunk = batch.to_pandas()
+        if start is not None:
+            chunk = chunk[chunk["Date"] >= start]
+        chunk, past_end = _clip_chunk(chunk.reset_index(drop=True), stop)
+        if not chunk.empty:
+            yield chunk
+        if past_end:
+            return
+
+
+def iter_prices(
+    csv_path: Path,
+    chunk_rows: int,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+) -> Iterator[pd.DataFrame]:
+    """`read_prices` par blocs : store s'il est à jour, CSV sinon."""
+    if is_fresh(csv_path):
+        return iter_store_chunks(csv_path, chunk_rows, start, end)
+    return iter_csv_chunks(csv_path, chunk_rows, start, end)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Conversion unique de data/raw en Parquet typé (data/store)."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processus parallèles pour la conversion (0 = tous les cœurs).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reconvertit tous les fichiers, même à jour.",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=0,
+        help="Conversion par blocs de N lignes, pour les très gros fichiers (0 = d'un coup).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    args = parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    count = ingest_raw(workers=workers, force=args.force, chunk_rows=args.chunk_rows)
+    print(f"Store colonne prêt : {count} fichier(s) converti(s).")
+
+
+if __name__ == "__main__":
+    main()
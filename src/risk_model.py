@@ -0,0 +1,99 @@
+"""Covariances pour grands univers : facteurs + diagonale, avec rétrécissement.
+
+La covariance empirique (`DataFrame.cov`) devient vite inutilisable quand le
+nombre de titres N approche le nombre de séances T : bruitée, mal
+conditionnée, et un QP dense en N² variables croisées. On la remplace par
+
+    Σ = B Bᵀ + diag(d)
+
+- B (N × k) : expositions aux k premières composantes principales, déjà
+  multipliées par la racine de leur variance ;
+- d (N) : variance spécifique de chaque titre (ce que les facteurs
+  n'expliquent pas).
+
+Le rétrécissement de Ledoit-Wolf (vers σ̄² I) garde cette forme : il réduit
+B d'un facteur √(1 - δ) et ajoute δ σ̄² à la diagonale. Côté optimiseur,
+w'Σw = ‖Bᵀw‖² + ‖√d ∘ w‖² : k + N termes au lieu de N².
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_FACTORS = 20
+SPECIFIC_VARIANCE_FLOOR = 1e-10
+
+
+@dataclass
+class FactorCovariance:
+    """Covariance sous forme facteurs + diagonale : Σ = B Bᵀ + diag(d)."""
+
+    exposures: np.ndarray
+    specific: np.ndarray
+    shrinkage: float = 0.0
+
+    @property
+    def factors(self) -> int:
+        return self.exposures.shape[1]
+
+    def dense(self) -> np.ndarray:
+        return self.exposures @ self.exposures.T + np.diag(self.specific)
+
+    def variance(self, weights: np.ndarray) -> float:
+        loadings = self.exposures.T @ weights
+        return float(loadings @ loadings + self.specific @ (weights * weights))
+
+
+def ledoit_wolf_shrinkage(centered: np.ndarray, sample: np.ndarray) -> float:
+    """Intensité δ de Ledoit & Wolf (2004) vers σ̄² I, bornée à [0, 1].
+
+    `centered` : rendements centrés (T × N) ; `sample` : leur covariance
+    biaisée (XᵀX / T), comme dans l'article.
+    """
+    t, n = centered.shape
+    mu = np.trace(sample) / n
+    delta = (np.sum(sample**2) - 2 * mu * np.trace(sample) + n * mu**2) / n
+    # Σ_t ‖x_t‖⁴ : variance de l'estimateur, sans former de matrice N × N en plus.
+    fourth = np.sum(np.sum(centered**2, axis=1) ** 2)
+    beta = (fourth / t - np.sum(sample**2)) / (n * t)
+    if delta <= 0:
+        return 0.0
+    return float(min(beta, delta) / delta)
+
+
+def factor_covariance(
+    returns: pd.DataFrame,
+    factors: int = DEFAULT_FACTORS,
+    shrink: bool = True,
+) -> FactorCovariance:
+    """Modèle à `factors` composantes principales, rétréci par Ledoit-Wolf si `shrink`.
+
+    Sans rétrécissement, la diagonale de Σ reproduit exactement les variances
+    empiriques (ddof=1) ; seules les covariances croisées sont approchées.
+    """
+    from scipy.linalg import eigh  # import différé : inutile tant qu'aucun grand univers n'est optimisé
+
+    values = returns.to_numpy(dtype=float)
+    t, n = values.shape
+    centered = values - values.mean(axis=0)
+    sample = centered.T @ centered / (t - 1)
+    k = max(0, min(factors, n - 1, t - 1))
+    if k:
+        eigenvalues, eigenvectors = eigh(sample, subset_by_index=[n - k, n - 1])
+        exposures = eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+    else:
+        exposures = np.zeros((n, 0))
+    specific = np.clip(
+        np.diag(sample) - np.sum(exposures**2, axis=1), SPECIFIC_VARIANCE_FLOOR, None
+    )
+    shrinkage = 0.0
+    if shrink:
+        shrinkage = ledoit_wolf_shrinkage(centered, sample * (t - 1) / t)
+        target = np.trace(sample) / n
+        exposures = exposures * np.sqrt(1 - shrinkage)
+        specific = (1 - shrinkage) * specific + shrinkage * target
+    return FactorCovariance(exposures, specific, shrinkage)
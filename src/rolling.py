@@ -0,0 +1,355 @@
+"""Statistiques glissantes sur la matrice des rendements (séances × tickers).
+
+Tout l'univers est traité d'un bloc, par sommes courantes :
+- pour chaque fenêtre, nombre de rendements, somme et somme des carrés
+  (et produits croisés pour bêta / corrélation) ; une fenêtre vaut la
+  différence de deux sommes cumulées, soit O(1) par séance et par ticker
+  quelle que soit la longueur de la fenêtre ;
+- le plus haut glissant du drawdown est un maximum par blocs (van Herk /
+  Gil-Werman), lui aussi O(1) par séance.
+
+`RollingWindow` tient les mêmes sommes en flux : `push` ajoute la nouvelle
+séance et retire celle qui sort de la fenêtre, pour le suivi au jour le jour.
+
+Conventions (identiques à `DataFrame.rolling`) : rendements manquants ignorés,
+statistique en NaN tant que la fenêtre compte moins de `min_periods`
+rendements (par défaut la taille de la fenêtre). Bêta et corrélations sont
+calculés sur les séances où les deux séries sont cotées.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_WINDOWS = (20, 60, 252)
+PERIODS_PER_YEAR = 252
+METRICS = ("volatility", "sharpe", "drawdown", "beta")
+
+Benchmark = Union[str, pd.Series, None]
+
+
+def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Somme sur les `window` dernières lignes, par différence de sommes cumulées."""
+    cumulative = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=cumulative[1:])
+    lagged = np.zeros_like(cumulative[1:])
+    lagged[window:] = cumulative[1:-window]
+    return cumulative[1:] - lagged
+
+
+def _moments(
+    n: np.ndarray, total: np.ndarray, total_sq: np.ndarray, min_periods: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Moyenne et écart-type (ddof=1) à partir des sommes courantes."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / n
+        variance = (total_sq - total * mean) / (n - 1)
+    enough = n >= max(min_periods, 2)
+    std = np.sqrt(np.clip(variance, 0.0, None))
+    return np.where(enough, mean, np.nan), np.where(enough, std, np.nan)
+
+
+def _pair_moments(
+    n: np.ndarray,
+    sum_x: np.ndarray,
+    sum_y: np.ndarray,
+    sum_xx: np.ndarray,
+    sum_yy: np.ndarray,
+    sum_xy: np.ndarray,
+    min_periods: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Covariance et variances sur les séances communes aux deux séries."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (sum_xy - sum_x * sum_y / n) / (n - 1)
+        var_x = (sum_xx - sum_x * sum_x / n) / (n - 1)
+        var_y = (sum_yy - sum_y * sum_y / n) / (n - 1)
+    enough = n >= max(min_periods, 2)
+    return (
+        np.where(enough, cov, np.nan),
+        np.where(enough, np.clip(var_x, 0.0, None), np.nan),
+        np.where(enough, np.clip(var_y, 0.0, None), np.nan),
+    )
+
+
+def _sliding_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Maximum glissant par colonne (van Herk / Gil-Werman), NaN ignorés."""
+    rows, cols = values.shape
+    data = np.where(np.isnan(values), -np.inf, values)
+    out = np.empty_like(data)
+    head = min(window - 1, rows)
+    out[:head] = np.maximum.accumulate(data[:head], axis=0)
+    if rows >= window:
+        pad = (-rows) % window
+        blocks = np.vstack([data, np.full((pad, cols), -np.inf)]).reshape(-1, window, cols)
+        prefix = np.maximum.accumulate(blocks, axis=1).reshape(-1, cols)
+        suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, cols)
+        out[window - 1 :] = np.maximum(suffix[: rows - window + 1], prefix[window - 1 : rows])
+    return np.where(np.isinf(out), np.nan, out)
+
+
+def _benchmark_series(returns: pd.DataFrame, benchmark: Benchmark) -> Optional[np.ndarray]:
+    if benchmark is None:
+        return None
+    if isinstance(benchmark, str):
+        if benchmark not in returns.columns:
+            raise KeyError(f"Benchmark inconnu: {benchmark}")
+        return returns[benchmark].to_numpy(dtype=float)
+    return benchmark.reindex(returns.index).to_numpy(dtype=float)
+
+
+def rolling_metrics(
+    returns: pd.DataFrame,
+    window: int,
+    benchmark: Benchmark = None,
+    min_periods: Optional[int] = None,
+    periods_per_year: int = PERIODS_PER_YEAR,
+) -> Dict[str, pd.DataFrame]:
+    """Volatilité, ratio μ/σ, drawdown et bêta glissants de tous les tickers.
+
+    Renvoie un dict `métrique -> DataFrame (Date × Symbol)` ; `beta` n'est
+    présent que si un benchmark (ticker de `returns` ou série) est fourni.
+    Volatilité et ratio sont annualisés ; le drawdown est mesuré depuis le
+    plus haut de la richesse cumulée sur la fenêtre.
+    """
+    if window < 1:
+        raise ValueError("La fenêtre doit compter au moins une séance.")
+    min_periods = window if min_periods is None else min_periods
+    values = returns.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    n = _window_sum(valid.astype(float), window)
+    mean, std = _moments(
+        n, _window_sum(filled, window), _window_sum(filled * filled, window), min_periods
+    )
+    scale = np.sqrt(periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std * scale, np.nan)
+
+    # Richesse cumulée : plate les jours sans cotation, absente avant la première.
+    started = np.logical_or.accumulate(valid, axis=0)
+    wealth = np.where(started, np.cumprod(1.0 + filled, axis=0), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = wealth / _sliding_max(wealth, window) - 1.0
+    drawdown = np.where(n >= min_periods, drawdown, np.nan)
+
+    def frame(data: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(data, index=returns.index, columns=returns.columns)
+
+    metrics = {
+        "volatility": frame(std * scale),
+        "sharpe": frame(sharpe),
+        "drawdown": frame(drawdown),
+    }
+
+    bench = _benchmark_series(returns, benchmark)
+    if bench is not None:
+        both = valid & ~np.isnan(bench)[:, None]
+        x = np.where(both, values, 0.0)
+        y = np.where(both, bench[:, None], 0.0)
+        cov, _, var_b = _pair_moments(
+            _window_sum(both.astype(float), window),
+            _window_sum(x, window),
+            _window_sum(y, window),
+            _window_sum(x * x, window),
+            _window_sum(y * y, window),
+            _window_sum(x * y, window),
+            min_periods,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics["beta"] = frame(np.where(var_b > 0, cov / var_b, np.nan))
+    return metrics
+
+
+def rolling_pair_correlation(
+    returns: pd.DataFrame,
+    window: int,
+    pairs: Sequence[Tuple[str, str]],
+    min_periods: Optional[int] = None,
+) -> pd.DataFrame:
+    """Corrélations glissantes de couples de tickers (une colonne `A/B` par couple)."""
+    min_periods = window if min_periods is None else min_periods
+    left = returns[[a for a, _ in pairs]].to_numpy(dtype=float)
+    right = returns[[b for _, b in pairs]].to_numpy(dtype=float)
+    both = ~np.isnan(left) & ~np.isnan(right)
+    x = np.where(both, left, 0.0)
+    y = np.where(both, right, 0.0)
+    cov, var_x, var_y = _pair_moments(
+        _window_sum(both.astype(float), window),
+        _window_sum(x, window),
+        _window_sum(y, window),
+        _window_sum(x * x, window),
+        _window_sum(y * y, window),
+        _window_sum(x * y, window),
+        min_periods,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.sqrt(var_x * var_y)
+    return pd.DataFrame(
+        corr, index=returns.index, columns=[f"{a}/{b}" for a, b in pairs]
+    )
+
+
+def _pairwise_sums(values: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Sommes croisées (n, Σx, Σx², Σxy) sur les séances communes à chaque couple."""
+    valid = (~np.isnan(values)).astype(float)
+    filled = np.where(valid > 0, values, 0.0)
+    return valid.T @ valid, filled.T @ valid, (filled * filled).T @ valid, filled.T @ filled
+
+
+def _correlation_from_sums(
+    n: np.ndarray, sum_x: np.ndarray, sum_xx: np.ndarray, sum_xy: np.ndarray, min_periods: int
+) -> np.ndarray:
+    # sum_x[i, j] = Σ x_i sur les séances où j est coté : Σ y vaut donc sum_x.T
+    cov, var_x, var_y = _pair_moments(
+        n, sum_x, sum_x.T, sum_xx, sum_xx.T, sum_xy, min_periods
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return cov / np.sqrt(var_x * var_y)
+
+
+def window_correlation(
+    returns: pd.DataFrame,
+    window: int,
+    end: Optional[pd.Timestamp] = None,
+    min_periods: Optional[int] = None,
+) -> pd.DataFrame:
+    """Matrice de corrélation de la fenêtre se terminant à `end` (dernière séance par défaut)."""
+    min_periods = window if min_periods is None else min_periods
+    stop = len(returns) if end is None else returns.index.searchsorted(end, side="right")
+    block = returns.iloc[max(0, stop - window) : stop]
+    corr = _correlation_from_sums(*_pairwise_sums(block.to_numpy(dtype=float)), min_periods)
+    return pd.DataFrame(corr, index=returns.columns, columns=returns.columns)
+
+
+def to_long(metrics: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Format long `Date, Symbol, <métriques>` (lignes entièrement vides écartées)."""
+    first = next(iter(metrics.values()))
+    rows, cols = first.shape
+    long = pd.DataFrame(
+        {
+            "Date": np.repeat(first.index.to_numpy(), cols),
+            "Symbol": np.tile(first.columns.to_numpy(), rows),
+            **{name: frame.to_numpy().ravel() for name, frame in metrics.items()},
+        }
+    )
+    return long.dropna(how="all", subset=list(metrics)).reset_index(drop=True)
+
+
+class RollingWindow:
+    """Mêmes statistiques en flux : une séance entre, la plus ancienne sort.
+
+    Chaque `push` met à jour les sommes courantes (O(1) par ticker et par
+    couple de tickers) au lieu de recalculer la fenêtre ; le plus haut de la
+    richesse est suivi par une file monotone par ticker.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        window: int,
+        benchmark: Optional[str] = None,
+        min_periods: Optional[int] = None,
+        periods_per_year: int = PERIODS_PER_YEAR,
+    ):
+        if benchmark is not None and benchmark not in symbols:
+            raise KeyError(f"Benchmark inconnu: {benchmark}")
+        self.symbols = list(symbols)
+        self.window = window
+        self.benchmark = benchmark
+        self.min_periods = window if min_periods is None else min_periods
+        self.periods_per_year = periods_per_year
+        size = len(self.symbols)
+        self.buffer = np.full((window, size), np.nan)
+        self.seen = 0
+        self.last_date: Optional[pd.Timestamp] = None
+        self.pair_n = np.zeros((size, size))
+        self.pair_x = np.zeros((size, size))
+        self.pair_xx = np.zeros((size, size))
+        self.pair_xy = np.zeros((size, size))
+        self.wealth = np.full(size, np.nan)
+        self.peaks: List[Deque[Tuple[int, float]]] = [deque() for _ in range(size)]
+
+    @classmethod
+    def from_history(
+        cls, returns: pd.DataFrame, window: int, **kwargs
+    ) -> "RollingWindow":
+        state = cls(list(returns.columns), window, **kwargs)
+        for date, row in zip(returns.index, returns.to_numpy(dtype=float)):
+            state.push(date, row)
+        return state
+
+    def _apply(self, row: np.ndarray, sign: float) -> None:
+        valid = ~np.isnan(row)
+        filled = np.where(valid, row, 0.0)
+        mask = valid.astype(float)
+        self.pair_n += sign * np.outer(mask, mask)
+        self.pair_x += sign * np.outer(filled, mask)
+        self.pair_xx += sign * np.outer(filled * filled, mask)
+        self.pair_xy += sign * np.outer(filled, filled)
+
+    def push(self, date: pd.Timestamp, row: Union[np.ndarray, pd.Series]) -> None:
+        """Ajoute les rendements d'une séance (alignés sur `symbols`, NaN si absent)."""
+        if isinstance(row, pd.Series):
+            row = row.reindex(self.symbols)
+        row = np.asarray(row, dtype=float)
+        slot = self.seen % self.window
+        if self.seen >= self.window:
+            self._apply(self.buffer[slot], -1.0)
+        self.buffer[slot] = row
+        self._apply(row, 1.0)
+
+        valid = ~np.isnan(row)
+        growth = np.where(valid, 1.0 + row, 1.0)
+        self.wealth = np.where(np.isnan(self.wealth) & valid, 1.0, self.wealth) * growth
+        oldest = self.seen - self.window + 1
+        for col, peaks in enumerate(self.peaks):
+            value = self.wealth[col]
+            if not np.isnan(value):
+                while peaks and peaks[-1][1] <= value:
+                    peaks.pop()
+                peaks.append((self.seen, value))
+            while peaks and peaks[0][0] < oldest:
+                peaks.popleft()
+        self.seen += 1
+        self.last_date = date
+
+    def correlation(self) -> pd.DataFrame:
+        corr = _correlation_from_sums(
+            self.pair_n, self.pair_x, self.pair_xx, self.pair_xy, self.min_periods
+        )
+        return pd.DataFrame(corr, index=self.symbols, columns=self.symbols)
+
+    def snapshot(self) -> pd.DataFrame:
+        """Métriques de la fenêtre courante, une ligne par ticker."""
+        n = np.diag(self.pair_n)
+        mean, std = _moments(n, np.diag(self.pair_x), np.diag(self.pair_xx), self.min_periods)
+        scale = np.sqrt(self.periods_per_year)
+        peak = np.array([peaks[0][1] if peaks else np.nan for peaks in self.peaks])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            data = {
+                "volatility": std * scale,
+                "sharpe": np.where(std > 0, mean / std * scale, np.nan),
+                "drawdown": np.where(n >= self.min_periods, self.wealth / peak - 1.0, np.nan),
+            }
+        if self.benchmark is not None:
+            b = self.symbols.index(self.benchmark)
+            cov, _, var_b = _pair_moments(
+                self.pair_n[:, b],
+                self.pair_x[:, b],
+                self.pair_x[b, :],
+                self.pair_xx[:, b],
+                self.pair_xx[b, :],
+                self.pair_xy[:, b],
+                self.min_periods,
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                data["beta"] = np.where(var_b > 0, cov / var_b, np.nan)
+        frame = pd.DataFrame(data, index=pd.Index(self.symbols, name="Symbol"))
+        frame.insert(0, "Date", self.last_date)
+        return frame
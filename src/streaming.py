@@ -0,0 +1,103 @@
+"""Agrégats au fil de l'eau pour les fichiers bruts trop gros pour la mémoire.
+
+Les lecteurs par morceaux (`raw_store.iter_prices`) rendent des blocs de
+lignes `Date`, `Adj Close`, `Volume` triés par date. Les classes ci-dessous les
+consomment un par un en ne gardant qu'un état de taille fixe :
+
+- `DailyBars` ramène des barres intrajournalières (minute…) à une ligne par
+  séance : dernier prix, volume cumulé. La dernière séance d'un bloc peut
+  continuer dans le suivant : elle est retenue jusqu'au bloc d'après.
+- `ActivityTotals` cumule volume, nombre de séances et bornes de dates
+  (l'équivalent de `data_loading.summarize_frame`).
+
+La mémoire de pointe ne dépend que de la taille des blocs, pas de celle du
+fichier.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class DailyBars:
+    """Une ligne par séance : dernier `Adj Close`, somme des `Volume`."""
+
+    def __init__(self) -> None:
+        self._pending: Optional[pd.DataFrame] = None  # séance peut-être incomplète
+
+    @staticmethod
+    def _collapse(chunk: pd.DataFrame) -> pd.DataFrame:
+        day = chunk["Date"].dt.normalize()
+        grouped = chunk.groupby(day.to_numpy(), sort=False)
+        daily = pd.DataFrame(
+            {
+                "Adj Close": grouped["Adj Close"].last(),
+                "Volume": grouped["Volume"].sum(min_count=1),
+            }
+        )
+        daily.index.name = "Date"
+        return daily.reset_index()
+
+    def push(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Séances terminées grâce à `chunk` (la dernière reste en attente)."""
+        if chunk.empty:
+            return chunk.iloc[:0][["Date", "Adj Close", "Volume"]]
+        daily = self._collapse(chunk)
+        if self._pending is not None:
+            if daily["Date"].iat[0] == self._pending["Date"].iat[0]:
+                first = daily.iloc[:1].copy()
+                volume = self._pending["Volume"].iat[0]
+                if not np.isnan(volume):
+                    first["Volume"] = np.nansum([first["Volume"].iat[0], volume])
+                daily = pd.concat([first, daily.iloc[1:]], ignore_index=True)
+            else:
+                daily = pd.concat([self._pending, daily], ignore_index=True)
+        self._pending = daily.iloc[-1:].reset_index(drop=True)
+        return daily.iloc[:-1].reset_index(drop=True)
+
+    def flush(self) -> pd.DataFrame:
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return pd.DataFrame(columns=["Date", "Adj Close", "Volume"])
+        return pending
+
+
+def daily_bars(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    bars = DailyBars()
+    for chunk in chunks:
+        done = bars.push(chunk)
+        if not done.empty:
+            yield done
+    last = bars.flush()
+    if not last.empty:
+        yield last
+
+
+class ActivityTotals:
+    """Volume total, séances et bornes de dates sur les lignes complètes."""
+
+    def __init__(self) -> None:
+        self.total_volume = 0.0
+        self.trading_days = 0
+        self.first_date: Optional[pd.Timestamp] = None
+        self.last_date: Optional[pd.Timestamp] = None
+
+    def push(self, chunk: pd.DataFrame) -> None:
+        complete = chunk.dropna(subset=["Adj Close", "Volume"])
+        if complete.empty:
+            return
+        self.total_volume += float(complete["Volume"].sum())
+        self.trading_days += len(complete)
+        first, last = complete["Date"].min(), complete["Date"].max()
+        if self.first_date is None or first < self.first_date:
+            self.first_date = pd.Timestamp(first)
+        if self.last_date is None or last > self.last_date:
+            self.last_date = pd.Timestamp(last)
+
+    @property
+    def average_volume(self) -> float:
+        return self.total_volume / self.trading_days if self.trading_days else float("nan")
+
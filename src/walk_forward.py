@@ -0,0 +1,167 @@
+"""Optimisation glissante (walk-forward) : réestimer, réoptimiser, détenir.
+
+À chaque rééquilibrage t, le modèle de Markowitz est estimé sur les `window`
+séances qui précèdent t, puis ses poids sont détenus jusqu'au rééquilibrage
+suivant : la courbe chaînée est entièrement hors échantillon.
+
+D'une fenêtre mensuelle à la suivante, seule une vingtaine de séances change.
+`MovingMoments` tient Σx et Σxxᵀ et les met à jour séance par séance
+(`add` / `remove`) : glisser de k séances coûte O(k N²) au lieu de
+O(window N²) pour recalculer `DataFrame.cov`. Les rendements sont décalés
+d'une référence fixe pour limiter les pertes de précision, et les sommes
+recalculées exactement toutes les `RESYNC_EVERY` mises à jour pour borner la
+dérive numérique.
+
+Le solveur exact (`src.frontier`) repart de l'ensemble actif de la fenêtre
+précédente : les poids bougent peu d'un mois à l'autre. Pour paralléliser,
+les rééquilibrages sont découpés en blocs consécutifs, un par worker, et
+chaque bloc garde ce démarrage à chaud.
+
+Une cible de rendement hors de portée sur une fenêtre (marché baissier,
+plafond par titre) ne fait pas échouer l'ensemble : la fenêtre détient le
+portefeuille de rendement maximal, et `WalkForwardResult.objectives` dit,
+rééquilibrage par rééquilibrage, quel problème a été résolu.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import backtest
+
+
+DEFAULT_WINDOW = 252  # séances d'estimation (un an)
+RESYNC_EVERY = 64  # mises à jour incrémentales avant recalcul exact
+
+# Problème résolu à un rééquilibrage (`WalkForwardResult.objectives`)
+MIN_VARIANCE = "min_variance"  # pas de cible demandée
+TARGET = "target"  # variance minimale sous la cible demandée
+MAX_RETURN = "max_return"  # cible inatteignable : rendement maximal sous les bornes
+
+
+class MovingMoments:
+    """Moyenne et covariance (ddof=1) des lignes `[start, stop)` de `values`.
+
+    `values` (séances × titres) ne doit pas avoir de trou, comme les
+    rendements de `analysis.prepare_returns`.
+    """
+
+    def __init__(self, values: np.ndarray, resync_every: int = RESYNC_EVERY):
+        self.values = np.asarray(values, dtype=float)
+        self.resync_every = resync_every
+        self.shift = np.zeros(self.values.shape[1])
+        self.start = self.stop = 0
+        self.updates = 0
+        self._reset(0, 0)
+
+    def _centered(self, start: int, stop: int) -> np.ndarray:
+        return self.values[start:stop] - self.shift
+
+    def _reset(self, start: int, stop: int) -> None:
+        if stop > start:
+            self.shift = self.values[start:stop].mean(axis=0)
+        block = self._centered(start, stop)
+        self.sum = block.sum(axis=0)
+        self.cross = block.T @ block
+        self.start, self.stop = start, stop
+        self.updates = 0
+
+    def add(self, count: int = 1) -> None:
+        """Fait entrer les `count` séances suivantes."""
+        block = self._centered(self.stop, self.stop + count)
+        self.sum += block.sum(axis=0)
+        self.cross += block.T @ block
+        self.stop += len(block)
+
+    def remove(self, count: int = 1) -> None:
+        """Fait sortir les `count` plus anciennes séances."""
+        block = self._centered(self.start, min(self.start + count, self.stop))
+        self.sum -= block.sum(axis=0)
+        self.cross -= block.T @ block
+        self.start += len(block)
+
+    def move(self, start: int, stop: int) -> None:
+        """Place la fenêtre sur `[start, stop)`, par mise à jour si elle chevauche l'actuelle."""
+        overlapping = self.start <= start < self.stop <= stop
+        if not overlapping or self.updates >= self.resync_every:
+            self._reset(start, stop)
+            return
+        self.add(stop - self.stop)
+        self.remove(start - self.start)
+        self.updates += 1
+
+    @property
+    def count(self) -> int:
+        return self.stop - self.start
+
+    def mean(self) -> np.ndarray:
+        return self.shift + self.sum / self.count
+
+    def covariance(self) -> np.ndarray:
+        n = self.count
+        centered_mean = self.sum / n
+        return (self.cross - n * np.outer(centered_mean, centered_mean)) / (n - 1)
+
+
+def rebalance_points(
+    dates: pd.DatetimeIndex, window: int, rebalance: Optional[str] = "monthly"
+) -> np.ndarray:
+    """Séances de rééquilibrage disposant d'au moins `window` séances d'historique."""
+    starts = backtest.rebalance_starts(dates, rebalance)
+    if rebalance is None:
+        starts = np.array([window])
+    starts = starts[(starts >= window) & (starts < len(dates))]
+    if not len(starts):
+        raise ValueError(
+            f"Historique trop court : {len(dates)} séances pour une fenêtre de {window}."
+        )
+    return starts
+
+
+@dataclass
+class WalkForwardResult:
+    """Poids choisis à chaque rééquilibrage et courbe hors échantillon qui en résulte."""
+
+    weights: pd.DataFrame  # une ligne par rééquilibrage (index : date), une colonne par titre
+    backtest: backtest.BacktestResult
+    objectives: pd.Series  # problème résolu à chaque rééquilibrage (MIN_VARIANCE, TARGET…)
+
+    @property
+    def rebalance_dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.weights.index)
+
+    @property
+    def fallbacks(self) -> pd.DatetimeIndex:
+        """Rééquilibrages où la cible, hors de portée, a été ramenée au maximum."""
+        return self.rebalance_dates[(self.objectives == MAX_RETURN).to_numpy()]
+
+    def equity(self, base: float = 100.0) -> pd.Series:
+        return self.backtest.equity(base).iloc[:, 0]
+
+
+def chain(
+    returns: pd.DataFrame,
+    starts: np.ndarray,
+    weights: List[np.ndarray],
+    objectives: List[str],
+    transaction_cost: float = 0.0,
+    name: str = "Walk-forward",
+) -> WalkForwardResult:
+    """Enchaîne les poids de chaque rééquilibrage en une courbe, dès le premier."""
+    first = int(starts[0])
+    oos = returns.iloc[first:]
+    result = backtest.run_schedule(
+        oos.to_numpy(),
+        pd.DatetimeIndex(oos.index),
+        starts - first,
+        np.vstack(weights),
+        transaction_cost=transaction_cost,
+        name=name,
+    )
+    dates = returns.index[starts]
+    table = pd.DataFrame(np.vstack(weights), index=dates, columns=returns.columns)
+    return WalkForwardResult(table, result, pd.Series(objectives, index=dates, name="objective"))